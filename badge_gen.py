@@ -5,28 +5,35 @@ organizes by category, and updates print status.
  python manage.py shell -c "from badge_gen import process_all_badges; process_all_badges(batch_size=10)"
 python manage.py shell -c "from badge_gen import process_all_badges; process_all_badges(batch_size=10)"
 
+For full runs use the parallel, resumable management command:
+    python manage.py generate_badges --workers 4 [--shard 0/2]
+
+After edits, re-render only the stale badges and drop orphaned files:
+    python manage.py generate_badges --sync
+
 Usage:
     python manage.py shell
     >>> from summitPage.badge_batch_processor import process_all_badges
     >>> process_all_badges(batch_size=10)
 """
 
-import math
+import json
 import os
 import logging
-from io import BytesIO
 from django.conf import settings
 from django.db import transaction
-from reportlab.lib.pagesizes import A8
-from reportlab.platypus import Image as PlatypusImage
-from summitPage.models import Registrant, Category
-from PIL import ImageDraw, Image
-import qrcode
-from django.core.files.storage import default_storage
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import portrait, A7
-from reportlab.lib.utils import ImageReader
-from reportlab.lib import colors
+from reportlab.lib.pagesizes import A8, portrait
+from summitPage.badges import (
+    BADGE_SIZES,
+    SHEET_SIZES,
+    badge_fingerprint,
+    badge_photo_cache,
+    build_badge_pdf,
+    build_badge_sheets,
+    print_order,
+)
+from summitPage.category_cache import get_category_map
+from summitPage.models import Category, PrintLog, Registrant
 
 # Enable PDF compression globally
 import reportlab.rl_config
@@ -40,6 +47,30 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+BADGE_PAGE_SIZE = portrait(A8)
+CATEGORIES_DIR = os.path.join(settings.MEDIA_ROOT, "categories")
+MANIFEST_PATH = os.path.join(CATEGORIES_DIR, "manifest.json")
+
+
+def unprinted_registrants():
+    """Registrants whose badge has not been generated yet."""
+    return Registrant.objects.filter(Registrant.UNPRINTED)
+
+
+def iter_batches(queryset, batch_size):
+    """
+    Yield lists of registrants in id order, each batch keyed on the last id of
+    the previous one. Unlike OFFSET paging this stays linear and skips nobody
+    while the loop marks rows printed and they drop out of the filter.
+    """
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(id__gt=last_id).order_by("id")[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1].id
+
 
 def get_category_folder_path(category_name):
     """
@@ -51,7 +82,7 @@ def get_category_folder_path(category_name):
     Returns:
         str: Full path to the category folder
     """
-    base_dir = os.path.join(settings.MEDIA_ROOT, "categories")
+    base_dir = CATEGORIES_DIR
     os.makedirs(base_dir, exist_ok=True)
 
     # Clean up folder name (safe for filesystem)
@@ -65,431 +96,15 @@ def get_category_folder_path(category_name):
     return folder_path
 
 
-def build_exhibitor_badge_pdf(exhib, page_size=portrait(A8)):
+def build_exhibitor_badge_pdf(exhib, page_size=BADGE_PAGE_SIZE):
     """
     Generate a badge PDF for an exhibitor/registrant.
-    Returns a BytesIO buffer containing the PDF.
-    OPTIMIZED: Cleans up resources after generation.
+    Returns a BytesIO buffer containing the PDF (badge + partner logo page).
+    Static artwork is compiled once per category colour, see summitPage.badges.
     """
-    pdf_buffer = None
-    qr_buffer = None
-
-    try:
-        category_obj = Category.objects.only("name", "color").get(id=exhib.category)
-        badge_color = category_obj.color or colors.black
-    except Category.DoesNotExist:
+    if str(exhib.category) not in get_category_map():
         logger.error(f"Category not found for registrant {exhib.id}")
-        badge_color = colors.black
-
-    # --- Core Data ---
-    full_name = exhib.get_full_name() or ""
-    national_id = exhib.national_id_number or ""
-    org_type = exhib.display_org_type() or ""
-    job_title = exhib.job_title or ""
-    category = exhib.get_category_display() or ""
-
-    # --- Generate QR Code ---
-    qr_data = (
-        f"Name: {full_name}\n"
-        f"National ID/ Passport NO: {national_id}\n"
-        f"Organization: {org_type}\n"
-        f"Job Title: {job_title}\n"
-        f"Category: {category}\n"
-    )
-    qr_img = qrcode.make(qr_data)
-    qr_buffer = BytesIO()
-    qr_img.save(qr_buffer, format="PNG")
-    qr_buffer.seek(0)
-    qr_reader = ImageReader(qr_buffer)
-
-    # --- PDF Setup (ONLY ONCE) ---
-    pdf_buffer = BytesIO()
-    c = canvas.Canvas(pdf_buffer, pagesize=page_size)
-    width, height = page_size
-
-    # --- Scale constants based on size ---
-    base_width, base_height = portrait(A7)
-    scale_w = width / base_width
-    scale_h = height / base_height
-    scale = (scale_w + scale_h) / 2
-
-    def s(val):
-        return val * scale
-
-    ###############################################################
-    # ======================== PAGE 1 =============================
-    ###############################################################
-
-    # --- Background ---
-    c.setFillColor(colors.white)
-    c.rect(0, 0, width, height, fill=1, stroke=0)
-
-    # --- Flag accents ---
-    def draw_accent_shapes():
-        c.setFillColor(colors.HexColor("#3aa655"))
-        path = c.beginPath()
-        path.moveTo(width * 0.68, height * 0.18)
-        path.lineTo(width * 0.83, height * 0.28)
-        path.lineTo(width * 0.68, height * 0.36)
-        path.close()
-        c.drawPath(path, fill=1, stroke=0)
-
-        offset = s(45)
-        c.setStrokeColor("#d62612")
-        c.setLineWidth(s(0.5))
-        c.line(width * 0.5 - offset, 0, width - offset, height * 0.35)
-
-        c.setFillColor(badge_color)
-        path = c.beginPath()
-        path.moveTo(0, 0)
-        path.lineTo(width * 0.8, 0)
-        path.lineTo(0, height * 0.4)
-        path.close()
-        c.drawPath(path, fill=1, stroke=0)
-
-        c.setFillColor(colors.HexColor("#d62612"))
-        path = c.beginPath()
-        path.moveTo(width, 0)
-        path.lineTo(width, height * 0.35)
-        path.lineTo(width * 0.5, 0)
-        path.close()
-        c.drawPath(path, fill=1, stroke=0)
-
-    draw_accent_shapes()
-
-    # --- Summit Logos ---
-    summit_logo_path = os.path.join(settings.BASE_DIR, "static", "images", "summit_logo.png")
-    partner_logo_path = os.path.join(settings.BASE_DIR, "static", "images", "badge_partner.png")
-
-    margin_x = width * 0.05
-    margin_top = height * 0.06
-
-    logo_h = height * 0.25
-    spacing = width * 0.01
-    total_width = 0
-    images = []
-
-    if os.path.exists(partner_logo_path):
-        img = ImageReader(partner_logo_path)
-        w = width * 0.48
-        images.append((img, w))
-        total_width += w
-
-    if os.path.exists(summit_logo_path):
-        if images:
-            total_width += spacing
-        img = ImageReader(summit_logo_path)
-        w = width * 0.52
-        images.append((img, w))
-        total_width += w
-
-    if images:
-        start_x = (width - total_width) / 2
-        y_pos = height - margin_top - logo_h
-        for img, w in images:
-            c.drawImage(img, start_x, y_pos, width=w, height=logo_h,
-                        preserveAspectRatio=True, mask="auto")
-            start_x += w + spacing
-
-    # --- Passport Photo ---
-    photo_w, photo_h = 65, 65
-    photo_x, photo_y = (width - photo_w) / 2, height - 120
-
-    def draw_placeholder():
-        """Draw placeholder image from static folder"""
-        placeholder_path = os.path.join(settings.BASE_DIR, "static", "images", "speakers", "placeholder.jpg")
-
-        if os.path.exists(placeholder_path):
-            try:
-                # Use the actual placeholder image
-                img = Image.open(placeholder_path).convert("RGBA")
-                img = img.point(lambda p: p * 1.03)
-
-                # Resize to double for better quality
-                img = img.resize((img.width * 2, img.height * 2), Image.LANCZOS)
-
-                # Crop to square (same logic as passport photo)
-                min_side = min(img.size)
-                offset = int(min_side * 0.10)
-                left = (img.width - min_side) / 2
-                top = max((img.height - min_side) / 2 - offset, 0)
-                img = img.crop((left, top, left + min_side, top + min_side))
-                img = img.resize((photo_w * 2, photo_h * 2), Image.LANCZOS)
-
-                # Create circular mask
-                mask = Image.new("L", img.size, 0)
-                ImageDraw.Draw(mask).ellipse((0, 0, img.size[0], img.size[1]), fill=255)
-
-                circ = Image.new("RGBA", img.size)
-                circ.paste(img, (0, 0), mask=mask)
-
-                buf = BytesIO()
-                circ.save(buf, format="PNG")
-                buf.seek(0)
-
-                c.drawImage(ImageReader(buf), photo_x, photo_y,
-                            width=photo_w, height=photo_h, mask="auto")
-
-                # Draw borders
-                center_x = width / 2
-                center_y = photo_y + photo_h / 2
-
-                c.setLineWidth(1.6)
-                c.setStrokeColor(colors.white)
-                c.circle(center_x, center_y, (photo_w / 2) + 1)
-
-                c.setLineWidth(0.8)
-                c.setStrokeColor(colors.HexColor("#3aa655"))
-                c.circle(center_x, center_y, (photo_w / 2) + 2)
-
-                buf.close()
-
-            except Exception as e:
-                logger.warning(f"Error loading placeholder image: {str(e)}")
-                # Fallback to grey rectangle if placeholder fails
-                c.setFillColor(colors.lightgrey)
-                c.roundRect(photo_x, photo_y, photo_w, photo_h, 6, fill=1)
-                c.setFillColor(colors.darkgrey)
-                c.setFont("Helvetica", 6)
-                c.drawCentredString(width / 2, photo_y + photo_h / 2 - 2, "No Photo")
-        else:
-            # Fallback if placeholder.jpg doesn't exist
-            logger.warning(f"Placeholder image not found at: {placeholder_path}")
-            c.setFillColor(colors.lightgrey)
-            c.roundRect(photo_x, photo_y, photo_w, photo_h, 6, fill=1)
-            c.setFillColor(colors.darkgrey)
-            c.setFont("Helvetica", 6)
-            c.drawCentredString(width / 2, photo_y + photo_h / 2 - 2, "No Photo")
-
-    def draw_passport():
-        try:
-            if not (exhib.passport_photo and default_storage.exists(exhib.passport_photo.name)):
-                return draw_placeholder()
-
-            photo_path = default_storage.path(exhib.passport_photo.name)
-            img = Image.open(photo_path).convert("RGBA")
-            img = img.point(lambda p: p * 1.03)
-            img = img.resize((img.width * 2, img.height * 2), Image.LANCZOS)
-
-            min_side = min(img.size)
-            offset = int(min_side * 0.10)
-            left = (img.width - min_side) / 2
-            top = max((img.height - min_side) / 2 - offset, 0)
-            img = img.crop((left, top, left + min_side, top + min_side))
-            img = img.resize((photo_w * 2, photo_h * 2), Image.LANCZOS)
-
-            mask = Image.new("L", img.size, 0)
-            ImageDraw.Draw(mask).ellipse((0, 0, img.size[0], img.size[1]), fill=255)
-
-            circ = Image.new("RGBA", img.size)
-            circ.paste(img, (0, 0), mask=mask)
-
-            buf = BytesIO()
-            circ.save(buf, format="PNG")
-            buf.seek(0)
-
-            c.drawImage(ImageReader(buf), photo_x, photo_y,
-                        width=photo_w, height=photo_h, mask="auto")
-
-            center_x = width / 2
-            center_y = photo_y + photo_h / 2
-
-            c.setLineWidth(1.6)
-            c.setStrokeColor(colors.white)
-            c.circle(center_x, center_y, (photo_w / 2) + 1)
-
-            c.setLineWidth(0.8)
-            c.setStrokeColor(colors.HexColor("#3aa655"))
-            c.circle(center_x, center_y, (photo_w / 2) + 2)
-
-            buf.close()
-
-        except Exception as e:
-            logger.warning(f"Error drawing passport photo for {exhib.id}: {str(e)}")
-            draw_placeholder()
-
-    draw_passport()
-
-    # --- Registrant Info ---
-    text_y = photo_y - s(12)
-    c.setFillColor(colors.black)
-    c.setFont("Helvetica-Bold", s(8.5))
-    c.drawCentredString(width / 2, text_y, full_name[:35])
-
-    c.setFont("Helvetica-Bold", s(13))
-    c.drawCentredString(width / 2, text_y - s(11), category[:35])
-
-    c.setFillColor(colors.white)
-    # Define fonts and sizes
-    base_font = "Helvetica-Bold"
-    base_size = s(20)
-    sup_size = s(12)
-    text_main1, text_sup1 = "10", "th"
-    text_main2, text_sup2 = "12", "th"
-    dash = "–"
-
-    # Measure total width for centering
-    w_main1 = c.stringWidth(text_main1, base_font, base_size)
-    w_sup1 = c.stringWidth(text_sup1, base_font, sup_size)
-    w_dash = c.stringWidth(dash, base_font, base_size)
-    w_main2 = c.stringWidth(text_main2, base_font, base_size)
-    w_sup2 = c.stringWidth(text_sup2, base_font, sup_size)
-    total_width = w_main1 + w_sup1 + w_dash + w_main2 + w_sup2
-
-    x_start = (width / 4.3) - (total_width / 2)
-    y_base = s(40)
-
-    # Draw "10"
-    c.setFont(base_font, base_size)
-    c.drawString(x_start, y_base, text_main1)
-    x_start += w_main1
-
-    # Superscript "th"
-    c.setFont(base_font, sup_size)
-    c.drawString(x_start, y_base + s(7), text_sup1)
-    x_start += w_sup1
-
-    # Dash
-    c.setFont(base_font, base_size)
-    c.drawString(x_start, y_base, dash)
-    x_start += w_dash
-
-    # "12"
-    c.drawString(x_start, y_base, text_main2)
-    x_start += w_main2
-
-    # Superscript "th"
-    c.setFont(base_font, sup_size)
-    c.drawString(x_start, y_base + s(7), text_sup2)
-
-    # --- Date text ("November 2025") ---
-    text = "November 2025"
-    text_x = width / 4.2
-    text_y = s(30)
-    c.setFont("Helvetica", s(11))
-    c.drawCentredString(text_x, text_y, text)
-
-    # Underline accent
-    text_width = c.stringWidth(text, "Helvetica", s(11))
-    c.setLineWidth(s(0.6))
-    c.setStrokeColor(colors.white)
-    c.line(text_x - text_width / 2, text_y - s(3), text_x + text_width / 2, text_y - s(3))
-
-    # --- Venue line ---
-    c.setFont("Helvetica", s(6))
-    c.drawCentredString(width / 4, s(20), "Moi University Annex Campus, ")
-    c.drawCentredString(width / 6.8, s(12), "Eldoret Kenya, ")
-
-    # --- QR Code ---
-    qr_size, qr_margin = s(40), s(7)
-    c.drawImage(
-        qr_reader,
-        width - qr_size - qr_margin,
-        qr_margin,
-        width=qr_size,
-        height=qr_size,
-        mask="auto"
-    )
-
-    c.showPage()
-
-    ###############################################################
-    # ======================== PAGE 2 =============================
-    ###############################################################
-
-    # --- Background ---
-    c.setFillColor(colors.white)
-    c.rect(0, 0, width, height, fill=1)
-
-    # --- Summit Logos again ---
-    summit_logo_path = os.path.join(settings.BASE_DIR, "static", "images", "electronic_citizen_solutions.png")
-    partner_logo_path = os.path.join(settings.BASE_DIR, "static", "images", "Huawei_logo.png")
-
-    logo_h = height * 0.10
-    total_width = 0
-    spacing = width * 0.003
-    images = []
-
-    if os.path.exists(partner_logo_path):
-        img = ImageReader(partner_logo_path)
-        w = width * 0.50
-        images.append((img, w))
-        total_width += w
-
-    if os.path.exists(summit_logo_path):
-        if images:
-            total_width += spacing
-        img = ImageReader(summit_logo_path)
-        w = width * 0.50
-        images.append((img, w))
-        total_width += w
-
-    if images:
-        start_x = (width - total_width) / 2
-        y_pos = height - margin_top - logo_h - s(12)
-        for img, w in images:
-            c.drawImage(img, start_x, y_pos, width=w, height=logo_h,
-                        preserveAspectRatio=True, mask="auto")
-            start_x += w + spacing
-
-    # --- Sponsor / Partner Logo Grid ---
-    logos_dir = os.path.join(settings.BASE_DIR, "static", "images", "badge_logos")
-
-    if os.path.exists(logos_dir):
-        logo_files = sorted([
-            os.path.join(logos_dir, f)
-            for f in os.listdir(logos_dir)
-            if f.lower().endswith((".png", ".jpg", ".jpeg"))
-        ])[:20]
-
-        if logo_files:
-            num_logos = len(logo_files)
-            cols = 5
-            rows = math.ceil(num_logos / cols)
-
-            grid_top = height - s(75)
-            grid_height = s(95)
-            grid_width = width * 0.95
-
-            start_x = (width - grid_width) / 2
-            start_y = grid_top - grid_height
-
-            cell_w = grid_width / cols
-            cell_h = grid_height / rows
-
-            for idx, logo_path in enumerate(logo_files):
-                try:
-                    img = ImageReader(logo_path)
-                    col = idx % cols
-                    row = idx // cols
-
-                    x = start_x + col * cell_w
-                    y = start_y + (rows - 1 - row) * cell_h
-
-                    padding = s(1.5)
-                    c.drawImage(img,
-                                x + padding,
-                                y + padding,
-                                width=cell_w - padding * 2,
-                                height=cell_h - padding * 2,
-                                preserveAspectRatio=True,
-                                mask="auto")
-                except Exception as e:
-                    logger.warning(f"Error drawing logo {logo_path}: {str(e)}")
-                    pass
-
-    ###############################################################
-    # ======================== END PDF ============================
-    ###############################################################
-
-    c.save()
-    pdf_buffer.seek(0)
-
-    # Cleanup QR buffer to free memory
-    if qr_buffer:
-        qr_buffer.close()
-
-    return pdf_buffer
+    return build_badge_pdf(exhib, page_size=page_size, variant="print")
 
 
 def generate_badge_filename(registrant):
@@ -529,8 +144,7 @@ def log_pdf_size(file_path, registrant_id):
 
 def process_single_badge(registrant):
     try:
-        category_obj = Category.objects.only("name").get(id=registrant.category)
-        category_name = category_obj.name
+        category_name, _ = get_category_map()[str(registrant.category)]
         category_folder = get_category_folder_path(category_name)
 
         # Generate badge PDF
@@ -549,7 +163,7 @@ def process_single_badge(registrant):
         logger.info(f"✅ Badge generated: {filename} → {category_name}/")
         return True, None, file_path
 
-    except Category.DoesNotExist:
+    except KeyError:
         error_msg = f"Category not found for registrant {registrant.id}"
         logger.error(error_msg)
         return False, error_msg, None
@@ -560,6 +174,66 @@ def process_single_badge(registrant):
         return False, error_msg, None
 
 
+# ----------------------------------------------------------------------
+# Badge manifest
+# ----------------------------------------------------------------------
+def badge_hash(registrant):
+    """Fingerprint of every input on the registrant's printed badge."""
+    return badge_fingerprint(registrant, BADGE_PAGE_SIZE, "print")
+
+
+def manifest_entry(registrant, file_path):
+    """Manifest record of a badge file just written for `registrant`."""
+    return {
+        'file': os.path.relpath(file_path, CATEGORIES_DIR),
+        'hash': badge_hash(registrant),
+    }
+
+
+def load_manifest():
+    """
+    Badge manifest as {registrant id (str): {'file', 'hash'}}, with files
+    relative to MEDIA_ROOT/categories. Missing or unreadable manifests are
+    treated as empty, so every badge is considered stale.
+    """
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest):
+    os.makedirs(CATEGORIES_DIR, exist_ok=True)
+    tmp_path = f"{MANIFEST_PATH}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=0, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def update_manifest(entries):
+    """Merge {registrant id: entry} into the manifest on disk."""
+    if not entries:
+        return
+    manifest = load_manifest()
+    manifest.update(entries)
+    save_manifest(manifest)
+
+
+def mark_batch_printed(registrant_ids):
+    """
+    Flag a batch of generated badges as printed with a single UPDATE and
+    record them in one PrintLog bulk insert.
+    """
+    if not registrant_ids:
+        return
+    with transaction.atomic():
+        Registrant.objects.filter(id__in=registrant_ids).update(is_printed=1)
+        PrintLog.objects.bulk_create(
+            [PrintLog(record_id_id=registrant_id, batch=True) for registrant_id in registrant_ids]
+        )
+
+
 def process_batch(batch):
     """
     Process a batch of registrants.
@@ -575,27 +249,17 @@ def process_batch(batch):
         'success': 0,
         'failed': 0,
         'errors': [],
-        'files_created': []
+        'files_created': [],
+        'manifest': {}
     }
 
+    written = []
     for registrant in batch:
         success, error, file_path = process_single_badge(registrant)
 
         if success:
-            # Update is_printed flag
-            try:
-                with transaction.atomic():
-                    registrant.is_printed = 1
-                    registrant.save(update_fields=['is_printed'])
-                stats['success'] += 1
-                stats['files_created'].append(file_path)
-            except Exception as e:
-                logger.error(f"Failed to update is_printed for {registrant.id}: {str(e)}")
-                stats['failed'] += 1
-                stats['errors'].append({
-                    'registrant_id': registrant.id,
-                    'error': f"Database update failed: {str(e)}"
-                })
+            written.append((registrant.id, file_path))
+            stats['manifest'][str(registrant.id)] = manifest_entry(registrant, file_path)
         else:
             stats['failed'] += 1
             stats['errors'].append({
@@ -603,10 +267,42 @@ def process_batch(batch):
                 'error': error
             })
 
+    # Only flag the badges that actually made it to disk
+    try:
+        mark_batch_printed([registrant_id for registrant_id, _ in written])
+        stats['success'] += len(written)
+        stats['files_created'].extend(file_path for _, file_path in written)
+    except Exception as e:
+        logger.error(f"Failed to update is_printed for batch: {str(e)}")
+        stats['failed'] += len(written)
+        stats['errors'].extend({
+            'registrant_id': registrant_id,
+            'error': f"Database update failed: {str(e)}"
+        } for registrant_id, _ in written)
+        stats['manifest'] = {}
+
     return stats
 
 
-def process_all_badges(batch_size=10, max_batches=None, enable_gc=True):
+def render_badge_chunk(registrant_ids):
+    """
+    Pool task used by `manage.py generate_badges`: render and mark one chunk
+    of registrants, returning a picklable summary. The parent process owns
+    the manifest and merges the returned entries into it.
+    """
+    batch = list(Registrant.objects.filter(id__in=registrant_ids).order_by("id"))
+    stats = process_batch(batch)
+    return {
+        'total': len(registrant_ids),
+        'success': stats['success'],
+        'failed': stats['failed'] + len(registrant_ids) - len(batch),
+        'errors': stats['errors'],
+        'bytes': sum(os.path.getsize(path) for path in stats['files_created']),
+        'manifest': stats['manifest'],
+    }
+
+
+def process_all_badges(batch_size=10, max_batches=None, enable_gc=True, queryset=None):
     """
     Process all unprinted registrant badges in batches.
     OPTIMIZED FOR LIMITED RESOURCES - handles large datasets efficiently.
@@ -615,6 +311,7 @@ def process_all_badges(batch_size=10, max_batches=None, enable_gc=True):
         batch_size (int): Number of registrants to process per batch (default: 10)
         max_batches (int, optional): Maximum number of batches to process (for testing)
         enable_gc (bool): Force garbage collection after each batch (default: True)
+        queryset (QuerySet, optional): Registrants to process (default: all unprinted)
 
     Returns:
         dict: Overall statistics
@@ -626,10 +323,7 @@ def process_all_badges(batch_size=10, max_batches=None, enable_gc=True):
     logger.info("=" * 70)
 
     # Query registrants that haven't been printed
-    # Use only() to fetch minimal fields for counting
-    # ✅ Process only registrants with specific IDs
-    ids_to_process = [2187]  # <-- put your desired IDs here
-    unprinted_query = Registrant.objects.filter(id__in=ids_to_process)
+    unprinted_query = queryset if queryset is not None else unprinted_registrants()
 
     total_count = unprinted_query.count()
     logger.info(f"📊 Found {total_count} registrants to process")
@@ -651,29 +345,22 @@ def process_all_badges(batch_size=10, max_batches=None, enable_gc=True):
     batch_num = 0
     total_batches = (total_count + batch_size - 1) // batch_size
 
-    # Use iterator() to avoid caching all objects in memory
-    offset = 0
-    while offset < total_count:
+    # Fetch one id-keyed batch at a time to avoid holding everyone in memory
+    done = 0
+    for batch in iter_batches(unprinted_query, batch_size):
         if max_batches and batch_num >= max_batches:
             logger.info(f"⚠️  Reached maximum batch limit ({max_batches}). Stopping.")
             break
 
         batch_num += 1
 
-        # Fetch only the current batch with select_related for category
-        batch = list(
-            unprinted_query[offset:offset + batch_size]
-        )
-
-        if not batch:
-            break
-
         logger.info(f"\n{'─' * 70}")
         logger.info(f"📦 Processing Batch {batch_num}/{total_batches}")
-        logger.info(f"📝 Registrants {offset + 1} to {offset + len(batch)}")
+        logger.info(f"📝 Registrants {done + 1} to {done + len(batch)}")
         logger.info(f"{'─' * 70}")
 
         batch_stats = process_batch(batch)
+        update_manifest(batch_stats['manifest'])
 
         # Update overall statistics
         overall_stats['success'] += batch_stats['success']
@@ -693,6 +380,8 @@ def process_all_badges(batch_size=10, max_batches=None, enable_gc=True):
             for error in batch_stats['errors'][:3]:  # Show max 3 errors per batch
                 logger.info(f"      - Registrant {error['registrant_id']}: {error['error']}")
 
+        done += len(batch)
+
         # Clear batch from memory
         del batch
         del batch_stats
@@ -701,8 +390,6 @@ def process_all_badges(batch_size=10, max_batches=None, enable_gc=True):
         if enable_gc:
             gc.collect()
 
-        offset += batch_size
-
     # Final summary
     logger.info("\n" + "=" * 70)
     logger.info("🎉 FINAL SUMMARY")
@@ -755,10 +442,7 @@ def process_specific_categories(category_names, batch_size=10):
         return {'total': 0, 'success': 0, 'failed': 0}
 
     # Filter by categories and unprinted status
-    unprinted = (
-        Registrant.objects.filter(category__in=category_ids, is_printed__isnull=True) |
-        Registrant.objects.filter(category__in=category_ids).exclude(is_printed=1)
-    )
+    unprinted = unprinted_registrants().filter(category__in=category_ids)
 
     total_count = unprinted.count()
     logger.info(f"📊 Found {total_count} registrants in selected categories")
@@ -767,7 +451,114 @@ def process_specific_categories(category_names, batch_size=10):
         logger.info("✅ No registrants to process in these categories!")
         return {'total': 0, 'success': 0, 'failed': 0}
 
-    return process_all_badges(batch_size=batch_size)
+    return process_all_badges(batch_size=batch_size, queryset=unprinted)
+
+
+def remove_badge_file(relative_path):
+    path = os.path.join(CATEGORIES_DIR, relative_path)
+    if os.path.exists(path):
+        os.remove(path)
+        logger.info(f"🗑️ Removed {relative_path}")
+
+
+def sync_badges(batch_size=50):
+    """
+    Bring the badge files of already printed registrants in line with the
+    manifest: re-render badges that are missing or whose inputs changed
+    (name, category or colour, QR fields, photo, artwork), and remove badge
+    files that no longer belong to any registrant. Unchanged badges are only
+    hashed, so a rerun after a few edits finishes in seconds.
+
+    Returns:
+        dict: Statistics (checked, rendered, failed, removed)
+    """
+    manifest = load_manifest()
+    stats = {'checked': 0, 'rendered': 0, 'failed': 0, 'removed': 0}
+
+    printed = Registrant.objects.filter(is_printed=1)
+    for batch in iter_batches(printed, batch_size):
+        changed = False
+        for registrant in batch:
+            stats['checked'] += 1
+            key = str(registrant.id)
+            entry = manifest.get(key)
+            if (
+                entry
+                and entry['hash'] == badge_hash(registrant)
+                and os.path.exists(os.path.join(CATEGORIES_DIR, entry['file']))
+            ):
+                continue
+
+            success, error, file_path = process_single_badge(registrant)
+            if not success:
+                stats['failed'] += 1
+                continue
+
+            new_entry = manifest_entry(registrant, file_path)
+            # Renamed registrants and category moves leave the old file behind
+            if entry and entry['file'] != new_entry['file']:
+                remove_badge_file(entry['file'])
+                stats['removed'] += 1
+            manifest[key] = new_entry
+            stats['rendered'] += 1
+            changed = True
+
+        if changed:
+            save_manifest(manifest)
+
+    # Registrants that were deleted since their badge was generated
+    existing = {str(pk) for pk in Registrant.objects.values_list('id', flat=True)}
+    for key in set(manifest) - existing:
+        remove_badge_file(manifest.pop(key)['file'])
+        stats['removed'] += 1
+
+    # Badge files nobody in the manifest points at
+    referenced = {entry['file'] for entry in manifest.values()}
+    for folder in os.listdir(CATEGORIES_DIR) if os.path.isdir(CATEGORIES_DIR) else []:
+        folder_path = os.path.join(CATEGORIES_DIR, folder)
+        if not os.path.isdir(folder_path):
+            continue
+        for filename in os.listdir(folder_path):
+            relative_path = os.path.join(folder, filename)
+            if filename.startswith("badge_") and filename.endswith(".pdf") and relative_path not in referenced:
+                remove_badge_file(relative_path)
+                stats['removed'] += 1
+
+    save_manifest(manifest)
+    logger.info(
+        f"🔄 Badge sync: {stats['checked']} checked, {stats['rendered']} re-rendered, "
+        f"{stats['failed']} failed, {stats['removed']} file(s) removed"
+    )
+    return stats
+
+
+def process_sheets(sheet="A4", badge_size="A8", queryset=None, output_path=None):
+    """
+    Impose unprinted badges N-up on A4/A3 sheets with crop marks, sorted by
+    category and surname, into a single print-ready PDF (fronts followed by
+    duplex backs). Does not change is_printed; the print desk marks sheets
+    once they have actually been printed.
+
+    Returns:
+        str: Path of the PDF written
+    """
+    registrants = queryset if queryset is not None else unprinted_registrants()
+    if output_path is None:
+        base_dir = os.path.join(settings.MEDIA_ROOT, "categories")
+        os.makedirs(base_dir, exist_ok=True)
+        output_path = os.path.join(base_dir, f"badge_sheets_{sheet.lower()}_{badge_size.lower()}.pdf")
+
+    logger.info(f"🖨️ Imposing {registrants.count()} badges on {sheet} sheets → {output_path}")
+    with open(output_path, "wb") as f:
+        build_badge_sheets(
+            print_order(registrants).iterator(chunk_size=500),
+            sheet_size=SHEET_SIZES[sheet],
+            badge_size=BADGE_SIZES[badge_size],
+            variant="print",
+            output=f,
+        )
+    log_pdf_size(output_path, "sheets")
+    return output_path
 
 
 # Convenience functions for common operations
@@ -784,10 +575,7 @@ def process_first_10():
     logger.info("=" * 70)
 
     # Query first 10 unprinted registrants
-    unprinted_query = (
-        Registrant.objects.filter(is_printed__isnull=True) |
-        Registrant.objects.exclude(is_printed=1)
-    )
+    unprinted_query = unprinted_registrants()
 
     total_available = unprinted_query.count()
     logger.info(f"📊 Total unprinted registrants: {total_available}")
@@ -797,7 +585,7 @@ def process_first_10():
         return {'total': 0, 'success': 0, 'failed': 0}
 
     # Get first 10 only
-    batch = list(unprinted_query[:10])
+    batch = list(unprinted_query.order_by("id")[:10])
     actual_count = len(batch)
 
     logger.info(f"🎯 Processing: {actual_count} registrants")
@@ -812,6 +600,7 @@ def process_first_10():
     }
 
     # Process each registrant
+    written = []
     for idx, registrant in enumerate(batch, 1):
         logger.info(f"\n🔄 Processing {idx}/{actual_count}: ID={registrant.id}")
         logger.info(f"   Name: {registrant.get_full_name()}")
@@ -819,29 +608,15 @@ def process_first_10():
         success, error, file_path = process_single_badge(registrant)
 
         if success:
-            # Update is_printed flag
-            try:
-                with transaction.atomic():
-                    registrant.is_printed = 1
-                    registrant.save(update_fields=['is_printed'])
-                stats['success'] += 1
-
-                # Get file size
-                if file_path and os.path.exists(file_path):
-                    file_size = os.path.getsize(file_path) / 1024  # KB
-                    logger.info(f"   ✅ SUCCESS - File: {os.path.basename(file_path)}")
-                    logger.info(f"   📊 Size: {file_size:.1f} KB")
-                else:
-                    logger.info(f"   ✅ SUCCESS")
+            written.append((registrant, file_path))
 
-            except Exception as e:
-                logger.error(f"   ❌ FAILED: Database update error - {str(e)}")
-                stats['failed'] += 1
-                stats['errors'].append({
-                    'registrant_id': registrant.id,
-                    'name': registrant.get_full_name(),
-                    'error': f"DB update failed: {str(e)}"
-                })
+            # Get file size
+            if file_path and os.path.exists(file_path):
+                file_size = os.path.getsize(file_path) / 1024  # KB
+                logger.info(f"   ✅ SUCCESS - File: {os.path.basename(file_path)}")
+                logger.info(f"   📊 Size: {file_size:.1f} KB")
+            else:
+                logger.info(f"   ✅ SUCCESS")
         else:
             logger.error(f"   ❌ FAILED: {error}")
             stats['failed'] += 1
@@ -851,6 +626,23 @@ def process_first_10():
                 'error': error
             })
 
+    # Update is_printed flags for everything written
+    try:
+        mark_batch_printed([registrant.id for registrant, _ in written])
+        update_manifest({
+            str(registrant.id): manifest_entry(registrant, file_path)
+            for registrant, file_path in written
+        })
+        stats['success'] += len(written)
+    except Exception as e:
+        logger.error(f"   ❌ FAILED: Database update error - {str(e)}")
+        stats['failed'] += len(written)
+        stats['errors'].extend({
+            'registrant_id': registrant.id,
+            'name': registrant.get_full_name(),
+            'error': f"DB update failed: {str(e)}"
+        } for registrant, _ in written)
+
     # Cleanup
     del batch
     gc.collect()
@@ -905,10 +697,7 @@ def process_conservative(batch_size=5):
     logger.info(f"   Pause between batches: 2 seconds")
 
     # Query total count
-    unprinted_query = (
-        Registrant.objects.filter(is_printed__isnull=True) |
-        Registrant.objects.exclude(is_printed=1)
-    )
+    unprinted_query = unprinted_registrants()
     total_count = unprinted_query.count()
 
     if total_count == 0:
@@ -926,41 +715,39 @@ def process_conservative(batch_size=5):
         'batches': 0
     }
 
-    offset = 0
+    done = 0
     batch_num = 0
 
-    while offset < total_count:
+    for batch in iter_batches(unprinted_query, batch_size):
         batch_num += 1
 
-        # Fetch minimal batch
-        batch = list(
-            unprinted_query[offset:offset + batch_size]
-        )
-
-        if not batch:
-            break
-
-        logger.info(f"\n📦 Batch {batch_num} ({offset + 1}-{offset + len(batch)} of {total_count})")
+        logger.info(f"\n📦 Batch {batch_num} ({done + 1}-{done + len(batch)} of {total_count})")
 
         # Process batch
+        written = []
         for registrant in batch:
             success, error, file_path = process_single_badge(registrant)
 
             if success:
-                try:
-                    with transaction.atomic():
-                        registrant.is_printed = 1
-                        registrant.save(update_fields=['is_printed'])
-                    stats['success'] += 1
-                    logger.info(f"   ✅ {registrant.id}")
-                except Exception as e:
-                    stats['failed'] += 1
-                    logger.error(f"   ❌ {registrant.id}: DB update failed")
+                written.append((registrant, file_path))
+                logger.info(f"   ✅ {registrant.id}")
             else:
                 stats['failed'] += 1
                 logger.error(f"   ❌ {registrant.id}: {error}")
 
+        try:
+            mark_batch_printed([registrant.id for registrant, _ in written])
+            update_manifest({
+                str(registrant.id): manifest_entry(registrant, file_path)
+                for registrant, file_path in written
+            })
+            stats['success'] += len(written)
+        except Exception as e:
+            stats['failed'] += len(written)
+            logger.error(f"   ❌ Batch {batch_num}: DB update failed")
+
         stats['batches'] += 1
+        done += len(batch)
 
         # Aggressive cleanup
         del batch
@@ -970,8 +757,6 @@ def process_conservative(batch_size=5):
         # Pause to let system breathe
         time.sleep(2)
 
-        offset += batch_size
-
     logger.info(f"\n✅ Conservative processing complete!")
     logger.info(f"   Success: {stats['success']}/{stats['total']}")
     logger.info(f"   Failed: {stats['failed']}/{stats['total']}")
@@ -979,52 +764,155 @@ def process_conservative(batch_size=5):
     return stats
 
 
-def estimate_resources():
+def _rss_mb():
+    """Resident memory of this process right now, or None if it cannot be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _available_memory_mb():
+    """Memory the host can still hand out, or None if it cannot be read."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def estimate_resources(sample_size=20, chunk_seconds=10):
     """
-    Estimate memory usage for badge generation.
-    Helps determine optimal batch size.
+    Calibrate a badge run on this host: render a random sample of real
+    unprinted registrants in memory (nothing is marked printed, and photo
+    crops go to a temporary directory), measure time per badge, RSS growth
+    and PDF bytes, and project wall time, disk use and the worker / chunk
+    counts for `manage.py generate_badges`.
+
+    Args:
+        sample_size (int): Registrants rendered to calibrate
+        chunk_seconds (int): Target rendering time of one worker chunk
+
+    Returns:
+        dict: Measurements and the recommended plan (empty if nothing to do)
     """
-    import sys
+    import gc
+    import random
+    import shutil
+    import tempfile
+    import time
 
     logger.info("=" * 70)
-    logger.info("📊 RESOURCE ESTIMATION")
+    logger.info("📊 BADGE RUN CALIBRATION")
     logger.info("=" * 70)
 
-    # Count registrants
-    unprinted = (
-        Registrant.objects.filter(is_printed__isnull=True) |
-        Registrant.objects.exclude(is_printed=1)
-    )
-    total = unprinted.count()
+    ids = list(unprinted_registrants().values_list("id", flat=True))
+    total = len(ids)
+    logger.info(f"📝 Registrants to process: {total}")
+    if total == 0:
+        logger.info("✅ No registrants to process.")
+        return {}
 
-    # Rough estimates
-    mb_per_badge = 2  # Average: QR code + images + PDF
-    mb_per_registrant = 0.1  # Django model in memory
+    sample_ids = random.sample(ids, min(sample_size, total))
+    sample = list(Registrant.objects.filter(id__in=sample_ids))
 
-    logger.info(f"📝 Registrants to process: {total}")
-    logger.info(f"\n💾 Estimated Memory Usage:")
-    logger.info(f"   Batch of 5:  {(5 * mb_per_badge + 5 * mb_per_registrant):.1f} MB")
-    logger.info(f"   Batch of 10: {(10 * mb_per_badge + 10 * mb_per_registrant):.1f} MB")
-    logger.info(f"   Batch of 20: {(20 * mb_per_badge + 20 * mb_per_registrant):.1f} MB")
-
-    logger.info(f"\n⏱️  Estimated Time (rough):")
-    logger.info(f"   Batch of 5:  ~{(total / 5 * 8 / 60):.1f} minutes")
-    logger.info(f"   Batch of 10: ~{(total / 10 * 8 / 60):.1f} minutes")
-    logger.info(f"   Batch of 20: ~{(total / 20 * 8 / 60):.1f} minutes")
-
-    logger.info(f"\n💡 RECOMMENDATIONS:")
-    if total > 1000:
-        logger.info("   ⚠️  Large dataset detected!")
-        logger.info("   • Start with test_single_batch() first")
-        logger.info("   • Use process_conservative(batch_size=5) for safety")
-        logger.info("   • Consider running overnight")
-        logger.info("   • Monitor system resources")
-    else:
-        logger.info("   • Standard batch_size=10 should work fine")
-        logger.info("   • Run process_all_badges()")
+    sizes = []
+    failed = 0
+    with tempfile.TemporaryDirectory() as crop_dir, badge_photo_cache(crop_dir):
+        # First render compiles the shared artwork, keep it out of the per-badge
+        # time and memory; what is resident after it is a worker's fixed cost
+        build_exhibitor_badge_pdf(sample[0]).close()
+        gc.collect()
+        rss_before = _rss_mb()
 
+        started = time.perf_counter()
+        for registrant in sample:
+            try:
+                sizes.append(len(build_exhibitor_badge_pdf(registrant).getvalue()))
+            except Exception as e:
+                failed += 1
+                logger.error(f"❌ Calibration render failed for registrant {registrant.id}: {e}")
+        elapsed = time.perf_counter() - started
+        gc.collect()
+        rss_after = _rss_mb()
+
+    if not sizes:
+        logger.error("❌ No badge in the sample rendered, fix the errors above first")
+        return {}
+
+    seconds_per_badge = elapsed / len(sample)
+    bytes_per_badge = sum(sizes) / len(sizes)
+    cpus = os.cpu_count() or 1
+
+    # Chunks long enough to amortise the per-chunk queries
+    chunk_size = max(1, round(chunk_seconds / seconds_per_badge))
+
+    # Each worker is a full Django process holding its own cached artwork, and
+    # grows by what the sample added per badge over a chunk
+    mb_per_badge = worker_mb = None
+    if rss_before is not None and rss_after is not None:
+        mb_per_badge = max(0.0, rss_after - rss_before) / len(sample)
+        worker_mb = rss_before + mb_per_badge * chunk_size
+    available_mb = _available_memory_mb()
+    workers = cpus
+    if worker_mb and available_mb:
+        # Leave a quarter of the free memory for the database and the OS
+        workers = max(1, min(cpus, int(available_mb * 0.75 // worker_mb)))
+
+    # At least four chunks per worker, so a slow one does not leave the others idle at the end
+    chunk_size = max(1, min(chunk_size, total // (workers * 4) or 1))
+
+    projected_seconds = total * seconds_per_badge / workers
+    disk_mb = total * bytes_per_badge / (1024 * 1024)
+    os.makedirs(CATEGORIES_DIR, exist_ok=True)
+    free_disk_mb = shutil.disk_usage(CATEGORIES_DIR).free / (1024 * 1024)
+
+    plan = {
+        'total': total,
+        'sampled': len(sample),
+        'failed': failed,
+        'seconds_per_badge': seconds_per_badge,
+        'bytes_per_badge': bytes_per_badge,
+        'base_mb': rss_before,
+        'mb_per_badge': mb_per_badge,
+        'worker_mb': worker_mb,
+        'available_mb': available_mb,
+        'workers': workers,
+        'chunk_size': chunk_size,
+        'projected_seconds': projected_seconds,
+        'disk_mb': disk_mb,
+        'free_disk_mb': free_disk_mb,
+    }
+
+    logger.info(f"🎫 Sampled {len(sample)} badge(s), {failed} failed")
+    logger.info(f"⏱️  {seconds_per_badge * 1000:.0f} ms per badge on one core")
+    logger.info(f"📄 {bytes_per_badge / 1024:.0f} KB per badge PDF")
+    if worker_mb is not None:
+        logger.info(f"💾 {rss_before:.0f} MB resident after warm-up, +{mb_per_badge * 1024:.0f} KB per badge,"
+                    f" ~{worker_mb:.0f} MB per worker")
+    if available_mb is not None:
+        logger.info(f"💾 Available memory {available_mb:.0f} MB, {cpus} CPU(s)")
+
+    logger.info(f"\n📈 PROJECTION for {total} badges:")
+    logger.info(f"   Wall time: ~{projected_seconds / 60:.1f} minutes on {workers} worker(s)"
+                f" (~{total * seconds_per_badge / 60:.1f} minutes on one)")
+    logger.info(f"   Disk: ~{disk_mb:.0f} MB ({free_disk_mb:.0f} MB free)")
+    if disk_mb > free_disk_mb:
+        logger.warning("   ⚠️  Not enough free disk space for the full run!")
+
+    logger.info(f"\n💡 RECOMMENDATION:")
+    logger.info(f"   python manage.py generate_badges --workers {workers} --chunk-size {chunk_size}")
     logger.info("=" * 70)
 
+    return plan
+
 
 if __name__ == "__main__":
     # When run directly, process all badges
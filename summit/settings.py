@@ -22,6 +22,15 @@ ALLOWED_HOSTS = config["ALLOWED_HOSTS"]
 # API KEY FOR REG SERVICE
 REG_SERVICE_API_KEY = config["REG_SERVICE_API_KEY"]
 
+# === Cache ===
+# Must be shared by all gunicorn workers: rate limits and cache version keys live here
+CACHES = {
+    "default": {
+        "BACKEND": config.get("CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"),
+        "LOCATION": config.get("CACHE_LOCATION", "/var/tmp/summit_cache"),
+    }
+}
+
 # === Rate Limit Settings ===
 RATE_LIMIT_REQUESTS = 60  # Max number of requests allowed
 RATE_LIMIT_PERIOD = 60  # In seconds (1 minute)
@@ -150,6 +159,12 @@ EMAIL_HOST_USER = config["EMAIL_HOST_USER"]
 EMAIL_HOST_PASSWORD = config["EMAIL_HOST_PASSWORD"]
 DEFAULT_FROM_EMAIL = config["DEFAULT_FROM_EMAIL"]
 
+# Email outbox worker (python manage.py send_outbox)
+EMAIL_OUTBOX_WORKERS = 4  # Parallel SMTP connections
+EMAIL_OUTBOX_BATCH_SIZE = 20  # Rows claimed per poll
+EMAIL_OUTBOX_MAX_ATTEMPTS = 6  # Then the row is dead-lettered
+EMAIL_OUTBOX_BACKOFF_SECONDS = 30  # Doubles after every failed attempt
+
 
 # Auto logout after minutes of inactivity
 AUTO_LOGOUT_TIMEOUT = 60 * 15
@@ -84,4 +84,6 @@ class SummitpageConfig(AppConfig):
     name = "summitPage"
 
     def ready(self):
+        from . import signals  # noqa: F401
+
         post_migrate.connect(create_default_admin, sender=self)
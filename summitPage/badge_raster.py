@@ -0,0 +1,211 @@
+"""
+Raster badge renderer for the print-station previews.
+
+RasterCanvas implements the handful of reportlab canvas calls BadgeLayout
+uses, drawing them with PIL at printer DPI. The badge layout code is shared
+with the PDF builder, so the preview cannot drift from the printed badge,
+and there is no PDF -> poppler -> PNG round trip. Form XObjects become
+cached RGBA layers, so the static artwork is rasterised once per process.
+"""
+import os
+from functools import lru_cache
+from io import BytesIO
+
+import reportlab
+from PIL import Image, ImageDraw, ImageFont
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from .badges import BASE_PAGE_SIZE, badge_fingerprint, cached_badge_artifact, get_badge_layout
+
+PREVIEW_DPI = 300
+PREVIEW_DIR = "badges/previews"
+
+# Helvetica-compatible Type 1 fonts that ship with reportlab
+_FONTS_DIR = os.path.join(os.path.dirname(reportlab.__file__), "fonts")
+FONT_FILES = {
+    "Helvetica": os.path.join(_FONTS_DIR, "_a______.pfb"),
+    "Helvetica-Bold": os.path.join(_FONTS_DIR, "_ab_____.pfb"),
+}
+
+# Static layers keyed by (form name, dpi), shared by every preview in the process
+_form_layers = {}
+
+
+@lru_cache(maxsize=64)
+def _font(name, size_px):
+    return ImageFont.truetype(FONT_FILES[name], size_px)
+
+
+def _rgb(color):
+    return tuple(int(round(v * 255)) for v in color.rgb())
+
+
+class _Path:
+    def __init__(self):
+        self.points = []
+
+    def moveTo(self, x, y):
+        self.points.append((x, y))
+
+    lineTo = moveTo
+
+    def close(self):
+        pass
+
+
+class RasterCanvas:
+    """Just enough of reportlab's Canvas to draw a BadgeLayout with PIL."""
+
+    def __init__(self, pagesize, dpi=PREVIEW_DPI):
+        self.scale = dpi / 72
+        self.dpi = dpi
+        self.width, self.height = pagesize
+        size = (round(self.width * self.scale), round(self.height * self.scale))
+        self.image = Image.new("RGBA", size, "white")
+        self._layer = self.image
+        self._form = None
+        self._fill = self._stroke = (0, 0, 0)
+        self._line_width = 1
+        self._font_name, self._font_size = "Helvetica", 12
+
+    # --- coordinates ---
+    def _xy(self, x, y):
+        return x * self.scale, (self.height - y) * self.scale
+
+    def _box(self, x, y, w, h):
+        left, top = self._xy(x, y + h)
+        right, bottom = self._xy(x + w, y)
+        return [left, top, right, bottom]
+
+    @property
+    def _draw(self):
+        return ImageDraw.Draw(self._layer)
+
+    def _width_px(self):
+        return max(1, round(self._line_width * self.scale))
+
+    # --- state ---
+    def setFillColor(self, color):
+        self._fill = _rgb(color)
+
+    def setStrokeColor(self, color):
+        self._stroke = _rgb(color)
+
+    def setLineWidth(self, width):
+        self._line_width = width
+
+    def setFont(self, name, size):
+        self._font_name, self._font_size = name, size
+
+    # --- forms ---
+    def hasForm(self, name):
+        return (name, self.dpi) in _form_layers
+
+    def beginForm(self, name):
+        self._form = name
+        self._layer = Image.new("RGBA", self.image.size, (0, 0, 0, 0))
+
+    def endForm(self):
+        _form_layers[(self._form, self.dpi)] = self._layer
+        self._layer, self._form = self.image, None
+
+    def doForm(self, name):
+        self.image.alpha_composite(_form_layers[(name, self.dpi)])
+
+    # --- shapes ---
+    def rect(self, x, y, width, height, stroke=1, fill=0):
+        self._draw.rectangle(
+            self._box(x, y, width, height),
+            fill=self._fill if fill else None,
+            outline=self._stroke if stroke else None,
+            width=self._width_px(),
+        )
+
+    def roundRect(self, x, y, width, height, radius, stroke=1, fill=0):
+        self._draw.rounded_rectangle(
+            self._box(x, y, width, height), radius=radius * self.scale,
+            fill=self._fill if fill else None,
+            outline=self._stroke if stroke else None,
+            width=self._width_px(),
+        )
+
+    def circle(self, x, y, r, stroke=1, fill=0):
+        self._draw.ellipse(
+            self._box(x - r, y - r, 2 * r, 2 * r),
+            fill=self._fill if fill else None,
+            outline=self._stroke if stroke else None,
+            width=self._width_px(),
+        )
+
+    def line(self, x1, y1, x2, y2):
+        self._draw.line([self._xy(x1, y1), self._xy(x2, y2)], fill=self._stroke, width=self._width_px())
+
+    def beginPath(self):
+        return _Path()
+
+    def drawPath(self, path, stroke=1, fill=0):
+        points = [self._xy(x, y) for x, y in path.points]
+        self._draw.polygon(
+            points,
+            fill=self._fill if fill else None,
+            outline=self._stroke if stroke else None,
+        )
+
+    # --- text ---
+    def drawString(self, x, y, text):
+        font = _font(self._font_name, round(self._font_size * self.scale))
+        self._draw.text(self._xy(x, y), text, font=font, fill=self._fill, anchor="ls")
+
+    def drawCentredString(self, x, y, text):
+        width = stringWidth(text, self._font_name, self._font_size)
+        self.drawString(x - width / 2, y, text)
+
+    # --- images ---
+    def drawImage(self, image, x, y, width=None, height=None, mask=None,
+                  preserveAspectRatio=False, anchor="c"):
+        if isinstance(image, ImageReader):
+            img = image._image
+        elif isinstance(image, Image.Image):
+            img = image
+        else:
+            img = Image.open(image)
+        img = img.convert("RGBA")
+
+        if preserveAspectRatio:
+            # Fit inside the box and centre it, like reportlab's anchor="c"
+            ratio = min(width / img.width, height / img.height)
+            fitted_w, fitted_h = img.width * ratio, img.height * ratio
+            x += (width - fitted_w) / 2
+            y += (height - fitted_h) / 2
+            width, height = fitted_w, fitted_h
+
+        left, top = self._xy(x, y + height)
+        size = (max(1, round(width * self.scale)), max(1, round(height * self.scale)))
+        img = img.resize(size, Image.LANCZOS)
+        self._layer.alpha_composite(img, (round(left), round(top)))
+
+    def showPage(self):
+        pass
+
+
+def render_badge_image(registrant, page_size=BASE_PAGE_SIZE, variant="view", dpi=PREVIEW_DPI):
+    """Front of the registrant's badge as an RGB PIL image at `dpi`."""
+    c = RasterCanvas(page_size, dpi=dpi)
+    get_badge_layout(registrant, page_size, variant).draw_front(c, registrant)
+    return c.image.convert("RGB")
+
+
+def badge_preview(registrant, page_size=BASE_PAGE_SIZE, variant="view", fingerprint=None):
+    """
+    Storage name of the registrant's badge preview PNG, rendered once per
+    badge fingerprint (layout version and every input on the badge).
+    """
+    def render():
+        buffer = BytesIO()
+        image = render_badge_image(registrant, page_size, variant)
+        image.save(buffer, format="PNG", dpi=(PREVIEW_DPI, PREVIEW_DPI))
+        return buffer.getvalue()
+
+    fingerprint = fingerprint or badge_fingerprint(registrant, page_size, variant)
+    return cached_badge_artifact(PREVIEW_DIR, registrant, fingerprint, "png", render)
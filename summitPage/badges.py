@@ -0,0 +1,885 @@
+"""
+Badge rendering shared by the badge views and the badge_gen batch script.
+
+Everything that is the same on every badge (flag accents, logos, the date
+artwork, venue lines and the partner logo page) is compiled once per
+(page size, category colour) into a reportlab form XObject. Rendering a
+registrant only stamps the photo, name, category and QR code on top of it.
+"""
+import contextvars
+import glob
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from io import BytesIO
+
+import qrcode
+import zipstream
+from qrcode.constants import ERROR_CORRECT_M
+from PIL import Image, ImageDraw
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections
+from django.utils.crypto import constant_time_compare, salted_hmac
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A3, A4, A7, A8, landscape, portrait
+from reportlab.lib.units import mm
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+from .media import file_sha256
+from .models import Category
+
+logger = logging.getLogger(__name__)
+
+BASE_PAGE_SIZE = portrait(A7)
+BADGE_SIZES = {"A7": portrait(A7), "A8": portrait(A8)}
+SHEET_SIZES = {"A4": A4, "A3": A3}
+SUMMIT_GREEN = colors.HexColor("#3aa655")
+KENYA_RED = colors.HexColor("#d62612")
+
+IMAGES_DIR = os.path.join(settings.BASE_DIR, "static", "images")
+
+# Print-ready copies of the badge artwork written by `manage.py build_badge_assets`
+BADGE_ASSETS_DIR = str(getattr(
+    settings, "BADGE_ASSETS_DIR", os.path.join(settings.MEDIA_ROOT, "badge_assets")
+))
+BADGE_ASSET_DPI = getattr(settings, "BADGE_ASSET_DPI", 300)
+
+# Bump whenever the badge layout changes so cached renders are redone
+BADGE_LAYOUT_VERSION = 2
+
+# Versioned, signed QR payload; bump the prefix if its format ever changes
+BADGE_QR_PREFIX = "KSS1"
+BADGE_QR_SALT = "summitPage.badges.qr"
+BADGE_QR_SIGNATURE_LENGTH = 10
+QR_QUIET_ZONE = 4  # modules of white around the code, as the QR spec asks
+
+# Rendered badges cached by fingerprint, see cached_badge_artifact()
+BADGE_PDF_DIR = "badges/pdf"
+
+# Photos are rasterised at twice their size in points
+PHOTO_SCALE = 2
+# Set by badge_photo_cache() to keep crops out of the upload folders
+_photo_cache_dir = contextvars.ContextVar("badge_photo_cache_dir", default=None)
+
+# Threads rendering ahead of a streamed badge ZIP
+BADGE_ZIP_WORKERS = getattr(settings, "BADGE_ZIP_WORKERS", 2)
+
+# The cached artwork readers share one file handle each, so only one thread
+# at a time may embed them while compiling a form
+_asset_lock = threading.Lock()
+
+# Images are embedded as raw binary streams; ASCII85 only inflates them by a
+# quarter and reportlab's pure-python encoder dominated badge render time.
+rl_config.useA85 = 0
+
+# (file, share of page width) for the logo rows; heights are a share of page height
+FRONT_LOGOS = [("badge_partner.png", 0.48), ("summit_logo.png", 0.52)]
+FRONT_LOGO_HEIGHT = 0.25
+BACK_LOGOS = [("Huawei_logo.png", 0.50), ("electronic_citizen_solutions.png", 0.50)]
+BACK_LOGO_HEIGHT = 0.10
+PARTNER_LOGOS_DIR = os.path.join(IMAGES_DIR, "badge_logos")
+
+# Per-variant differences between the on-screen badge and the printed badge
+VARIANTS = {
+    # Single badges downloaded from the dashboard / badge portal
+    "view": {
+        "photo_size": 80,
+        "photo_top": 165,
+        "placeholder": None,
+        "back_page": False,
+    },
+    # Bulk print run (badge_gen): smaller photo, placeholder image and partner logo page
+    "print": {
+        "photo_size": 65,
+        "photo_top": 120,
+        "placeholder": os.path.join(IMAGES_DIR, "speakers", "placeholder.jpg"),
+        "back_page": True,
+    },
+}
+
+
+def _normalize_color(value):
+    try:
+        return colors.toColor(value) if value else colors.black
+    except ValueError:
+        return colors.black
+
+
+def optimized_asset_path(path):
+    """Where build_badge_assets writes the print-ready copy of `path`."""
+    relative = os.path.relpath(path, IMAGES_DIR)
+    return os.path.join(BADGE_ASSETS_DIR, os.path.splitext(relative)[0] + ".jpg")
+
+
+def partner_logo_files():
+    if not os.path.exists(PARTNER_LOGOS_DIR):
+        return []
+    return sorted(
+        os.path.join(PARTNER_LOGOS_DIR, f)
+        for f in os.listdir(PARTNER_LOGOS_DIR)
+        if f.lower().endswith((".png", ".jpg", ".jpeg"))
+    )[:20]
+
+
+@lru_cache(maxsize=None)
+def _image_reader(path):
+    """
+    Decoded artwork, loaded once per process. Prefers the optimized copy when it
+    is at least as new as the source; those are baseline JPEGs, which reportlab
+    embeds as-is instead of re-compressing the pixels into every PDF.
+    """
+    if not os.path.exists(path):
+        return None
+    optimized = optimized_asset_path(path)
+    if os.path.exists(optimized) and os.path.getmtime(optimized) >= os.path.getmtime(path):
+        path = optimized
+    return ImageReader(path)
+
+
+def circular_photo(path, size):
+    """
+    Face-biased square crop of a photo, circle-masked onto white at 2x `size`.
+    JPEGs are decoded in draft mode at the smallest scale that still covers the
+    crop, and the crop and resize happen in a single resampling pass.
+    """
+    px = size * PHOTO_SCALE
+    with Image.open(path) as img:
+        min_side = min(img.size)
+        img.draft("RGB", (math.ceil(img.width * px / min_side), math.ceil(img.height * px / min_side)))
+        img = img.convert("RGB")
+
+    min_side = min(img.size)
+    offset = int(min_side * 0.10)
+    left = (img.width - min_side) / 2
+    top = max((img.height - min_side) / 2 - offset, 0)
+    img = img.resize((px, px), Image.LANCZOS, box=(left, top, left + min_side, top + min_side))
+    img = img.point(lambda p: p * 1.03)
+
+    # The photo always sits on the white part of the badge, so a flattened
+    # JPEG looks the same as a transparent PNG and embeds without re-encoding
+    mask = Image.new("L", img.size, 0)
+    ImageDraw.Draw(mask).ellipse((0, 0, px, px), fill=255)
+    return Image.composite(img, Image.new("RGB", img.size, "white"), mask)
+
+
+def badge_photo_path(path, size, digest=None):
+    """
+    Ready-made circular crop of the photo at `path`, stored next to it and keyed
+    by the file's hash, so each unique photo is cropped once for every reprint.
+    """
+    digest = digest or file_sha256(path)
+    stem = os.path.splitext(path)[0]
+    if _photo_cache_dir.get():
+        stem = os.path.join(_photo_cache_dir.get(), os.path.basename(stem))
+    cached = f"{stem}.badge-{digest[:16]}-{size * PHOTO_SCALE}.jpg"
+    if not os.path.exists(cached):
+        tmp_path = f"{cached}.{os.getpid()}.tmp"
+        circular_photo(path, size).save(tmp_path, "JPEG", quality=90)
+        os.replace(tmp_path, cached)
+    return cached
+
+
+@contextmanager
+def badge_photo_cache(directory):
+    """Write the crops made inside the block to `directory` instead of next to the uploads."""
+    token = _photo_cache_dir.set(directory)
+    try:
+        yield
+    finally:
+        _photo_cache_dir.reset(token)
+
+
+def prepare_badge_photos(path, digest=None):
+    """
+    Precompute the crops for every badge variant (called by process_media),
+    dropping crops of what the file held before it was normalized.
+    """
+    digest = digest or file_sha256(path)
+    for size in sorted({options["photo_size"] for options in VARIANTS.values()}):
+        badge_photo_path(path, size, digest)
+    remove_badge_photos(path, keep=digest)
+
+
+def remove_badge_photos(path, keep=None):
+    """Delete the crops stored next to the photo at `path`, except those of the `keep` digest."""
+    stem = glob.escape(os.path.splitext(path)[0])
+    kept = f".badge-{keep[:16]}-" if keep else None
+    for cached in glob.glob(f"{stem}.badge-*.jpg"):
+        if kept and kept in os.path.basename(cached):
+            continue
+        try:
+            os.remove(cached)
+        except FileNotFoundError:
+            pass
+
+
+@lru_cache(maxsize=None)
+def _placeholder_reader(path, size):
+    try:
+        return ImageReader(circular_photo(path, size))
+    except Exception as e:
+        print(f"⚠️ Could not load badge placeholder {path}: {e}")
+        return None
+
+
+def photo_digest(registrant):
+    """sha256 of the registrant's passport photo, or None if there is no photo."""
+    photo = registrant.passport_photo
+    if not (photo and default_storage.exists(photo.name)):
+        return None
+    # Hash recorded by process_media, if it is up to date
+    if registrant.media_status == "ready" and (registrant.media_hashes or {}).get("passport_photo"):
+        return registrant.media_hashes["passport_photo"]
+    return file_sha256(default_storage.path(photo.name))
+
+
+@lru_cache(maxsize=None)
+def _artwork_stamp():
+    """Modification times of the badge artwork, so rebuilt assets show up in fingerprints."""
+    layout = BadgeLayout(BASE_PAGE_SIZE, SUMMIT_GREEN, "print")
+    stamps = []
+    for path in sorted(layout.artwork_boxes()):
+        for candidate in (path, optimized_asset_path(path)):
+            if os.path.exists(candidate):
+                stamps.append(int(os.path.getmtime(candidate)))
+    return stamps
+
+
+def badge_fingerprint(registrant, page_size=BASE_PAGE_SIZE, variant="view"):
+    """
+    Hash of every input that ends up on the registrant's badge: layout
+    version and artwork, name, category and colour, QR fields and photo.
+    Cached renders keyed on it go stale by themselves when any of them changes.
+    """
+    from .category_cache import category_color
+
+    parts = [
+        BADGE_LAYOUT_VERSION,
+        _artwork_stamp(),
+        variant,
+        [round(v, 2) for v in page_size],
+        registrant.get_full_name() or "",
+        registrant.get_category_display() or "",
+        _normalize_color(category_color(registrant.category)).hexval(),
+        badge_qr_data(registrant),
+        photo_digest(registrant),
+    ]
+    return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+
+def _qr_signature(pk):
+    return salted_hmac(BADGE_QR_SALT, pk).hexdigest()[:BADGE_QR_SIGNATURE_LENGTH].upper()
+
+
+def badge_qr_data(registrant):
+    """
+    Badge QR payload: `KSS1:<pk>:<signature>`. Only upper case letters,
+    digits and ':' / '-', so it fits QR alphanumeric mode: version 1 (21
+    modules) for registrant pks up to 4 digits, version 2 (25) for longer
+    ones, version 3 (29) for exhibitor UUIDs, all at error correction M.
+    The gate looks the holder up by pk (see parse_badge_qr).
+    """
+    pk = str(registrant.pk).upper()
+    return f"{BADGE_QR_PREFIX}:{pk}:{_qr_signature(pk)}"
+
+
+def parse_badge_qr(payload):
+    """Primary key (as a string) from a scanned badge QR, or None if it is not genuine."""
+    try:
+        prefix, pk, signature = payload.strip().upper().split(":")
+    except (AttributeError, ValueError):
+        return None
+    if prefix != BADGE_QR_PREFIX or not constant_time_compare(signature, _qr_signature(pk)):
+        return None
+    return pk.lower()
+
+
+@lru_cache(maxsize=4096)
+def qr_module_runs(payload):
+    """
+    (modules per side, dark runs) of the payload's QR code. Runs are
+    (row, first column, length), counted from the top left of the code
+    without its quiet zone.
+    """
+    qr = qrcode.QRCode(border=0, error_correction=ERROR_CORRECT_M)
+    qr.add_data(payload)
+    qr.make(fit=True)
+
+    runs = []
+    for row, modules in enumerate(qr.modules):
+        start = None
+        for col, dark in enumerate([*modules, False]):
+            if dark and start is None:
+                start = col
+            elif not dark and start is not None:
+                runs.append((row, start, col - start))
+                start = None
+    return len(qr.modules), tuple(runs)
+
+
+class BadgeLayout:
+    """Geometry and static artwork for one (page size, colour, variant)."""
+
+    def __init__(self, page_size, color, variant):
+        self.width, self.height = page_size
+        self.color = color
+        self.options = VARIANTS[variant]
+
+        base_width, base_height = BASE_PAGE_SIZE
+        self.scale = (self.width / base_width + self.height / base_height) / 2
+
+        size_key = f"{int(self.width)}x{int(self.height)}"
+        self.front_form = f"badge_{variant}_{size_key}_{color.hexval()[2:]}"
+        self.back_form = f"badge_back_{size_key}"
+
+        # --- Variable field positions ---
+        self.photo_size = self.options["photo_size"]
+        self.photo_x = (self.width - self.photo_size) / 2
+        self.photo_y = self.height - self.options["photo_top"]
+        self.text_y = self.photo_y - self.s(12)
+        self.qr_size = self.s(40)
+        self.qr_margin = self.s(7)
+
+    def s(self, val):
+        return val * self.scale
+
+    # ------------------------------------------------------------
+    # Static layers
+    # ------------------------------------------------------------
+    def draw_front_background(self, c):
+        if not c.hasForm(self.front_form):
+            with _asset_lock:
+                c.beginForm(self.front_form)
+                self._draw_front_static(c)
+                c.endForm()
+        c.doForm(self.front_form)
+
+    def draw_back(self, c):
+        if not c.hasForm(self.back_form):
+            with _asset_lock:
+                c.beginForm(self.back_form)
+                self._draw_back_static(c)
+                c.endForm()
+        c.doForm(self.back_form)
+
+    def _draw_logo_row(self, c, logos, logo_h, spacing, y_pos):
+        images = [(_image_reader(path), w) for path, w in logos]
+        images = [(img, w) for img, w in images if img is not None]
+        if not images:
+            return
+
+        total_width = sum(w for _, w in images) + spacing * (len(images) - 1)
+        start_x = (self.width - total_width) / 2
+        for img, w in images:
+            c.drawImage(img, start_x, y_pos, width=w, height=logo_h,
+                        preserveAspectRatio=True, mask="auto")
+            start_x += w + spacing
+
+    def _draw_front_static(self, c):
+        width, height, s = self.width, self.height, self.s
+
+        # --- Background ---
+        c.setFillColor(colors.white)
+        c.rect(0, 0, width, height, fill=1, stroke=0)
+
+        # --- Flag accents ---
+        c.setFillColor(SUMMIT_GREEN)
+        path = c.beginPath()
+        path.moveTo(width * 0.68, height * 0.18)
+        path.lineTo(width * 0.83, height * 0.28)
+        path.lineTo(width * 0.68, height * 0.36)
+        path.close()
+        c.drawPath(path, fill=1, stroke=0)
+
+        offset = s(45)
+        c.setStrokeColor(KENYA_RED)
+        c.setLineWidth(s(0.5))
+        c.line(width * 0.5 - offset, 0, width - offset, height * 0.35)
+
+        c.setFillColor(self.color)
+        path = c.beginPath()
+        path.moveTo(0, 0)
+        path.lineTo(width * 0.8, 0)
+        path.lineTo(0, height * 0.4)
+        path.close()
+        c.drawPath(path, fill=1, stroke=0)
+
+        c.setFillColor(KENYA_RED)
+        path = c.beginPath()
+        path.moveTo(width, 0)
+        path.lineTo(width, height * 0.35)
+        path.lineTo(width * 0.5, 0)
+        path.close()
+        c.drawPath(path, fill=1, stroke=0)
+
+        # --- Summit Logos ---
+        logo_h = height * FRONT_LOGO_HEIGHT
+        self._draw_logo_row(
+            c,
+            [(os.path.join(IMAGES_DIR, name), width * share) for name, share in FRONT_LOGOS],
+            logo_h=logo_h,
+            spacing=width * 0.01,
+            y_pos=height - height * 0.06 - logo_h,
+        )
+
+        # --- "10th–12th" date artwork ---
+        c.setFillColor(colors.white)
+        base_font, base_size, sup_size = "Helvetica-Bold", s(20), s(12)
+        runs = [
+            ("10", base_size, 0),
+            ("th", sup_size, s(7)),
+            ("–", base_size, 0),
+            ("12", base_size, 0),
+            ("th", sup_size, s(7)),
+        ]
+        total_width = sum(stringWidth(text, base_font, size) for text, size, _ in runs)
+        x = (width / 4.3) - (total_width / 2)
+        y_base = s(40)
+        for text, size, rise in runs:
+            c.setFont(base_font, size)
+            c.drawString(x, y_base + rise, text)
+            x += stringWidth(text, base_font, size)
+
+        # --- Date text ("November 2025") with underline ---
+        text = "November 2025"
+        text_x, text_y = width / 4.2, s(30)
+        c.setFont("Helvetica", s(11))
+        c.drawCentredString(text_x, text_y, text)
+
+        text_width = stringWidth(text, "Helvetica", s(11))
+        c.setLineWidth(s(0.6))
+        c.setStrokeColor(colors.white)
+        c.line(text_x - text_width / 2, text_y - s(3), text_x + text_width / 2, text_y - s(3))
+
+        # --- Venue line ---
+        c.setFont("Helvetica", s(6))
+        c.drawCentredString(width / 4, s(20), "Moi University Annex Campus, ")
+        c.drawCentredString(width / 6.8, s(12), "Eldoret Kenya, ")
+
+    def _draw_back_static(self, c):
+        width, height, s = self.width, self.height, self.s
+
+        # --- Background ---
+        c.setFillColor(colors.white)
+        c.rect(0, 0, width, height, fill=1)
+
+        # --- Sponsor logos ---
+        logo_h = height * BACK_LOGO_HEIGHT
+        self._draw_logo_row(
+            c,
+            [(os.path.join(IMAGES_DIR, name), width * share) for name, share in BACK_LOGOS],
+            logo_h=logo_h,
+            spacing=width * 0.003,
+            y_pos=height - height * 0.06 - logo_h - s(12),
+        )
+
+        # --- Partner logo grid ---
+        for logo_path, x, y, w, h in self.partner_logo_cells():
+            img = _image_reader(logo_path)
+            if img is None:
+                continue
+            try:
+                c.drawImage(img, x, y, width=w, height=h,
+                            preserveAspectRatio=True, mask="auto")
+            except Exception as e:
+                print(f"⚠️ Error drawing logo {logo_path}: {e}")
+
+    def partner_logo_cells(self):
+        """(path, x, y, width, height) of each logo in the back page grid."""
+        logo_files = partner_logo_files()
+        if not logo_files:
+            return []
+
+        s = self.s
+        cols = 5
+        rows = math.ceil(len(logo_files) / cols)
+        grid_height = s(95)
+        grid_width = self.width * 0.95
+        start_x = (self.width - grid_width) / 2
+        start_y = self.height - s(75) - grid_height
+        cell_w = grid_width / cols
+        cell_h = grid_height / rows
+        padding = s(1.5)
+
+        cells = []
+        for idx, logo_path in enumerate(logo_files):
+            x = start_x + (idx % cols) * cell_w
+            y = start_y + (rows - 1 - idx // cols) * cell_h
+            cells.append((logo_path, x + padding, y + padding,
+                          cell_w - padding * 2, cell_h - padding * 2))
+        return cells
+
+    def artwork_boxes(self):
+        """Largest box (in points) each static image is drawn into on this layout."""
+        width, height = self.width, self.height
+        boxes = {}
+        for names, logo_h in ((FRONT_LOGOS, FRONT_LOGO_HEIGHT), (BACK_LOGOS, BACK_LOGO_HEIGHT)):
+            for name, share in names:
+                boxes[os.path.join(IMAGES_DIR, name)] = (width * share, height * logo_h)
+        for logo_path, _, _, w, h in self.partner_logo_cells():
+            boxes[logo_path] = (w, h)
+        return boxes
+
+    # ------------------------------------------------------------
+    # Variable fields
+    # ------------------------------------------------------------
+    def _draw_photo_frame(self, c):
+        center_x = self.width / 2
+        center_y = self.photo_y + self.photo_size / 2
+
+        c.setLineWidth(1.6)
+        c.setStrokeColor(colors.white)
+        c.circle(center_x, center_y, (self.photo_size / 2) + 1)
+
+        c.setLineWidth(0.8)
+        c.setStrokeColor(SUMMIT_GREEN)
+        c.circle(center_x, center_y, (self.photo_size / 2) + 2)
+
+    def _draw_placeholder(self, c):
+        placeholder = self.options["placeholder"]
+        reader = _placeholder_reader(placeholder, self.photo_size) if placeholder else None
+        if reader is not None:
+            c.drawImage(reader, self.photo_x, self.photo_y,
+                        width=self.photo_size, height=self.photo_size, mask="auto")
+            self._draw_photo_frame(c)
+            return
+
+        c.setFillColor(colors.lightgrey)
+        c.roundRect(self.photo_x, self.photo_y, self.photo_size, self.photo_size, 6, fill=1)
+        c.setFillColor(colors.darkgrey)
+        c.setFont("Helvetica", 6)
+        c.drawCentredString(self.width / 2, self.photo_y + self.photo_size / 2 - 2, "No Photo")
+
+    def draw_photo(self, c, registrant):
+        try:
+            digest = photo_digest(registrant)
+            if digest is None:
+                return self._draw_placeholder(c)
+
+            cropped = badge_photo_path(
+                default_storage.path(registrant.passport_photo.name), self.photo_size, digest
+            )
+            c.drawImage(cropped, self.photo_x, self.photo_y,
+                        width=self.photo_size, height=self.photo_size)
+            self._draw_photo_frame(c)
+        except Exception as e:
+            print(f"⚠️ Error drawing passport photo for {registrant.pk}: {e}")
+            self._draw_placeholder(c)
+
+    def draw_front(self, c, registrant):
+        self.draw_front_background(c)
+        self.draw_photo(c, registrant)
+        self.draw_details(c, registrant)
+        self.draw_qr(c, registrant)
+
+    def draw_details(self, c, registrant):
+        full_name = registrant.get_full_name() or ""
+        category = registrant.get_category_display() or ""
+
+        c.setFillColor(colors.black)
+        c.setFont("Helvetica-Bold", self.s(8.5))
+        c.drawCentredString(self.width / 2, self.text_y, full_name[:35])
+
+        c.setFont("Helvetica-Bold", self.s(13))
+        c.drawCentredString(self.width / 2, self.text_y - self.s(11), category[:35])
+
+    def draw_qr(self, c, registrant):
+        """QR code as vector modules on a white quiet zone, one rectangle per run."""
+        count, runs = qr_module_runs(badge_qr_data(registrant))
+        x = self.width - self.qr_size - self.qr_margin
+        y = self.qr_margin
+        module = self.qr_size / (count + 2 * QR_QUIET_ZONE)
+        top = y + self.qr_size - QR_QUIET_ZONE * module
+        left = x + QR_QUIET_ZONE * module
+
+        c.setFillColor(colors.white)
+        c.rect(x, y, self.qr_size, self.qr_size, stroke=0, fill=1)
+        c.setFillColor(colors.black)
+        for row, col, length in runs:
+            c.rect(left + col * module, top - (row + 1) * module, length * module, module, stroke=0, fill=1)
+
+    def draw_badge(self, c, registrant):
+        """Draw one registrant's badge as the next page(s) of canvas `c`."""
+        self.draw_front(c, registrant)
+        c.showPage()
+        if self.options["back_page"]:
+            self.draw_back(c)
+            c.showPage()
+
+
+@lru_cache(maxsize=None)
+def _get_layout(page_size, color_hex, variant):
+    return BadgeLayout(page_size, colors.HexColor(int(color_hex, 16)), variant)
+
+
+def get_badge_layout(registrant, page_size=BASE_PAGE_SIZE, variant="view"):
+    """Cached layout for the registrant's category colour."""
+    from .category_cache import category_color
+
+    color = _normalize_color(category_color(registrant.category))
+    return _get_layout(tuple(page_size), color.hexval(), variant)
+
+
+def build_badge_pdf(registrant, page_size=BASE_PAGE_SIZE, variant="view"):
+    """Render a single badge PDF and return it as a BytesIO buffer."""
+    pdf_buffer = BytesIO()
+    c = canvas.Canvas(pdf_buffer, pagesize=page_size)
+    get_badge_layout(registrant, page_size, variant).draw_badge(c, registrant)
+    c.save()
+    pdf_buffer.seek(0)
+    return pdf_buffer
+
+
+def artifact_name(directory, registrant_pk, fingerprint, extension):
+    return f"{directory}/{registrant_pk}-{fingerprint[:20]}.{extension}"
+
+
+def cached_badge_artifact(directory, registrant, fingerprint, extension, render):
+    """
+    Storage name of a rendered badge file keyed by its fingerprint, calling
+    `render()` for the bytes only when that exact version is not stored yet.
+    Older versions of the same registrant's file are removed at the same time.
+    """
+    name = artifact_name(directory, registrant.pk, fingerprint, extension)
+    if default_storage.exists(name):
+        return name
+
+    content = render()
+    try:
+        _, files = default_storage.listdir(directory)
+    except FileNotFoundError:
+        files = []
+    for stale in files:
+        if stale.startswith(f"{registrant.pk}-"):
+            default_storage.delete(f"{directory}/{stale}")
+
+    # Saved under the exact name, not default_storage.save's de-duplicated one
+    if not default_storage.exists(name):
+        default_storage.save(name, ContentFile(content))
+    return name
+
+
+def badge_pdf_artifact(registrant, page_size=BASE_PAGE_SIZE, variant="view", fingerprint=None):
+    """Storage name of the registrant's cached single-badge PDF."""
+    fingerprint = fingerprint or badge_fingerprint(registrant, page_size, variant)
+    return cached_badge_artifact(
+        BADGE_PDF_DIR, registrant, fingerprint, "pdf",
+        lambda: build_badge_pdf(registrant, page_size, variant).getvalue(),
+    )
+
+
+def build_badges_pdf(registrants, page_size=BASE_PAGE_SIZE, variant="view", output=None):
+    """
+    Render many badges into one PDF. The static layers are embedded once per
+    category colour and shared by every page, so this is far smaller and
+    faster than concatenating single-badge PDFs.
+    """
+    output = output if output is not None else BytesIO()
+    c = canvas.Canvas(output, pagesize=page_size)
+    for registrant in registrants:
+        get_badge_layout(registrant, page_size, variant).draw_badge(c, registrant)
+    c.save()
+    if hasattr(output, "seek"):
+        output.seek(0)
+    return output
+
+
+
+# ------------------------------------------------------------
+# N-up print sheets
+# ------------------------------------------------------------
+SHEET_MARGIN = 6 * mm      # room for the crop marks, inside most printers' unprintable edge
+CROP_MARK_LENGTH = 4 * mm
+CROP_MARK_OFFSET = 1 * mm
+
+
+def print_order(queryset):
+    """Order registrants the way the print desk hands badges out: category, then surname."""
+    from django.db.models import CharField, OuterRef, Subquery
+    from django.db.models.functions import Cast, Lower
+
+    category_label = Subquery(
+        Category.objects.annotate(key=Cast("id", CharField()))
+        .filter(key=OuterRef("category"))
+        .values("name")[:1]
+    )
+    return queryset.annotate(category_label=category_label).order_by(
+        "category_label", Lower("second_name"), Lower("first_name"), "id"
+    )
+
+
+class SheetLayout:
+    """Grid of badge cells on a sheet, in whichever orientation fits the most."""
+
+    def __init__(self, sheet_size, badge_size):
+        self.badge_w, self.badge_h = badge_size
+        best = None
+        for size in (portrait(sheet_size), landscape(sheet_size)):
+            cols = int((size[0] - 2 * SHEET_MARGIN) // self.badge_w)
+            rows = int((size[1] - 2 * SHEET_MARGIN) // self.badge_h)
+            if best is None or cols * rows > best[1] * best[2]:
+                best = (size, cols, rows)
+        self.page_size, self.cols, self.rows = best
+        self.landscape = self.page_size[0] > self.page_size[1]
+        if not self.per_sheet:
+            raise ValueError("Badge size does not fit on the sheet")
+
+        # Badges butt up against each other and the block is centred, so one
+        # guillotine cut serves two badges
+        self.origin_x = (self.page_size[0] - self.cols * self.badge_w) / 2
+        self.origin_y = (self.page_size[1] - self.rows * self.badge_h) / 2
+
+    @property
+    def per_sheet(self):
+        return self.cols * self.rows
+
+    def cell(self, index, mirrored=False):
+        """Bottom-left corner of the `index`-th cell, filled left-to-right, top-down."""
+        col, row = index % self.cols, index // self.cols
+        if mirrored:
+            # Long-edge duplex flips a portrait sheet left to right, so backs
+            # land in the mirrored column, and a landscape sheet top to
+            # bottom, so they land in the mirrored row
+            if self.landscape:
+                row = self.rows - 1 - row
+            else:
+                col = self.cols - 1 - col
+        x = self.origin_x + col * self.badge_w
+        y = self.origin_y + (self.rows - 1 - row) * self.badge_h
+        return x, y
+
+    def draw_crop_marks(self, c):
+        c.setStrokeColor(colors.black)
+        c.setLineWidth(0.25)
+        left, bottom = self.origin_x, self.origin_y
+        right = left + self.cols * self.badge_w
+        top = bottom + self.rows * self.badge_h
+        start, end = CROP_MARK_OFFSET, CROP_MARK_OFFSET + CROP_MARK_LENGTH
+
+        for i in range(self.cols + 1):
+            x = left + i * self.badge_w
+            c.line(x, top + start, x, top + end)
+            c.line(x, bottom - start, x, bottom - end)
+        for j in range(self.rows + 1):
+            y = bottom + j * self.badge_h
+            c.line(left - start, y, left - end, y)
+            c.line(right + start, y, right + end, y)
+
+
+def build_badge_sheets(registrants, sheet_size=A4, badge_size=BASE_PAGE_SIZE,
+                       variant="view", output=None):
+    """
+    Impose badges N-up on A4/A3 sheets with crop marks, one multi-page PDF.
+    Every badge on every sheet reuses the same static forms, fonts and images,
+    so the file is a fraction of the size of the single-badge PDFs combined.
+    For variants with a back page each front sheet is followed by a back sheet
+    laid out for long-edge duplex. Pass registrants already in print order.
+    """
+    sheet = SheetLayout(sheet_size, badge_size)
+    output = output if output is not None else BytesIO()
+    c = canvas.Canvas(output, pagesize=sheet.page_size)
+    back_layout = None
+
+    def finish_sheet(count):
+        sheet.draw_crop_marks(c)
+        c.showPage()
+        if back_layout is not None:
+            for index in range(count):
+                c.saveState()
+                c.translate(*sheet.cell(index, mirrored=True))
+                back_layout.draw_back(c)
+                c.restoreState()
+            sheet.draw_crop_marks(c)
+            c.showPage()
+
+    count = 0
+    for registrant in registrants:
+        layout = get_badge_layout(registrant, badge_size, variant)
+        if layout.options["back_page"]:
+            back_layout = layout
+
+        c.saveState()
+        c.translate(*sheet.cell(count))
+        layout.draw_front(c, registrant)
+        c.restoreState()
+
+        count += 1
+        if count == sheet.per_sheet:
+            finish_sheet(count)
+            count = 0
+
+    if count:
+        finish_sheet(count)
+    c.save()
+    if hasattr(output, "seek"):
+        output.seek(0)
+    return output
+
+
+# ------------------------------------------------------------
+# Streamed ZIP downloads
+# ------------------------------------------------------------
+def render_ahead(items, render, workers=BADGE_ZIP_WORKERS, lookahead=None):
+    """
+    Yield (item, result) in input order while a small thread pool renders at
+    most `lookahead` items ahead of the consumer. A failed render yields the
+    exception as its result. Memory stays bounded however many items there are.
+    """
+    lookahead = lookahead or workers * 2
+
+    def task(item):
+        try:
+            return render(item)
+        finally:
+            # Worker threads never see request_finished, close what they opened
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        try:
+            for item in items:
+                pending.append((item, pool.submit(task, item)))
+                if len(pending) >= lookahead:
+                    yield _settle(*pending.popleft())
+            while pending:
+                yield _settle(*pending.popleft())
+        finally:
+            # Client went away: drop the renders nobody will read
+            for _, future in pending:
+                future.cancel()
+
+
+def _settle(item, future):
+    try:
+        return item, future.result()
+    except Exception as e:
+        return item, e
+
+
+def stream_badge_zip(registrants, render, filename_for, workers=BADGE_ZIP_WORKERS):
+    """
+    Generate a ZIP of badge PDFs chunk by chunk as the client reads it. Each
+    entry is added the moment its PDF is ready, so the first bytes go out after
+    the first badge rather than after the last one.
+    """
+    # The PDFs are already compressed, deflating them again only costs CPU
+    zs = zipstream.ZipStream(compress_type=zipstream.ZIP_STORED)
+    for registrant, pdf in render_ahead(registrants, render, workers=workers):
+        if isinstance(pdf, Exception):
+            logger.error(f"Failed to generate badge for {registrant.id}: {pdf}")
+            continue
+        zs.add(pdf, filename_for(registrant))
+        yield from zs.all_files()
+    yield from zs.finalize()
@@ -0,0 +1,72 @@
+"""
+Process-wide cache of Category id -> (name, color).
+
+Each worker keeps the mapping in memory and only reloads it when the version
+number stored in the shared Django cache changes. Saving or deleting a
+Category bumps that version (see signals.py), so every gunicorn worker picks
+up the change on its next lookup.
+"""
+import threading
+import time
+
+from django.core.cache import cache
+
+VERSION_KEY = "summitPage:category_version"
+VERSION_CHECK_SECONDS = 5  # How often a worker asks the shared cache for the version
+
+_lock = threading.Lock()
+_state = {"version": None, "checked_at": 0.0, "map": None}
+
+
+def _shared_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, timeout=None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def get_category_map():
+    """Return {str(category_id): (name, color)} for every Category."""
+    now = time.monotonic()
+    if _state["map"] is not None and now - _state["checked_at"] < VERSION_CHECK_SECONDS:
+        return _state["map"]
+
+    with _lock:
+        version = _shared_version()
+        if _state["map"] is None or _state["version"] != version:
+            from .models import Category
+
+            _state["map"] = {
+                str(pk): (name, color)
+                for pk, name, color in Category.objects.order_by("id").values_list("id", "name", "color")
+            }
+            _state["version"] = version
+        _state["checked_at"] = now
+        return _state["map"]
+
+
+def invalidate_categories():
+    """Drop this worker's copy and bump the shared version for the others."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # Key was evicted: any fresh number differs from what workers hold
+        cache.set(VERSION_KEY, time.time_ns(), timeout=None)
+    with _lock:
+        _state["map"] = None
+
+
+def category_name(category_id, default="Delegate"):
+    entry = get_category_map().get(str(category_id))
+    return entry[0] if entry else default
+
+
+def category_color(category_id, default=None):
+    entry = get_category_map().get(str(category_id))
+    return (entry[1] if entry else None) or default
+
+
+def category_ids_named(name):
+    """String ids of every category called `name` (case-insensitive)."""
+    return [cid for cid, (cname, _) in get_category_map().items() if cname.lower() == name.lower()]
@@ -0,0 +1,192 @@
+"""
+Background export jobs.
+
+Heavy reports and badge ZIPs are queued as ExportJob rows and built by the
+`run_export_jobs` worker, so they never hold a web worker. The worker claims
+jobs with SELECT ... FOR UPDATE SKIP LOCKED and renews a lease while it
+writes progress; a job whose worker died is picked up again once the lease
+runs out. Finished files stay in storage for EXPORT_JOB_TTL_HOURS, and asking
+for the same export in that window returns the finished job.
+"""
+import logging
+import os
+import secrets
+import tempfile
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ExportJob
+from .reports import (
+    XLSX_CONTENT_TYPE, badge_batch_registrants, write_badge_zip, write_exhibitors_xlsx,
+    write_registrants_pdf, write_registrants_xlsx,
+)
+
+logger = logging.getLogger(__name__)
+
+EXPORT_JOB_TTL_HOURS = getattr(settings, "EXPORT_JOB_TTL_HOURS", 24)
+EXPORT_JOB_LEASE_SECONDS = getattr(settings, "EXPORT_JOB_LEASE_SECONDS", 600)
+# Seconds between progress writes, which also renew the lease
+PROGRESS_INTERVAL = 2
+
+LIVE_STATUSES = ("pending", "running")
+
+
+def _badge_batch(output, progress, start_date=None, end_date=None, category=None):
+    registrants = badge_batch_registrants(start_date, end_date, category).order_by("created_at")
+    write_badge_zip(registrants, output, progress)
+
+
+# Per job kind: the writer, the artifact's file name and content type, the
+# request parameters it takes and whether only superusers may run it
+EXPORT_JOB_TYPES = {
+    "registrants_pdf": {
+        "write": write_registrants_pdf,
+        "filename": "registrants.pdf",
+        "content_type": "application/pdf",
+        "params": (),
+        "superuser_only": False,
+    },
+    "registrants_xlsx": {
+        "write": write_registrants_xlsx,
+        "filename": "registrants.xlsx",
+        "content_type": XLSX_CONTENT_TYPE,
+        "params": (),
+        "superuser_only": False,
+    },
+    "exhibitors_xlsx": {
+        "write": write_exhibitors_xlsx,
+        "filename": "exhibitors.xlsx",
+        "content_type": XLSX_CONTENT_TYPE,
+        "params": (),
+        "superuser_only": False,
+    },
+    "registrant_badges": {
+        "write": _badge_batch,
+        "filename": "All_Registration_Badges.zip",
+        "content_type": "application/zip",
+        "params": (),
+        "superuser_only": True,
+    },
+    "badge_batch": {
+        "write": _badge_batch,
+        "filename": "Badge_Batch.zip",
+        "content_type": "application/zip",
+        "params": ("start_date", "end_date", "category"),
+        "superuser_only": True,
+    },
+}
+
+
+def request_export(kind, params=None, user=None, refresh=False):
+    """
+    Queue an export, or return the job already building or holding it.
+
+    Returns:
+        (ExportJob, created)
+    """
+    spec = EXPORT_JOB_TYPES[kind]
+    params = {name: value for name, value in (params or {}).items() if name in spec["params"] and value}
+    if kind == "badge_batch":
+        # Parses the dates, so a bad one fails the request rather than the job
+        badge_batch_registrants(**params)
+
+    now = timezone.now()
+    with transaction.atomic():
+        existing = ExportJob.objects.select_for_update().filter(kind=kind, params=params)
+        if refresh:
+            existing = existing.filter(status__in=LIVE_STATUSES)
+        else:
+            existing = existing.filter(Q(status__in=LIVE_STATUSES) | Q(status="done", expires_at__gt=now))
+        job = existing.order_by("-created_at").first()
+        if job is not None:
+            return job, False
+        return ExportJob.objects.create(kind=kind, params=params, requested_by=user), True
+
+
+def claim_export_job():
+    """Lock the oldest pending job, or one whose worker's lease ran out, and mark it running."""
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            ExportJob.objects.select_for_update(skip_locked=True)
+            .filter(Q(status="pending") | Q(status="running", locked_until__lt=now))
+            .order_by("id")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = "running"
+        job.done = 0
+        job.total = None
+        job.started_at = now
+        job.locked_until = now + timedelta(seconds=EXPORT_JOB_LEASE_SECONDS)
+        job.save(update_fields=["status", "done", "total", "started_at", "locked_until"])
+    return job
+
+
+def run_export_job(job):
+    """Build the job's file into storage and record the outcome."""
+    spec = EXPORT_JOB_TYPES[job.kind]
+    last_write = 0
+
+    def progress(done, total):
+        nonlocal last_write
+        if time.monotonic() - last_write < PROGRESS_INTERVAL and done != total:
+            return
+        last_write = time.monotonic()
+        ExportJob.objects.filter(pk=job.pk).update(
+            done=done, total=total,
+            locked_until=timezone.now() + timedelta(seconds=EXPORT_JOB_LEASE_SECONDS),
+        )
+
+    try:
+        with tempfile.TemporaryFile() as output:
+            spec["write"](output, progress, **job.params)
+            output.seek(0)
+            # Random directory as well, in case the storage root is ever served
+            job.artifact.save(
+                f"{job.pk}/{secrets.token_urlsafe(16)}/{spec['filename']}", File(output), save=False,
+            )
+    except Exception as e:
+        logger.exception(f"Export job {job.pk} ({job.kind}) failed")
+        ExportJob.objects.filter(pk=job.pk).update(
+            status="failed", error=str(e), finished_at=timezone.now(), locked_until=None,
+        )
+    else:
+        finished = timezone.now()
+        ExportJob.objects.filter(pk=job.pk).update(
+            status="done", artifact=job.artifact.name, error=None, finished_at=finished,
+            expires_at=finished + timedelta(hours=EXPORT_JOB_TTL_HOURS), locked_until=None,
+        )
+    job.refresh_from_db()
+    return job
+
+
+def delete_artifact(job):
+    """Remove the job's file and the per-job directories left empty behind it."""
+    if not job.artifact:
+        return
+    storage, name = job.artifact.storage, job.artifact.name
+    job.artifact.delete(save=False)
+    directory = os.path.dirname(name)
+    while directory and directory != "exports":
+        try:
+            os.rmdir(storage.path(directory))
+        except OSError:
+            break
+        directory = os.path.dirname(directory)
+
+
+def purge_expired_exports():
+    """Delete the files of finished jobs past their TTL; returns how many were removed."""
+    expired = list(ExportJob.objects.filter(status="done", expires_at__lte=timezone.now()))
+    for job in expired:
+        delete_artifact(job)
+        ExportJob.objects.filter(pk=job.pk).update(status="expired", artifact=None)
+    return len(expired)
@@ -0,0 +1,178 @@
+"""
+Streaming CSV / NDJSON data exports.
+
+Rows are read with values_list().iterator(), which uses a server-side cursor
+on PostgreSQL, and are encoded line by line into a StreamingHttpResponse,
+optionally gzipped on the fly. Memory use does not depend on the row count.
+"""
+import csv
+import json
+import zlib
+from datetime import date, datetime, timedelta
+from uuid import UUID
+
+from django.utils import timezone
+
+from .category_cache import category_name
+from .models import Exhibitor, PrintLog, Registrant, SummitSponsor
+
+EXPORT_CHUNK_SIZE = 2000
+STREAM_BLOCK_SIZE = 64 * 1024
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+# Per data set: model, columns (values_list lookups), the date and category
+# lookups the range / category filters apply to, per-column conversions and
+# output names for columns read across a relation
+EXPORTS = {
+    "registrants": {
+        "model": Registrant,
+        "columns": (
+            "id", "title", "first_name", "second_name", "email", "phone",
+            "organization_type", "other_organization_type", "job_title", "category",
+            "interests", "updates_opt_in", "approved", "is_printed", "created_at",
+        ),
+        "date_field": "created_at",
+        "category_field": "category",
+        "convert": {"category": lambda value: category_name(value, default=value)},
+        "headers": {},
+    },
+    "exhibitors": {
+        "model": Exhibitor,
+        "columns": (
+            "id", "title", "first_name", "second_name", "email", "phone",
+            "organization_type", "country_of_registration", "job_title", "category",
+            "total_count", "approval_status", "approved", "created_at",
+        ),
+        "date_field": "created_at",
+        "category_field": "category",
+        "convert": {},
+        "headers": {},
+    },
+    "sponsors": {
+        "model": SummitSponsor,
+        "columns": (
+            "id", "organization_name", "registration_number", "sector", "website",
+            "contact_full_name", "contact_designation", "contact_email", "contact_phone",
+            "areas_of_interest", "proposed_contribution", "consent_confirmation", "submitted_at",
+        ),
+        "date_field": "submitted_at",
+        "category_field": None,
+        "convert": {},
+        "headers": {},
+    },
+    "printlogs": {
+        "model": PrintLog,
+        "columns": (
+            "id", "record_id", "record_id__first_name", "record_id__second_name", "record_id__category",
+            "printed_by__username", "reprint", "batch", "ip_address", "timestamp",
+        ),
+        "date_field": "timestamp",
+        "category_field": "record_id__category",
+        "convert": {"record_id__category": lambda value: category_name(value, default=value)},
+        "headers": {
+            "record_id": "registrant_id",
+            "record_id__first_name": "first_name",
+            "record_id__second_name": "second_name",
+            "record_id__category": "category",
+            "printed_by__username": "printed_by",
+        },
+    },
+}
+
+
+def export_queryset(dataset, start_date=None, end_date=None, category=None):
+    """
+    Rows of `dataset` as a values_list queryset, filtered like
+    count_registrations_in_range: both dates (YYYY-MM-DD, end inclusive) or
+    neither, and an exact category. Raises ValueError on a bad date.
+    """
+    spec = EXPORTS[dataset]
+    queryset = spec["model"].objects.all()
+
+    if start_date and end_date:
+        start = timezone.make_aware(datetime.strptime(start_date, "%Y-%m-%d"))
+        end = timezone.make_aware(datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1))
+        queryset = queryset.filter(**{f"{spec['date_field']}__range": (start, end)})
+
+    if category and spec["category_field"]:
+        queryset = queryset.filter(**{spec["category_field"]: category})
+
+    return queryset.order_by("pk").values_list(*spec["columns"])
+
+
+def _plain(value):
+    """JSON-safe form of a database value."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def export_rows(dataset, queryset):
+    """Yield rows of plain values, with the data set's conversions applied."""
+    spec = EXPORTS[dataset]
+    converters = [spec["convert"].get(column) for column in spec["columns"]]
+    for row in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield [
+            _plain(convert(value) if convert and value is not None else value)
+            for convert, value in zip(converters, row)
+        ]
+
+
+class _Line:
+    """File-like target that hands csv.writer's output straight back."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(columns, rows):
+    writer = csv.writer(_Line())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(
+            ["; ".join(map(str, value)) if isinstance(value, list) else value for value in row]
+        )
+
+
+def ndjson_lines(columns, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str) + "\n"
+
+
+def encode_stream(lines, gzip=False):
+    """
+    UTF-8 encode the lines, batched into blocks of about STREAM_BLOCK_SIZE so
+    the response is not written a line at a time, gzipping them if asked.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+    block, size = [], 0
+    for line in lines:
+        data = line.encode("utf-8")
+        block.append(data)
+        size += len(data)
+        if size >= STREAM_BLOCK_SIZE:
+            data = b"".join(block)
+            block, size = [], 0
+            data = compressor.compress(data) if compressor else data
+            if data:
+                yield data
+
+    data = b"".join(block)
+    if compressor:
+        data = compressor.compress(data) + compressor.flush()
+    if data:
+        yield data
+
+
+def export_stream(dataset, fmt, queryset, gzip=False):
+    """Encoded body of an export: CSV with a header row, or one JSON object per line."""
+    spec = EXPORTS[dataset]
+    columns = [spec["headers"].get(column, column) for column in spec["columns"]]
+    rows = export_rows(dataset, queryset)
+    lines = csv_lines(columns, rows) if fmt == "csv" else ndjson_lines(columns, rows)
+    return encode_stream(lines, gzip=gzip)
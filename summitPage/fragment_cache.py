@@ -0,0 +1,30 @@
+"""
+Version numbers for the cached template fragments on the public pages.
+
+Templates cache each fragment under `{% cache ... fragment_versions.<name> %}`.
+Saving or deleting one of the source models bumps the version (see
+signals.py), so the next request renders and caches a fresh copy.
+"""
+import time
+
+from django.core.cache import cache
+
+FRAGMENTS = ("schedule", "gallery", "sponsors", "speakers")
+
+
+def _key(name):
+    return f"summitPage:fragment_version:{name}"
+
+
+def fragment_versions():
+    """Return {fragment_name: version} in a single cache round-trip."""
+    stored = cache.get_many([_key(name) for name in FRAGMENTS])
+    return {name: stored.get(_key(name), 1) for name in FRAGMENTS}
+
+
+def bump_fragment(name):
+    try:
+        cache.incr(_key(name))
+    except ValueError:
+        # Key was evicted: any fresh number avoids reusing an old fragment version
+        cache.set(_key(name), time.time_ns(), timeout=None)
@@ -0,0 +1,251 @@
+import glob
+import json
+import os
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from PIL import Image
+
+from summitPage.badges import BADGE_SIZES, BadgeLayout
+from summitPage.category_cache import get_category_map
+from summitPage.management.commands.generate_badges import peak_rss_mb
+from summitPage.models import Registrant
+
+DEFAULT_BASELINE = os.path.join(settings.BASE_DIR, "benchmarks", "badge_baseline.json")
+
+# BadgeLayout methods timed as each stage; whatever is left of a render
+# (canvas setup, page breaks, compression and writing the PDF) counts as "save"
+STAGE_METHODS = {
+    "qr": ("draw_qr",),
+    "photo": ("draw_photo",),
+    "draw": ("draw_front_background", "draw_details", "draw_back"),
+}
+STAGES = (*STAGE_METHODS, "save")
+
+
+@contextmanager
+def stage_timers(totals):
+    """Add the time spent in each stage's BadgeLayout methods to `totals`."""
+    originals = {}
+
+    def timed(stage, method):
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                totals[stage] += time.perf_counter() - started
+        return wrapper
+
+    for stage, names in STAGE_METHODS.items():
+        for name in names:
+            originals[name] = getattr(BadgeLayout, name)
+            setattr(BadgeLayout, name, timed(stage, originals[name]))
+    try:
+        yield totals
+    finally:
+        for name, method in originals.items():
+            setattr(BadgeLayout, name, method)
+
+
+def synthetic_photo(path, size, seed):
+    """A camera-sized JPEG with enough detail to compress like a real photo."""
+    photo = Image.merge("RGB", (
+        Image.linear_gradient("L").resize(size).rotate(seed * 37 % 360),
+        Image.radial_gradient("L").resize(size),
+        Image.effect_noise(size, 32 + seed % 16),
+    ))
+    photo.save(path, "JPEG", quality=90)
+
+
+def synthetic_registrants(count, photo_dir, photo_size):
+    """Unsaved registrants with photos on disk, spread over every category."""
+    categories = sorted(get_category_map())
+    if not categories:
+        raise CommandError("Create at least one category before benchmarking badges")
+
+    registrants = []
+    for n in range(count):
+        filename = f"photo-{n}.jpg"
+        synthetic_photo(os.path.join(photo_dir, filename), photo_size, n)
+        registrants.append(Registrant(
+            id=1_000_000 + n,  # never saved, but the QR payload signs the id
+            title="Dr",
+            first_name=f"Benchmark{n}",
+            second_name="Wanjiru-Odhiambo",
+            category=categories[n % len(categories)],
+            organization_type="Private Company",
+            job_title="Head of Digital Transformation",
+            national_id_number=f"{30000000 + n}",
+            passport_photo=os.path.relpath(os.path.join(photo_dir, filename), settings.MEDIA_ROOT),
+        ))
+    return registrants
+
+
+def clear_photo_crops(photo_dir):
+    """Drop the cached badge crops, so every size pays for cropping its photos."""
+    for path in glob.glob(os.path.join(photo_dir, "*.badge-*.jpg")):
+        os.remove(path)
+
+
+def parse_photo_size(value):
+    try:
+        width, height = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise CommandError(f"--photo-size must look like WIDTHxHEIGHT, got {value!r}")
+    return width, height
+
+
+class Command(BaseCommand):
+    help = "Time badge rendering per stage at A7 and A8 and compare it with a stored baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--count", type=int, default=50,
+            help="Synthetic registrants rendered per badge size",
+        )
+        parser.add_argument(
+            "--sizes", default="A7,A8",
+            help=f"Comma separated badge sizes ({', '.join(BADGE_SIZES)})",
+        )
+        parser.add_argument(
+            "--photo-size", type=parse_photo_size, default=(2448, 3264),
+            help="Synthetic passport photo size, e.g. 2448x3264 for an unprocessed phone upload",
+        )
+        parser.add_argument(
+            "--baseline", default=DEFAULT_BASELINE,
+            help="Baseline results to compare against",
+        )
+        parser.add_argument(
+            "--save-baseline", action="store_true",
+            help="Store these results as the new baseline instead of comparing",
+        )
+        parser.add_argument(
+            "--tolerance", type=float, default=0.15,
+            help="Allowed throughput drop / PDF size growth before failing (0.15 = 15%%)",
+        )
+
+    def handle(self, *args, **options):
+        # Imported here so the benchmark always renders through the batch script's entry point
+        from badge_gen import build_exhibitor_badge_pdf
+
+        sizes = [size.strip().upper() for size in options["sizes"].split(",") if size.strip()]
+        unknown = set(sizes) - set(BADGE_SIZES)
+        if unknown:
+            raise CommandError(f"Unknown badge size(s): {', '.join(sorted(unknown))}")
+
+        if not options["save_baseline"] and not os.path.exists(options["baseline"]):
+            raise CommandError(f"No baseline at {options['baseline']}, run with --save-baseline to create one")
+
+        photo_dir = tempfile.mkdtemp(prefix="badge-benchmark-", dir=settings.MEDIA_ROOT)
+        try:
+            self.stdout.write(f"📸 Writing {options['count'] + 1} synthetic photos")
+            # The first registrant warms up the cached layouts and artwork
+            warmup, *registrants = synthetic_registrants(
+                options["count"] + 1, photo_dir, options["photo_size"]
+            )
+
+            results = {
+                "host": platform.node(),
+                "count": len(registrants),
+                "photo_size": list(options["photo_size"]),
+                "sizes": {},
+            }
+            for size in sizes:
+                page_size = BADGE_SIZES[size]
+                build_exhibitor_badge_pdf(warmup, page_size=page_size)
+                # Crops do not depend on the page size, a later size would reuse them
+                clear_photo_crops(photo_dir)
+                results["sizes"][size] = self._run(build_exhibitor_badge_pdf, registrants, page_size)
+                self._report(size, results["sizes"][size])
+            results["peak_rss_mb"] = peak_rss_mb()
+        finally:
+            shutil.rmtree(photo_dir, ignore_errors=True)
+
+        if options["save_baseline"]:
+            os.makedirs(os.path.dirname(options["baseline"]), exist_ok=True)
+            with open(options["baseline"], "w") as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"✅ Baseline saved to {options['baseline']}"))
+            return
+
+        with open(options["baseline"]) as f:
+            baseline = json.load(f)
+        regressions = self._compare(results, baseline, options["tolerance"])
+        if regressions:
+            raise CommandError("Badge rendering regressed:\n" + "\n".join(regressions))
+        self.stdout.write(self.style.SUCCESS("✅ No regressions against the baseline"))
+
+    def _run(self, render, registrants, page_size):
+        stage_totals = dict.fromkeys(STAGES, 0.0)
+        pdf_sizes = []
+
+        started = time.perf_counter()
+        with stage_timers(stage_totals):
+            for registrant in registrants:
+                pdf_sizes.append(len(render(registrant, page_size=page_size).getvalue()))
+        elapsed = time.perf_counter() - started
+
+        stage_totals["save"] = elapsed - sum(stage_totals.values())
+        count = len(registrants)
+        return {
+            "badges_per_sec": count / elapsed,
+            "ms_per_badge": {
+                **{stage: total * 1000 / count for stage, total in stage_totals.items()},
+                "total": elapsed * 1000 / count,
+            },
+            "pdf_kb": {
+                "mean": statistics.mean(pdf_sizes) / 1024,
+                "max": max(pdf_sizes) / 1024,
+            },
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+    def _report(self, size, result):
+        stages = ", ".join(f"{stage} {result['ms_per_badge'][stage]:.1f}" for stage in STAGES)
+        peak = result["peak_rss_mb"]
+        self.stdout.write(
+            f"🎫 {size}: {result['badges_per_sec']:.1f} badges/s, "
+            f"{result['ms_per_badge']['total']:.1f} ms/badge ({stages}), "
+            f"PDF {result['pdf_kb']['mean']:.0f} KB avg / {result['pdf_kb']['max']:.0f} KB max"
+            + (f", peak RSS {peak:.0f} MB" if peak is not None else "")
+        )
+
+    def _compare(self, results, baseline, tolerance):
+        # PDF sizes hold on any machine, throughput only on the one that recorded the baseline
+        same_host = baseline.get("host") == results["host"]
+        if not same_host:
+            self.stdout.write(
+                f"ℹ️ Baseline recorded on {baseline.get('host') or 'another host'}, "
+                "comparing PDF sizes only; save a baseline here to compare throughput"
+            )
+
+        regressions = []
+        for size, result in results["sizes"].items():
+            before = baseline.get("sizes", {}).get(size)
+            if before is None:
+                self.stdout.write(f"ℹ️ {size} is not in the baseline, skipping comparison")
+                continue
+
+            min_rate = before["badges_per_sec"] * (1 - tolerance)
+            if same_host and result["badges_per_sec"] < min_rate:
+                regressions.append(
+                    f"  {size}: {result['badges_per_sec']:.1f} badges/s, "
+                    f"baseline {before['badges_per_sec']:.1f} (minimum {min_rate:.1f})"
+                )
+
+            max_kb = before["pdf_kb"]["mean"] * (1 + tolerance)
+            if result["pdf_kb"]["mean"] > max_kb:
+                regressions.append(
+                    f"  {size}: PDFs average {result['pdf_kb']['mean']:.0f} KB, "
+                    f"baseline {before['pdf_kb']['mean']:.0f} KB (maximum {max_kb:.0f} KB)"
+                )
+        return regressions
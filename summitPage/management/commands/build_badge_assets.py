@@ -0,0 +1,92 @@
+import os
+
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from summitPage.badges import (
+    BADGE_ASSET_DPI,
+    BADGE_ASSETS_DIR,
+    BASE_PAGE_SIZE,
+    BadgeLayout,
+    SUMMIT_GREEN,
+    optimized_asset_path,
+)
+
+
+def optimize_asset(source, target, box, dpi, quality):
+    """
+    Write a print-ready JPEG of `source` no larger than `box` (points) at `dpi`.
+    All badge artwork sits on white, so transparency is flattened onto white.
+    """
+    max_w = max(1, round(box[0] / 72 * dpi))
+    max_h = max(1, round(box[1] / 72 * dpi))
+
+    with Image.open(source) as img:
+        if img.mode == "P":
+            img = img.convert("RGBA")
+        if img.mode in ("RGBA", "LA"):
+            background = Image.new("RGB", img.size, (255, 255, 255))
+            background.paste(img.convert("RGBA"), mask=img.convert("RGBA").getchannel("A"))
+            img = background
+        else:
+            img = img.convert("RGB")
+
+        img.thumbnail((max_w, max_h), Image.LANCZOS)
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        img.save(target, "JPEG", quality=quality, subsampling=0, optimize=True)
+        return img.size
+
+
+class Command(BaseCommand):
+    help = "Write print-DPI, size-optimized copies of the badge logos and artwork"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dpi", type=int, default=BADGE_ASSET_DPI,
+            help="Print resolution the artwork is downscaled to",
+        )
+        parser.add_argument(
+            "--quality", type=int, default=90,
+            help="JPEG quality of the optimized copies",
+        )
+        parser.add_argument(
+            "--force", action="store_true",
+            help="Rebuild assets that are already up to date",
+        )
+
+    def handle(self, *args, **options):
+        # Badges are never rendered larger than the base page size
+        layout = BadgeLayout(BASE_PAGE_SIZE, SUMMIT_GREEN, "print")
+
+        built = skipped = 0
+        before = after = 0
+        for source, box in sorted(layout.artwork_boxes().items()):
+            if not os.path.exists(source):
+                self.stderr.write(f"⚠️ Missing badge artwork {source}")
+                continue
+
+            target = optimized_asset_path(source)
+            if (
+                not options["force"]
+                and os.path.exists(target)
+                and os.path.getmtime(target) >= os.path.getmtime(source)
+            ):
+                skipped += 1
+                continue
+
+            try:
+                size = optimize_asset(source, target, box, options["dpi"], options["quality"])
+            except Exception as e:
+                self.stderr.write(f"❌ {source}: {e}")
+                continue
+
+            built += 1
+            before += os.path.getsize(source)
+            after += os.path.getsize(target)
+            self.stdout.write(f"🖼️ {os.path.relpath(target, BADGE_ASSETS_DIR)} {size[0]}x{size[1]}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Built {built} badge asset(s), {skipped} up to date "
+            f"({before / 1024:.0f} KB -> {after / 1024:.0f} KB)"
+        ))
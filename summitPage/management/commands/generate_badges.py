@@ -0,0 +1,187 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models.functions import Mod
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _init_worker():
+    # Spawned workers start without Django; forked ones already have it
+    import django
+
+    django.setup()
+
+
+def peak_rss_mb():
+    """Peak resident size of this process and of its largest finished worker."""
+    if resource is None:
+        return None
+    peak_kb = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    return peak_kb / 1024
+
+
+def parse_shard(value):
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise CommandError(f"--shard must look like i/N, got {value!r}")
+    if count < 1 or not 0 <= index < count:
+        raise CommandError(f"--shard index must be between 0 and {count - 1}")
+    return index, count
+
+
+class Command(BaseCommand):
+    help = "Render badge PDFs for unprinted registrants over a pool of worker processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int, default=os.cpu_count() or 1,
+            help="Worker processes rendering badges",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=20,
+            help="Registrants handed to a worker at a time",
+        )
+        parser.add_argument(
+            "--shard", type=parse_shard, default=None,
+            help="Only render registrants whose id %% N == i (0-based), e.g. 0/3 on the first of three machines",
+        )
+        parser.add_argument(
+            "--checkpoint", default=None,
+            help="Checkpoint file (default: MEDIA_ROOT/categories/.generate_badges[-i-of-N].json)",
+        )
+        parser.add_argument(
+            "--restart", action="store_true",
+            help="Ignore an existing checkpoint and start from the first registrant",
+        )
+        parser.add_argument(
+            "--sync", action="store_true",
+            help="First re-render printed badges whose inputs changed and remove orphaned badge files",
+        )
+        parser.add_argument(
+            "--calibrate", type=int, nargs="?", const=20, default=None, metavar="SAMPLE",
+            help="Render a random sample (default 20) in memory and print the projected run instead of generating",
+        )
+
+    def handle(self, *args, **options):
+        from badge_gen import (
+            estimate_resources,
+            render_badge_chunk,
+            sync_badges,
+            unprinted_registrants,
+            update_manifest,
+        )
+
+        if options["calibrate"] is not None:
+            plan = estimate_resources(sample_size=options["calibrate"])
+            if plan:
+                self.stdout.write(self.style.SUCCESS(
+                    f"✅ ~{plan['projected_seconds'] / 60:.1f} min and ~{plan['disk_mb']:.0f} MB for "
+                    f"{plan['total']} badge(s): --workers {plan['workers']} --chunk-size {plan['chunk_size']}"
+                ))
+            return
+
+        if options["sync"]:
+            stats = sync_badges()
+            self.stdout.write(self.style.SUCCESS(
+                f"🔄 {stats['rendered']} stale badge(s) re-rendered, {stats['removed']} file(s) removed "
+                f"({stats['checked']} checked, {stats['failed']} failed)"
+            ))
+
+        shard = options["shard"]
+        checkpoint_path = options["checkpoint"] or os.path.join(
+            settings.MEDIA_ROOT, "categories",
+            f".generate_badges-{shard[0]}-of-{shard[1]}.json" if shard else ".generate_badges.json",
+        )
+
+        checkpoint = {"last_id": 0, "failed": []}
+        if os.path.exists(checkpoint_path) and not options["restart"]:
+            with open(checkpoint_path) as f:
+                checkpoint = json.load(f)
+            self.stdout.write(f"↩️ Resuming after registrant {checkpoint['last_id']}")
+
+        queryset = unprinted_registrants().filter(id__gt=checkpoint["last_id"])
+        if shard:
+            queryset = queryset.annotate(shard=Mod("id", shard[1])).filter(shard=shard[0])
+        ids = list(queryset.order_by("id").values_list("id", flat=True))
+
+        if not ids:
+            self.stdout.write("ℹ️ No badges to generate.")
+            return
+
+        size = options["chunk_size"]
+        chunks = [ids[i:i + size] for i in range(0, len(ids), size)]
+        self.stdout.write(
+            f"🎫 Rendering {len(ids)} badge(s) in {len(chunks)} chunk(s) on {options['workers']} worker(s)"
+        )
+
+        # Workers must open their own database connections
+        connections.close_all()
+
+        totals = {"success": 0, "failed": 0, "bytes": 0}
+        finished = [False] * len(chunks)
+        next_chunk = 0
+        broken = False
+        started = time.monotonic()
+
+        with ProcessPoolExecutor(max_workers=options["workers"], initializer=_init_worker) as pool:
+            futures = {pool.submit(render_badge_chunk, chunk): n for n, chunk in enumerate(chunks)}
+            for future in as_completed(futures):
+                n = futures[future]
+                try:
+                    stats = future.result()
+                except Exception as e:
+                    # Leave the checkpoint behind this chunk so a rerun picks it up again
+                    self.stderr.write(f"❌ Chunk starting at registrant {chunks[n][0]} crashed: {e}")
+                    broken = True
+                    continue
+
+                finished[n] = True
+                update_manifest(stats["manifest"])
+                for key in totals:
+                    totals[key] += stats[key]
+                checkpoint["failed"].extend(err["registrant_id"] for err in stats["errors"])
+
+                # Only move past chunks once every earlier chunk has finished too
+                while next_chunk < len(chunks) and finished[next_chunk]:
+                    checkpoint["last_id"] = chunks[next_chunk][-1]
+                    next_chunk += 1
+                self._save_checkpoint(checkpoint_path, checkpoint)
+
+                done = totals["success"] + totals["failed"]
+                self.stdout.write(f"📦 {done}/{len(ids)} rendered ({totals['failed']} failed)")
+
+        elapsed = time.monotonic() - started
+        if not broken and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+        rate = totals["success"] / elapsed if elapsed else 0
+        peak = peak_rss_mb()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {totals['success']} badge(s) in {elapsed:.1f}s ({rate:.1f} badges/s), "
+            f"{totals['bytes'] / (1024 * 1024):.1f} MB written"
+            + (f", peak RSS {peak:.0f} MB" if peak is not None else "")
+        ))
+        if checkpoint["failed"]:
+            self.stderr.write(f"⚠️ Failed registrants: {', '.join(map(str, checkpoint['failed']))}")
+        if broken:
+            self.stderr.write(f"⚠️ Run incomplete, rerun to resume from {checkpoint_path}")
+
+    def _save_checkpoint(self, path, checkpoint):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, path)
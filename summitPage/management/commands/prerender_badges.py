@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from summitPage.badge_raster import badge_preview
+from summitPage.badges import badge_fingerprint, badge_pdf_artifact
+from summitPage.models import Registrant
+from summitPage.print_queue import printable_registrants
+
+
+class Command(BaseCommand):
+    help = "Render the desk badge preview and PDF of registrants queued for pre-rendering"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=50,
+            help="Rows loaded per query",
+        )
+        parser.add_argument(
+            "--poll-interval", type=float, default=10,
+            help="Seconds to sleep when nothing is pending",
+        )
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Render the pending badges and exit instead of polling forever",
+        )
+        parser.add_argument(
+            "--all", action="store_true",
+            help="First queue every printable registrant, e.g. for registrations made before this worker ran",
+        )
+
+    def handle(self, *args, **options):
+        if options["all"]:
+            queued = printable_registrants().update(badge_render_pending=True)
+            self.stdout.write(f"🎫 Queued {queued} printable registrant(s)")
+
+        while True:
+            # Photos are normalized by process_media first, rendering before
+            # that would only cache a badge that is about to go stale
+            batch = list(
+                Registrant.objects.filter(badge_render_pending=True)
+                .exclude(media_status="pending")
+                .order_by("pk")[: options["batch_size"]]
+            )
+            for registrant in batch:
+                # Clear the flag before rendering, so an edit made meanwhile queues it again
+                Registrant.objects.filter(pk=registrant.pk).update(badge_render_pending=False)
+                try:
+                    fingerprint = badge_fingerprint(registrant)
+                    badge_pdf_artifact(registrant, fingerprint=fingerprint)
+                    badge_preview(registrant, fingerprint=fingerprint)
+                except Exception as e:
+                    self.stderr.write(f"❌ Registrant {registrant.pk}: badge pre-rendering failed: {e}")
+
+            if batch:
+                self.stdout.write(self.style.SUCCESS(f"✅ Pre-rendered {len(batch)} badge(s)"))
+                continue
+
+            if options["once"]:
+                break
+            time.sleep(options["poll_interval"])
+
+        self.stdout.write("ℹ️ No badges pending.")
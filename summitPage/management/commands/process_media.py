@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from summitPage.media import MEDIA_MODELS, process_instance_media
+
+
+class Command(BaseCommand):
+    help = "Normalize uploaded photos, logos and ID scans flagged as processing pending"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=100,
+            help="Rows loaded per query",
+        )
+        parser.add_argument(
+            "--poll-interval", type=float, default=10,
+            help="Seconds to sleep when nothing is pending",
+        )
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Process the pending rows and exit instead of polling forever",
+        )
+        parser.add_argument(
+            "--retry-failed", action="store_true",
+            help="Move rows that previously failed back to pending first",
+        )
+        parser.add_argument(
+            "--all", action="store_true",
+            help="Move every row back to pending first, e.g. to downsample ID scans "
+                 "uploaded before this worker existed (migration 0027 marks those rows ready)",
+        )
+
+    def handle(self, *args, **options):
+        if options["all"]:
+            for model in MEDIA_MODELS:
+                model.objects.exclude(media_status="pending").update(media_status="pending")
+        elif options["retry_failed"]:
+            for model in MEDIA_MODELS:
+                model.objects.filter(media_status="failed").update(media_status="pending")
+
+        while True:
+            processed = 0
+            for model in MEDIA_MODELS:
+                batch = (
+                    model.objects.filter(media_status="pending")
+                    .only("media_hashes", *model.MEDIA_FIELDS)
+                    .order_by("pk")
+                )
+                for instance in batch[: options["batch_size"]]:
+                    status = process_instance_media(instance)
+                    processed += 1
+                    if status == "failed":
+                        self.stderr.write(f"❌ {model.__name__} {instance.pk}: media processing failed")
+
+            if processed:
+                self.stdout.write(self.style.SUCCESS(f"✅ Processed media for {processed} record(s)"))
+                continue
+
+            if options["once"]:
+                break
+            time.sleep(options["poll_interval"])
+
+        self.stdout.write("ℹ️ No pending media.")
@@ -0,0 +1,69 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from summitPage.export_jobs import claim_export_job, purge_expired_exports, run_export_job
+
+
+class Command(BaseCommand):
+    help = "Build queued report and badge ZIP exports, a few at a time"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency", type=int,
+            default=getattr(settings, "EXPORT_JOB_CONCURRENCY", 2),
+            help="Exports built at the same time by this worker",
+        )
+        parser.add_argument(
+            "--poll-interval", type=float, default=5,
+            help="Seconds to sleep when no export is queued",
+        )
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Build the queued exports and exit instead of polling forever",
+        )
+
+    def handle(self, *args, **options):
+        def run(job):
+            # Each pool thread holds its own DB connection
+            close_old_connections()
+            try:
+                return run_export_job(job)
+            finally:
+                close_old_connections()
+
+        self.stdout.write(f"📦 Export worker started, building up to {options['concurrency']} at a time")
+
+        running = set()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            while True:
+                close_old_connections()
+                purged = purge_expired_exports()
+                if purged:
+                    self.stdout.write(f"🗑️ Removed {purged} expired export(s)")
+
+                while len(running) < options["concurrency"]:
+                    job = claim_export_job()
+                    if job is None:
+                        break
+                    self.stdout.write(f"⏳ Building {job}")
+                    running.add(pool.submit(run, job))
+
+                if not running:
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                finished, running = wait(running, timeout=options["poll_interval"], return_when=FIRST_COMPLETED)
+                for future in finished:
+                    job = future.result()
+                    if job.status == "done":
+                        self.stdout.write(self.style.SUCCESS(f"✅ {job} → {job.artifact.name}"))
+                    else:
+                        self.stderr.write(f"❌ {job}: {job.error}")
+
+        self.stdout.write("ℹ️ No exports queued.")
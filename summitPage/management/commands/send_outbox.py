@@ -0,0 +1,68 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from summitPage.utils import claim_outbox_batch, deliver_outbox_email
+
+
+class Command(BaseCommand):
+    help = "Deliver queued confirmation emails from the EmailOutbox table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int,
+            default=getattr(settings, "EMAIL_OUTBOX_WORKERS", 4),
+            help="Number of emails sent in parallel",
+        )
+        parser.add_argument(
+            "--batch-size", type=int,
+            default=getattr(settings, "EMAIL_OUTBOX_BATCH_SIZE", 20),
+            help="Rows claimed from the outbox per poll",
+        )
+        parser.add_argument(
+            "--poll-interval", type=float, default=5,
+            help="Seconds to sleep when the outbox is empty",
+        )
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Drain the due rows and exit instead of polling forever",
+        )
+
+    def handle(self, *args, **options):
+        max_attempts = getattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 6)
+        backoff = getattr(settings, "EMAIL_OUTBOX_BACKOFF_SECONDS", 30)
+
+        def deliver(item):
+            # Each pool thread holds its own DB connection
+            close_old_connections()
+            try:
+                return deliver_outbox_email(item, max_attempts=max_attempts, backoff_seconds=backoff)
+            finally:
+                close_old_connections()
+
+        self.stdout.write(f"📬 Outbox worker started with {options['workers']} thread(s)")
+
+        with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+            while True:
+                close_old_connections()
+                batch = claim_outbox_batch(options["batch_size"])
+
+                if not batch:
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                results = list(pool.map(deliver, batch))
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"✅ {results.count('sent')} sent, "
+                        f"{results.count('pending')} retrying, "
+                        f"{results.count('dead')} dead-lettered"
+                    )
+                )
+
+        self.stdout.write("ℹ️ Outbox drained.")
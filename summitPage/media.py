@@ -0,0 +1,113 @@
+"""
+Background processing for uploaded photos, logos and ID scans.
+
+Uploads are stored as-is and flagged `media_status="pending"` by the models;
+`python manage.py process_media` normalizes them later.
+"""
+import hashlib
+import os
+import tempfile
+
+from PIL import Image, ImageOps
+
+from .models import Exhibitor, Registrant
+
+PHOTO_MAX_SIZE = (600, 600)
+SCAN_MAX_SIZE = (1600, 1600)
+SCAN_PDF_DPI = 150
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+MEDIA_MODELS = (Registrant, Exhibitor)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def normalize_image(path, max_size=PHOTO_MAX_SIZE):
+    """Resize a photo/logo in place to fit `max_size` and re-encode it as JPEG."""
+    with Image.open(path) as img:
+        if img.format.lower() not in ["jpeg", "jpg", "png"]:
+            return
+        img = ImageOps.exif_transpose(img).convert("RGB")
+        img.thumbnail(max_size)
+
+    img.save(path, format="JPEG", quality=85)
+
+
+def downsample_scan(path):
+    """Shrink an ID scan (image or PDF); the original is kept if it is already smaller."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext != ".pdf" and ext not in IMAGE_EXTENSIONS:
+        return
+
+    fd, tmp_path = tempfile.mkstemp(suffix=ext, dir=os.path.dirname(path))
+    os.close(fd)
+    try:
+        if ext == ".pdf":
+            from pdf2image import convert_from_path
+
+            pages = [page.convert("RGB") for page in convert_from_path(path, dpi=SCAN_PDF_DPI)]
+            pages[0].save(
+                tmp_path, format="PDF", save_all=True,
+                append_images=pages[1:], resolution=SCAN_PDF_DPI,
+            )
+        else:
+            with Image.open(path) as img:
+                fmt = img.format
+                img = ImageOps.exif_transpose(img)
+                img.thumbnail(SCAN_MAX_SIZE)
+                if fmt == "JPEG":
+                    img.convert("RGB").save(tmp_path, format="JPEG", quality=80, optimize=True)
+                else:
+                    img.save(tmp_path, format=fmt, optimize=True)
+
+        if os.path.getsize(tmp_path) < os.path.getsize(path):
+            os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def process_instance_media(instance):
+    """
+    Process every media field of a Registrant/Exhibitor and record the outcome.
+    Files whose hash matches the one stored after the last run are skipped.
+    """
+    hashes = dict(instance.media_hashes or {})
+    status = "ready"
+
+    for field in instance.MEDIA_FIELDS:
+        fieldfile = getattr(instance, field)
+        if not fieldfile or not os.path.exists(fieldfile.path):
+            hashes.pop(field, None)
+            continue
+
+        if hashes.get(field) == file_sha256(fieldfile.path):
+            continue
+
+        try:
+            if field == "national_id_scan":
+                downsample_scan(fieldfile.path)
+            else:
+                normalize_image(fieldfile.path)
+            hashes[field] = file_sha256(fieldfile.path)
+
+            if field == "passport_photo" and isinstance(instance, Registrant):
+                from .badges import prepare_badge_photos
+
+                prepare_badge_photos(fieldfile.path, hashes[field])
+        except Exception as e:
+            status = "failed"
+            print(f"⚠️ Could not process {fieldfile.name}: {e}")
+
+    # Only settle the row if no new file was uploaded while we were working
+    unchanged = {field: getattr(instance, field).name for field in instance.MEDIA_FIELDS}
+    type(instance).objects.filter(pk=instance.pk, **unchanged).update(
+        media_status=status, media_hashes=hashes
+    )
+    return status
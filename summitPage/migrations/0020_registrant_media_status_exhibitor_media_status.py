@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2025-11-10 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("summitPage", "0019_emailoutbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exhibitor",
+            name="media_hashes",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name="exhibitor",
+            name="media_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Processing Pending"),
+                    ("ready", "Ready"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="registrant",
+            name="media_hashes",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name="registrant",
+            name="media_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Processing Pending"),
+                    ("ready", "Ready"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                max_length=20,
+            ),
+        ),
+    ]
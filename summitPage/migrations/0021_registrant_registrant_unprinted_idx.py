@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2025-11-10 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('summitPage', '0020_registrant_media_status_exhibitor_media_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='registrant',
+            index=models.Index(condition=models.Q(('is_printed', 1), _negated=True), fields=['id'], name='registrant_unprinted_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2025-11-10 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('summitPage', '0021_registrant_registrant_unprinted_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='printlog',
+            name='batch',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2025-11-10 13:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('summitPage', '0022_printlog_batch'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='registrant',
+            name='print_claimed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='print_claims', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='registrant',
+            name='print_station',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='registrant',
+            name='print_claim_expires',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
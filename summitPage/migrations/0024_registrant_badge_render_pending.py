@@ -0,0 +1,22 @@
+# Generated by Django 5.2.7 on 2025-11-10 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('summitPage', '0023_registrant_print_claim'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='registrant',
+            name='badge_render_pending',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='registrant',
+            index=models.Index(condition=models.Q(('badge_render_pending', True)), fields=['id'], name='registrant_badge_pending_idx'),
+        ),
+    ]
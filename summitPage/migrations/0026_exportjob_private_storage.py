@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2025-11-10 14:30
+
+import summitPage.models
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+
+
+def expire_public_exports(apps, schema_editor):
+    # Files built before the move were written under MEDIA_ROOT; drop them
+    # and expire their jobs so they are rebuilt in the private storage
+    ExportJob = apps.get_model("summitPage", "ExportJob")
+    for job in ExportJob.objects.exclude(artifact="").exclude(artifact__isnull=True):
+        if default_storage.exists(job.artifact.name):
+            default_storage.delete(job.artifact.name)
+        job.artifact = None
+        if job.status == "done":
+            job.status = "expired"
+        job.save(update_fields=["artifact", "status"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("summitPage", "0025_exportjob"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="exportjob",
+            name="artifact",
+            field=models.FileField(
+                blank=True,
+                null=True,
+                storage=summitPage.models.export_storage,
+                upload_to="exports/",
+            ),
+        ),
+        migrations.RunPython(expire_public_exports, migrations.RunPython.noop),
+    ]
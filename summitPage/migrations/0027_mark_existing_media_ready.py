@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2025-11-10 15:10
+
+from django.db import migrations
+
+
+def mark_existing_media_ready(apps, schema_editor):
+    # Rows saved before 0020 had their photos and logos resized in save(), but
+    # 0020 added media_status with default "pending", so process_media would
+    # re-encode every existing upload once. Rows the worker has never touched
+    # have no hashes yet; settle those instead. Their ID scans were never
+    # downsampled; `process_media --all` queues them if that is wanted.
+    for model_name in ("Registrant", "Exhibitor"):
+        model = apps.get_model("summitPage", model_name)
+        model.objects.filter(media_status="pending", media_hashes={}).update(media_status="ready")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("summitPage", "0026_exportjob_private_storage"),
+    ]
+
+    operations = [
+        migrations.RunPython(mark_existing_media_ready, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,15 @@
 # models.py
 import os
 import uuid
-from PIL import Image
 from django.conf import settings
+from django.core.files.storage import FileSystemStorage
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 from django_countries.fields import CountryField
 
+from .category_cache import category_ids_named, category_name, get_category_map
+
 
 
 class Category(models.Model):
@@ -20,7 +23,7 @@ class Category(models.Model):
 
 def get_category_choices():
     choices = [("", "Select Category")]
-    choices += [(c.id, c.name) for c in Category.objects.all()]
+    choices += [(int(cid), name) for cid, (name, _) in get_category_map().items()]
     return choices
 
 
@@ -30,7 +33,7 @@ def get_category_choices():
 def get_category_id():
     """Return category choices safely even if DB isn't ready."""
     try:
-        return [("", "Select Category")] + [(str(c.id), c.name) for c in Category.objects.all()]
+        return [("", "Select Category")] + [(cid, name) for cid, (name, _) in get_category_map().items()]
     except Exception:
         return [("", "Select Category")]
 
@@ -38,10 +41,53 @@ def get_category_id():
 # --------------------------------------------
 
 
+MEDIA_STATUS_CHOICES = [
+    ("pending", "Processing Pending"),
+    ("ready", "Ready"),
+    ("failed", "Failed"),
+]
+
+
+class MediaProcessingMixin:
+    """Flag new uploads for the `process_media` worker instead of resizing on save."""
+
+    MEDIA_FIELDS = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._media_names = instance._current_media_names()
+        return instance
+
+    def _current_media_names(self):
+        # Deferred fields are not in __dict__ and must not trigger a query here
+        return {
+            field: getattr(self.__dict__[field], "name", self.__dict__[field]) or ""
+            for field in self.MEDIA_FIELDS
+            if field in self.__dict__
+        }
+
+    def _flag_media_changes(self, kwargs):
+        previous = getattr(self, "_media_names", {})
+        changed = any(
+            name and name != previous.get(field)
+            for field, name in self._current_media_names().items()
+        )
+        if changed:
+            self.media_status = "pending"
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "media_status"}
+
+    def save(self, *args, **kwargs):
+        self._flag_media_changes(kwargs)
+        super().save(*args, **kwargs)
+        self._media_names = self._current_media_names()
+
+
 # ============================================================
 # REGISTRANT MODEL
 # ============================================================
-class Registrant(models.Model):
+class Registrant(MediaProcessingMixin, models.Model):
     TITLE_CHOICES = [
         ("", "Select Title"),
         ("Prof", "Prof."),
@@ -87,6 +133,18 @@ class Registrant(models.Model):
     other_interest = models.TextField(blank=True, null=True)
 
     is_printed = models.IntegerField(null=True, blank=True)
+    # Print queue lease: which badge station is printing this badge, and until when
+    print_claimed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="print_claims",
+    )
+    print_station = models.CharField(max_length=64, blank=True, default="")
+    print_claim_expires = models.DateTimeField(null=True, blank=True)
+    # Desk badge (preview and PDF) still to be rendered by prerender_badges
+    badge_render_pending = models.BooleanField(default=False)
     category = models.CharField(
         max_length=50, choices=get_category_id, verbose_name="Registration Category"
     )
@@ -129,11 +187,52 @@ class Registrant(models.Model):
         verbose_name="Passport Photo (JPG/PDF)",
     )
 
+    media_status = models.CharField(max_length=20, choices=MEDIA_STATUS_CHOICES, default="pending")
+    media_hashes = models.JSONField(default=dict, blank=True)
+
+    MEDIA_FIELDS = ("passport_photo", "national_id_scan")
+
+    # Badge not generated yet (is_printed is NULL or anything but 1)
+    UNPRINTED = ~Q(is_printed=1)
+
+    class Meta:
+        indexes = [
+            # Backs the id-keyed batches of the bulk badge run
+            models.Index(fields=["id"], condition=~Q(is_printed=1), name="registrant_unprinted_idx"),
+            models.Index(fields=["id"], condition=Q(badge_render_pending=True), name="registrant_badge_pending_idx"),
+        ]
+
+    # Fields the badge desk's printable rule looks at
+    BADGE_RULE_FIELDS = ("is_printed", "approved", "organization_type", "category")
+
+    def is_badge_printable(self):
+        """Same rule as the badge desk: not printed yet, students only once approved."""
+        if self.is_printed is not None:
+            return False
+        student = (
+            (self.organization_type or "").lower() == "student"
+            or self.category in category_ids_named("Student")
+        )
+        return self.approved or not student
+
+    def save(self, *args, **kwargs):
+        # Queue the badge for pre-rendering whenever a printable registrant is
+        # saved; renders are keyed on the badge fingerprint, so an unchanged
+        # badge costs a hash. Partially loaded rows are left alone.
+        if (
+            not self.badge_render_pending
+            and not self.get_deferred_fields() & set(self.BADGE_RULE_FIELDS)
+            and self.is_badge_printable()
+        ):
+            self.badge_render_pending = True
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "badge_render_pending"}
+        super().save(*args, **kwargs)
+
     def get_category_display(self):
         """Handle callable choices for category gracefully."""
         try:
-            choices = get_category_id() if callable(get_category_id) else get_category_id
-            return dict(choices).get(self.category, self.category or "—")
+            return category_name(self.category, default=self.category or "—")
         except Exception:
             return self.category or "—"
 
@@ -163,31 +262,6 @@ class Registrant(models.Model):
     def __str__(self):
         return f"{self.title} {self.first_name} {self.second_name}"
 
-    # ✅ Save method: create upload folders + resize image to 600×600
-    def save(self, *args, **kwargs):
-        upload_dirs = [
-            os.path.join(settings.MEDIA_ROOT, "uploads/id_scans"),
-            os.path.join(settings.MEDIA_ROOT, "uploads/passport_photos"),
-            os.path.join(settings.MEDIA_ROOT, "uploads/exhibitors/id_scans/"),
-            os.path.join(settings.MEDIA_ROOT, "uploads/exhibitors/photos/"),
-            os.path.join(settings.MEDIA_ROOT, "uploads/partners/logos/"),
-        ]
-        for path in upload_dirs:
-            os.makedirs(path, exist_ok=True)
-
-        super().save(*args, **kwargs)
-
-        # ⚡ Resize passport photo
-        if self.passport_photo:
-            try:
-                img = Image.open(self.passport_photo.path)
-                if img.format.lower() in ["jpeg", "jpg", "png"]:
-                    img = img.convert("RGB")
-                    img.thumbnail((600, 600))
-                    img.save(self.passport_photo.path, format="JPEG", quality=85)
-            except Exception as e:
-                print(f"⚠️ Could not resize passport photo: {e}")
-
 
 # ---------------------------
 # New registration model for applications on IOS & Android
@@ -544,6 +618,57 @@ class EmailLogs(models.Model):
         return f"{self.recipient} - {self.status} ({self.sent_at.strftime('%Y-%m-%d %H:%M')})"
 
 
+# --------------------------------------------
+
+
+class EmailOutbox(models.Model):
+    """
+    Confirmation mails waiting to be delivered by the `send_outbox` worker.
+    Rows are written in the same transaction as the registrant/exhibitor.
+    """
+
+    KIND_CHOICES = [
+        ("confirmation", "Delegate Confirmation"),
+        ("protocol", "Protocol Confirmation"),
+        ("student", "Student Registration"),
+        ("student_verify", "Student Approval"),
+        ("exhibitor", "Exhibitor Confirmation"),
+        ("booth_confirmation", "Booth Confirmation"),
+    ]
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("sending", "Sending"),
+        ("sent", "Sent"),
+        ("dead", "Dead Letter"),
+    ]
+
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    registrant = models.ForeignKey(
+        "Registrant", on_delete=models.CASCADE, null=True, blank=True, related_name="outbox"
+    )
+    exhibitor = models.ForeignKey(
+        "Exhibitor", on_delete=models.CASCADE, null=True, blank=True, related_name="outbox"
+    )
+    recipient = models.EmailField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["next_attempt_at", "id"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_status_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} → {self.recipient} ({self.status})"
+
+
 # --------------------------------------------
 # EXHIBITION SECTION
 # --------------------------------------------
@@ -647,7 +772,7 @@ class BoothBooking(models.Model):
 # ============================================================
 # EXHIBITOR MODEL
 # ============================================================
-class Exhibitor(models.Model):
+class Exhibitor(MediaProcessingMixin, models.Model):
     """Main exhibitor registration details (local & international)."""
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -760,6 +885,11 @@ class Exhibitor(models.Model):
     )
     approved_at = models.DateTimeField(null=True, blank=True)
 
+    media_status = models.CharField(max_length=20, choices=MEDIA_STATUS_CHOICES, default="pending")
+    media_hashes = models.JSONField(default=dict, blank=True)
+
+    MEDIA_FIELDS = ("passport_photo", "logo", "national_id_scan")
+
     def approve(self, count):
         """Approve exhibitor and assign booth count."""
         self.approval_status = "approved"
@@ -777,22 +907,6 @@ class Exhibitor(models.Model):
     def __str__(self):
         return f"{self.get_full_name()} - {self.organization_type}"
 
-    # ✅ Save method: resize passport & logo images to 600×600
-    def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-
-        image_fields = [self.passport_photo, self.logo]
-        for img_field in image_fields:
-            if img_field and os.path.exists(img_field.path):
-                try:
-                    img = Image.open(img_field.path)
-                    if img.format.lower() in ["jpeg", "jpg", "png"]:
-                        img = img.convert("RGB")
-                        img.thumbnail((600, 600))
-                        img.save(img_field.path, format="JPEG", quality=85)
-                except Exception as e:
-                    print(f"⚠️ Could not resize {img_field.name}: {e}")
-
 
 # --------------------------------------------
 
@@ -925,6 +1039,8 @@ class PrintLog(models.Model):
         related_name="printed_records",
     )
     reprint = models.BooleanField(default=False, null=True)
+    # Written by a bulk badge_gen run rather than a badge desk click
+    batch = models.BooleanField(default=False)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     timestamp = models.DateTimeField(auto_now_add=True)
 
@@ -939,3 +1055,76 @@ class CategoryColor(models.Model):
 
     def __str__(self):
         return f"{self.color_hex_code} → {self.category_to_rep}"
+
+
+def export_storage():
+    """
+    Finished exports hold every registrant's contact details, so they live
+    outside MEDIA_ROOT and are only served through export_job_download.
+    """
+    return FileSystemStorage(
+        location=getattr(settings, "PRIVATE_EXPORT_ROOT", os.path.join(settings.BASE_DIR, "private_exports")),
+    )
+
+
+class ExportJob(models.Model):
+    """
+    A report or badge ZIP built by the `run_export_jobs` worker instead of
+    inside the web request. The finished file is kept until `expires_at`, so
+    asking for the same export again is served straight from storage.
+    """
+
+    KIND_CHOICES = [
+        ("registrants_pdf", "Registrants Report (PDF)"),
+        ("registrants_xlsx", "Registrants (Excel)"),
+        ("exhibitors_xlsx", "Exhibitors (Excel)"),
+        ("registrant_badges", "All Registration Badges (ZIP)"),
+        ("badge_batch", "Badge Batch (ZIP)"),
+    ]
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+        ("expired", "Expired"),
+    ]
+
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    # Filters the export was asked with, e.g. the badge batch date range and category
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    # Rows or badges written so far, out of `total`
+    done = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(null=True, blank=True)
+    artifact = models.FileField(upload_to="exports/", storage=export_storage, blank=True, null=True)
+    error = models.TextField(blank=True, null=True)
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="export_jobs",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+    # Lease of the worker building it, renewed with every progress write
+    locked_until = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "id"], name="exportjob_status_idx"),
+            models.Index(fields=["kind", "status"], name="exportjob_kind_status_idx"),
+        ]
+
+    @property
+    def percent(self):
+        if not self.total:
+            return 100 if self.status == "done" else 0
+        return min(100, round(self.done * 100 / self.total))
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.pk} ({self.status})"
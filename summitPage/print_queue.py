@@ -0,0 +1,114 @@
+"""
+Badge print queue shared by the badge stations.
+
+A station claims the next few badges with SELECT ... FOR UPDATE SKIP LOCKED,
+so concurrent claims never hand out the same registrant, and holds them on a
+lease that simply expires if the station goes away. Printed badges are
+acknowledged in batches: one UPDATE plus one PrintLog bulk insert.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .category_cache import category_ids_named
+from .models import PrintLog, Registrant
+
+CLAIM_LEASE_SECONDS = getattr(settings, "BADGE_CLAIM_LEASE_SECONDS", 300)
+MAX_CLAIM = 50
+
+# Clears a lease, on completion or release
+NO_CLAIM = {"print_claimed_by": None, "print_station": "", "print_claim_expires": None}
+
+
+def printable_registrants():
+    """
+    Badges the stations may print: not printed yet (the same predicate as the
+    other print paths and registrant_unprinted_idx), students only once approved.
+    """
+    student_category_ids = category_ids_named("Student")
+    return Registrant.objects.filter(
+        Registrant.UNPRINTED & (
+            Q(approved=True) |
+            ~Q(Q(organization_type__iexact="Student") | Q(category__in=student_category_ids))
+        )
+    )
+
+
+def unclaimed(now=None):
+    """Q for badges nobody holds a live lease on."""
+    now = now or timezone.now()
+    return Q(print_claim_expires__isnull=True) | Q(print_claim_expires__lte=now)
+
+
+def claimed_by(user, station):
+    return Q(print_claimed_by=user, print_station=station)
+
+
+def claim_jobs(user, station, count=10, category=None, name_from=None, name_to=None):
+    """
+    Lease up to `count` printable badges to `station`, optionally limited to
+    a category and an inclusive surname range (e.g. "A" to "M").
+
+    Returns:
+        (list of Registrant, lease expiry)
+    """
+    now = timezone.now()
+    expires = now + timedelta(seconds=CLAIM_LEASE_SECONDS)
+    count = max(1, min(count, MAX_CLAIM))
+
+    queryset = printable_registrants().filter(unclaimed(now))
+    if category:
+        queryset = queryset.filter(category=category)
+    if name_from or name_to:
+        queryset = queryset.annotate(surname=Lower("second_name"))
+        if name_from:
+            queryset = queryset.filter(surname__gte=name_from.lower())
+        if name_to:
+            queryset = queryset.filter(Q(surname__lt=name_to.lower()) | Q(surname__startswith=name_to.lower()))
+
+    with transaction.atomic():
+        # Rows another station is claiming right now are skipped, not waited on
+        ids = list(
+            queryset.order_by("id")
+            .select_for_update(skip_locked=True)
+            .values_list("id", flat=True)[:count]
+        )
+        Registrant.objects.filter(id__in=ids).update(
+            print_claimed_by=user, print_station=station, print_claim_expires=expires,
+        )
+
+    return list(Registrant.objects.filter(id__in=ids).order_by("id")), expires
+
+
+def complete_jobs(user, station, ids, ip_address=None):
+    """
+    Mark the badges this station printed. Badges whose lease has since gone
+    to another station are not touched.
+
+    Returns:
+        list of the acknowledged registrant ids
+    """
+    with transaction.atomic():
+        done = list(
+            Registrant.objects.filter(claimed_by(user, station), Registrant.UNPRINTED, id__in=ids)
+            .select_for_update()
+            .values_list("id", flat=True)
+        )
+        Registrant.objects.filter(id__in=done).update(is_printed=1, **NO_CLAIM)
+        PrintLog.objects.bulk_create([
+            PrintLog(record_id_id=registrant_id, printed_by=user, ip_address=ip_address, reprint=False)
+            for registrant_id in done
+        ])
+    return done
+
+
+def release_jobs(user, station, ids=None):
+    """Hand unprinted badges back to the queue; all of the station's if `ids` is None."""
+    queryset = Registrant.objects.filter(claimed_by(user, station), Registrant.UNPRINTED)
+    if ids is not None:
+        queryset = queryset.filter(id__in=ids)
+    return queryset.update(**NO_CLAIM)
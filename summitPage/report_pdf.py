@@ -0,0 +1,127 @@
+"""
+Pieces of the registrants PDF report, rendered from plain rows.
+
+Nothing here touches Django or the database, so pool workers can render
+chunks without setting Django up. reports.py reads the rows, hands them out
+chunk by chunk and merges the parts in order.
+"""
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+PAGE_SIZE = landscape(A4)
+HEADERS = ["No.", "Full Name", "Email", "Phone", "Organization", "Job Title", "Interests"]
+COL_WIDTHS = [30, 140, 150, 90, 140, 120, 130]
+GREEN = colors.HexColor("#01873F")
+
+TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), GREEN),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+    ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+    ("FONTSIZE", (0, 0), (-1, -1), 8),
+    ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ("WORDWRAP", (0, 0), (-1, -1), "CJK"),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+    ("TOPPADDING", (0, 0), (-1, -1), 4),
+])
+
+SUMMARY_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), GREEN),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
+    ("LINEABOVE", (0, -1), (-1, -1), 0.75, colors.black),
+    ("GRID", (0, 0), (-1, -2), 0.25, colors.grey),
+    ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
+    ("FONTSIZE", (0, 0), (-1, -1), 9),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+    ("TOPPADDING", (0, 0), (-1, -1), 4),
+])
+
+
+def _document(buffer):
+    return SimpleDocTemplate(
+        buffer,
+        pagesize=PAGE_SIZE,
+        rightMargin=20,
+        leftMargin=20,
+        topMargin=20,
+        bottomMargin=40,  # leave room for footer
+    )
+
+
+def _footer(generated_on):
+    def add_footer(canvas, doc):
+        canvas.saveState()
+        canvas.setFont("Helvetica", 8)
+        canvas.drawCentredString(
+            PAGE_SIZE[0] / 2, 20, f"Generated on {generated_on} | Kenya Software Summit © 2025"
+        )
+        canvas.restoreState()
+    return add_footer
+
+
+def _build(elements, generated_on):
+    buffer = BytesIO()
+    footer = _footer(generated_on)
+    _document(buffer).build(elements, onFirstPage=footer, onLaterPages=footer)
+    return buffer.getvalue()
+
+
+def render_summary(sections, total, generated_on, logo_path=None):
+    """
+    The report's first page: title and registrants per category.
+
+    Args:
+        sections: list of (category name, registrant count), in report order
+    """
+    styles = getSampleStyleSheet()
+    elements = []
+    if logo_path:
+        elements.append(Image(logo_path, width=80, height=80))
+    elements.append(Spacer(1, 10))
+    elements.append(Paragraph("<b>Kenya Software Summit</b>", styles["Title"]))
+    elements.append(Paragraph("Summit Registrants Report", styles["Heading2"]))
+    elements.append(Spacer(1, 20))
+
+    data = [["Category", "Registrants", "Share"]]
+    for name, count in sections:
+        data.append([name, count, f"{count * 100 / total:.1f}%" if total else "—"])
+    data.append(["Total", total, "100%" if total else "—"])
+
+    table = Table(data, colWidths=[300, 100, 100], hAlign="LEFT")
+    table.setStyle(SUMMARY_STYLE)
+    elements.append(table)
+    return _build(elements, generated_on)
+
+
+def render_chunk(rows, start, generated_on, heading=None):
+    """
+    One chunk of a category section as a standalone PDF.
+
+    Args:
+        rows: lists of cell text in HEADERS order, without the row number
+        start: number of the first row
+        heading: section heading, for the first chunk of a section
+    """
+    styles = getSampleStyleSheet()
+    normal_style = styles["Normal"]
+    elements = []
+    if heading:
+        elements.append(Paragraph(escape(heading), styles["Heading2"]))
+        elements.append(Spacer(1, 6))
+
+    data = [HEADERS]
+    for idx, row in enumerate(rows, start=start):
+        data.append([idx] + [Paragraph(escape(value or "—"), normal_style) for value in row])
+
+    table = Table(data, colWidths=COL_WIDTHS, repeatRows=1)
+    table.setStyle(TABLE_STYLE)
+    elements.append(table)
+    return _build(elements, generated_on)
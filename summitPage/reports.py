@@ -0,0 +1,315 @@
+"""
+Report and badge ZIP builders shared by the download views and the
+`run_export_jobs` worker.
+
+Each writer renders into a file-like `output` and, when given a `progress`
+callback, reports `progress(done, total)` as rows or badges are written.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from io import BytesIO
+from multiprocessing import get_context
+
+from django.conf import settings
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.text import slugify
+from django.utils.timezone import now
+from django_countries import countries
+from openpyxl import Workbook
+from pypdf import PdfReader, PdfWriter
+
+from .badges import build_badge_pdf, stream_badge_zip
+from .category_cache import category_name, get_category_map
+from .exports import EXPORT_CHUNK_SIZE
+from .models import EmailLogs, Exhibitor, Registrant
+from .report_pdf import render_chunk, render_summary
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+# Registrants per PDF report chunk, and processes laying chunks out
+REPORT_CHUNK_ROWS = getattr(settings, "REPORT_CHUNK_ROWS", 250)
+REPORT_WORKERS = getattr(settings, "REPORT_WORKERS", 2)
+
+
+def _format_datetime(value):
+    return value.strftime("%Y-%m-%d %H:%M") if value else ""
+
+
+def _counted(rows, total, progress):
+    """Pass `rows` through, reporting each one to `progress`."""
+    if progress is None:
+        yield from rows
+        return
+    done = 0
+    progress(done, total)
+    for row in rows:
+        yield row
+        done += 1
+        progress(done, total)
+
+
+# --------------------------------------------
+# === Excel ===
+# --------------------------------------------
+
+def write_xlsx(output, title, headers, rows):
+    """
+    Write `rows` as a single-sheet .xlsx. The write-only workbook spools rows
+    to disk as they are appended, so memory stays flat at any row count.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title)
+    ws.append(headers)
+    for row in rows:
+        ws.append(row)
+    wb.save(output)
+
+
+def write_registrants_xlsx(output, progress=None):
+    headers = [
+        "Full Name", "Email", "Phone", "Organization",
+        "Job Title", "Category", "Interests", "Subscribed", "Registered On"
+    ]
+    org_types = dict(Registrant.ORG_TYPE_CHOICES)
+    categories = get_category_map()
+
+    queryset = Registrant.objects.order_by("id")
+    registrants = queryset.values_list(
+        "title", "first_name", "second_name", "email", "phone",
+        "organization_type", "other_organization_type", "job_title",
+        "category", "interests", "updates_opt_in", "created_at",
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    def rows():
+        for (title, first_name, second_name, email, phone, org_type, other_org,
+             job_title, category, interests, opt_in, created_at) in registrants:
+            organization = org_types.get(org_type, org_type)
+            if other_org:
+                organization = f"{organization} - {other_org}"
+            yield [
+                f"{title} {first_name} {second_name}".strip(),
+                email,
+                phone,
+                organization or "—",
+                job_title or "—",
+                categories.get(str(category), (category or "—",))[0],
+                ", ".join(interests) if interests else "—",
+                "Yes" if opt_in else "No",
+                _format_datetime(created_at),
+            ]
+
+    total = queryset.count() if progress else None
+    write_xlsx(output, "Registrants", headers, _counted(rows(), total, progress))
+
+
+def write_exhibitors_xlsx(output, progress=None):
+    headers = [
+        "Name", "Email", "Phone", "Organization", "Country",
+        "Job Title", "Category", "Booked Booths",
+        "Approval Status", "Email Attempts", "Email Status",
+        "Last Email Sent", "Date Registered"
+    ]
+    categories = dict(Exhibitor._meta.get_field("category").choices)
+    approval_statuses = dict(Exhibitor._meta.get_field("approval_status").choices)
+
+    # Email columns come from correlated subqueries in the same SELECT
+    logs = EmailLogs.objects.filter(exhibitor=OuterRef("pk"))
+    latest_log = logs.order_by("-sent_at", "-pk")
+    exhibitors = (
+        Exhibitor.objects.order_by("-created_at")
+        .annotate(
+            email_attempts=Coalesce(
+                Subquery(logs.values("exhibitor").annotate(total=Sum("attempts")).values("total")), 0
+            ),
+            email_status=Subquery(latest_log.values("status")[:1]),
+            last_email_sent=Subquery(latest_log.values("sent_at")[:1]),
+        )
+        .values_list(
+            "title", "first_name", "second_name", "email", "phone", "organization_type",
+            "country_of_registration", "job_title", "category", "total_count", "approval_status",
+            "email_attempts", "email_status", "last_email_sent", "created_at",
+        )
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+    def rows():
+        for (title, first_name, second_name, email, phone, org_type, country, job_title, category,
+             total_count, approval_status, attempts, email_status, last_sent, created_at) in exhibitors:
+            yield [
+                f"{title} {first_name} {second_name or ''}".strip(),
+                email,
+                phone,
+                org_type,
+                countries.name(country) if country else "",
+                job_title or "",
+                categories.get(category, category) or "",
+                total_count,
+                approval_statuses.get(approval_status, approval_status),
+                attempts,
+                email_status or "",
+                _format_datetime(last_sent),
+                _format_datetime(created_at),
+            ]
+
+    total = Exhibitor.objects.count() if progress else None
+    write_xlsx(output, "Exhibitors", headers, _counted(rows(), total, progress))
+
+
+# --------------------------------------------
+# === PDF Report in Landscape with Logo, Summary & Category Sections ===
+# --------------------------------------------
+
+def report_sections():
+    """(category name, category value, registrant count) per category, by name, from one GROUP BY."""
+    counts = Registrant.objects.order_by().values_list("category").annotate(count=Count("id"))
+    sections = [
+        (category_name(category, default=category or "Uncategorised"), category, count)
+        for category, count in counts
+    ]
+    return sorted(sections, key=lambda section: section[0].lower())
+
+
+def report_chunks(sections, chunk_rows):
+    """
+    Yield (rows, first row number, heading) per chunk of at most `chunk_rows`
+    registrants, section by section. Rows are plain text, so a chunk can be
+    rendered without the database.
+    """
+    org_types = dict(Registrant.ORG_TYPE_CHOICES)
+    number = 1
+    for name, category, count in sections:
+        registrants = (
+            Registrant.objects.filter(category=category)
+            .order_by("second_name", "first_name", "id")
+            .values_list(
+                "title", "first_name", "second_name", "email", "phone",
+                "organization_type", "other_organization_type", "job_title", "interests",
+            )
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+        heading = f"{name} ({count})"
+        rows = []
+        for (title, first_name, second_name, email, phone, org_type, other_org,
+             job_title, interests) in registrants:
+            organization = org_types.get(org_type, org_type)
+            if other_org:
+                organization = f"{organization} - {other_org}"
+            rows.append([
+                f"{title} {first_name} {second_name}".strip(),
+                email,
+                phone,
+                organization,
+                job_title,
+                ", ".join(interests) if interests else "",
+            ])
+            if len(rows) == chunk_rows:
+                yield rows, number, heading
+                number += len(rows)
+                rows, heading = [], None
+        if rows:
+            yield rows, number, heading
+            number += len(rows)
+
+
+def write_registrants_pdf(output, progress=None, chunk_rows=REPORT_CHUNK_ROWS, workers=REPORT_WORKERS):
+    """
+    Render the report in chunks of `chunk_rows` registrants, each a small
+    standalone PDF laid out by one of `workers` processes, and merge them in
+    order after a summary page. Only a few chunks are in flight at a time,
+    so reportlab's layout memory depends on the chunk size rather than the
+    row count. The merged PdfWriter still holds every page, compressed,
+    until it is written out, so that part grows with the report; build it
+    through the `run_export_jobs` worker rather than in a web request.
+    """
+    sections = report_sections()
+    total = sum(count for _, _, count in sections)
+    generated_on = now().strftime("%b %d, %Y %H:%M")
+    logo_path = os.path.join(settings.BASE_DIR, "static", "img", "logo.png")
+
+    writer = PdfWriter()
+    writer.append(PdfReader(BytesIO(render_summary(
+        [(name, count) for name, _, count in sections], total, generated_on,
+        logo_path=logo_path if os.path.exists(logo_path) else None,
+    ))))
+
+    done = 0
+    if progress:
+        progress(done, total)
+
+    def merge(part, rows):
+        nonlocal done
+        writer.append(PdfReader(BytesIO(part)))
+        done += rows
+        if progress:
+            progress(done, total)
+
+    chunks = report_chunks(sections, chunk_rows)
+    if workers <= 1:
+        for rows, start, heading in chunks:
+            merge(render_chunk(rows, start, generated_on, heading), len(rows))
+    else:
+        # Spawned rather than forked: the export worker and web servers are threaded,
+        # and report_pdf needs nothing from the parent
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+            pending = deque()
+            for rows, start, heading in chunks:
+                pending.append((pool.submit(render_chunk, rows, start, generated_on, heading), len(rows)))
+                if len(pending) > workers:
+                    future, count = pending.popleft()
+                    merge(future.result(), count)
+            while pending:
+                future, count = pending.popleft()
+                merge(future.result(), count)
+
+    writer.write(output)
+
+
+# --------------------------------------------
+# === Badge ZIPs ===
+# --------------------------------------------
+
+def badge_batch_registrants(start_date=None, end_date=None, category=None):
+    """
+    Registrants selected by the batch modal's date range (YYYY-MM-DD, end
+    inclusive) and category. Raises ValueError on a bad date.
+    """
+    registrants = Registrant.objects.all()
+    if start_date and end_date:
+        start = timezone.make_aware(datetime.strptime(start_date, "%Y-%m-%d"))
+        end = timezone.make_aware(datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1))
+        registrants = registrants.filter(created_at__range=(start, end))
+    if category and category.lower() != "all":
+        registrants = registrants.filter(category=category)
+    return registrants
+
+
+def badge_zip_name(registrant):
+    return f"{slugify(f'{registrant.first_name}_{registrant.second_name}')}_Badge.pdf"
+
+
+def write_badge_zip(registrants, output, progress=None):
+    """
+    Write the view-variant badge of every registrant in `registrants` (a
+    queryset) into a ZIP, counting badges as their entries are added.
+    """
+    total = registrants.count() if progress else None
+    done = 0
+
+    def filename_for(registrant):
+        nonlocal done
+        done += 1
+        if progress:
+            progress(done, total)
+        return badge_zip_name(registrant)
+
+    if progress:
+        progress(done, total)
+    for chunk in stream_badge_zip(
+        registrants.iterator(chunk_size=200),
+        render=lambda registrant: build_badge_pdf(registrant, variant="view").getvalue(),
+        filename_for=filename_for,
+    ):
+        output.write(chunk)
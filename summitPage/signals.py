@@ -0,0 +1,58 @@
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .badges import remove_badge_photos
+from .category_cache import invalidate_categories
+from .export_jobs import delete_artifact
+from .fragment_cache import bump_fragment
+from .models import (
+    Category, ExportJob, Registrant, SummitGallery, SummitPanelist, SummitPartner,
+    SummitScheduleDay, SummitSession, SummitSpeaker, SummitTimeSlot,
+)
+
+
+@receiver([post_save, post_delete], sender=Category)
+def refresh_category_cache(sender, **kwargs):
+    # After commit, or other workers reload the old map under the new version
+    transaction.on_commit(invalidate_categories)
+
+
+@receiver([post_save, post_delete], sender=SummitScheduleDay)
+@receiver([post_save, post_delete], sender=SummitTimeSlot)
+@receiver([post_save, post_delete], sender=SummitSession)
+@receiver([post_save, post_delete], sender=SummitPanelist)
+def refresh_schedule_fragment(sender, **kwargs):
+    # After commit, or a request in between renders the old rows under the new version
+    transaction.on_commit(lambda: bump_fragment("schedule"))
+
+
+@receiver([post_save, post_delete], sender=SummitGallery)
+def refresh_gallery_fragment(sender, **kwargs):
+    transaction.on_commit(lambda: bump_fragment("gallery"))
+
+
+@receiver([post_save, post_delete], sender=SummitPartner)
+def refresh_sponsors_fragment(sender, **kwargs):
+    transaction.on_commit(lambda: bump_fragment("sponsors"))
+
+
+@receiver([post_save, post_delete], sender=SummitSpeaker)
+def refresh_speakers_fragment(sender, **kwargs):
+    transaction.on_commit(lambda: bump_fragment("speakers"))
+
+
+@receiver(post_delete, sender=ExportJob)
+def remove_export_artifact(sender, instance, **kwargs):
+    delete_artifact(instance)
+
+
+@receiver(post_save, sender=Registrant)
+def remove_replaced_badge_photos(sender, instance, **kwargs):
+    # _media_names still holds the names loaded before this save
+    previous = getattr(instance, "_media_names", {}).get("passport_photo")
+    if not previous or previous == instance.passport_photo.name:
+        return
+    path = default_storage.path(previous)
+    transaction.on_commit(lambda: remove_badge_photos(path))
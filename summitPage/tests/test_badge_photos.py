@@ -0,0 +1,74 @@
+# summitPage/tests/test_badge_photos.py
+import glob
+import io
+import os
+
+import pytest
+from django.core.files.base import ContentFile
+from model_bakery import baker
+from PIL import Image
+
+from summitPage.badges import badge_photo_path, prepare_badge_photos
+from summitPage.media import file_sha256
+from summitPage.models import Category, Registrant
+
+
+def jpeg(color):
+    buffer = io.BytesIO()
+    Image.new("RGB", (200, 240), color).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def crops(path):
+    return sorted(glob.glob(f"{os.path.splitext(path)[0]}.badge-*.jpg"))
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+
+
+@pytest.fixture
+def registrant():
+    category = baker.make(Category, name="Delegate")
+    registrant = baker.make(Registrant, organization_type="Private Company", category=str(category.pk))
+    registrant.passport_photo.save("jane.jpg", ContentFile(jpeg("red")))
+    return Registrant.objects.get(pk=registrant.pk)
+
+
+@pytest.mark.django_db
+def test_prepare_drops_crops_of_earlier_contents(registrant):
+    path = registrant.passport_photo.path
+    stale = badge_photo_path(path, 80)
+
+    with open(path, "wb") as f:
+        f.write(jpeg("blue"))
+    prepare_badge_photos(path)
+
+    digest = file_sha256(path)[:16]
+    assert not os.path.exists(stale)
+    assert len(crops(path)) == 2
+    assert all(f".badge-{digest}-" in crop for crop in crops(path))
+
+
+@pytest.mark.django_db(transaction=True)
+def test_replacing_the_photo_removes_its_crops(registrant):
+    old_path = registrant.passport_photo.path
+    prepare_badge_photos(old_path)
+    assert crops(old_path)
+
+    registrant.passport_photo = ContentFile(jpeg("blue"), name="jane.jpg")
+    registrant.save()
+
+    assert registrant.passport_photo.path != old_path
+    assert crops(old_path) == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_saving_without_a_new_photo_keeps_the_crops(registrant):
+    prepare_badge_photos(registrant.passport_photo.path)
+
+    registrant.job_title = "Engineer"
+    registrant.save()
+
+    assert len(crops(registrant.passport_photo.path)) == 2
@@ -0,0 +1,78 @@
+# summitPage/tests/test_badge_scan.py
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+from model_bakery import baker
+
+from summitPage.badges import badge_qr_data, parse_badge_qr
+from summitPage.models import Category, Registrant
+
+
+@pytest.fixture
+def registrant():
+    category = baker.make(Category, name="Delegate")
+    return baker.make(
+        Registrant,
+        first_name="Jane",
+        second_name="Doe",
+        organization_type="Private Company",
+        category=str(category.pk),
+    )
+
+
+@pytest.fixture
+def gate(client):
+    client.force_login(baker.make(User))
+    return client
+
+
+def scan(client, code):
+    return client.get(reverse("scan_badge"), {"code": code})
+
+
+@pytest.mark.django_db
+def test_valid_payload_resolves_the_holder(gate, registrant):
+    response = scan(gate, badge_qr_data(registrant))
+
+    assert response.status_code == 200
+    assert response.json()["success"] is True
+    assert "Jane" in response.json()["name"]
+
+
+@pytest.mark.django_db
+def test_scanner_lower_case_is_accepted(gate, registrant):
+    assert scan(gate, badge_qr_data(registrant).lower()).status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("tamper", [
+    lambda code: code[:-1],                                  # truncated signature
+    lambda code: code.rsplit(":", 1)[0],                     # signature dropped
+    lambda code: code[:-1] + ("0" if code[-1] != "0" else "1"),  # signature altered
+    lambda code: code.replace("KSS1:", "KSS2:"),             # wrong prefix
+    lambda code: code + ":EXTRA",
+    lambda code: "",
+])
+def test_tampered_or_truncated_payload_is_rejected(gate, registrant, tamper):
+    response = scan(gate, tamper(badge_qr_data(registrant)))
+
+    assert response.status_code == 400
+    assert response.json()["success"] is False
+
+
+@pytest.mark.django_db
+def test_signature_is_bound_to_the_pk(gate, registrant):
+    other = baker.make(Registrant, organization_type="Private Company", category=registrant.category)
+    _, _, signature = badge_qr_data(registrant).split(":")
+
+    forged = f"KSS1:{other.pk}:{signature}"
+    assert parse_badge_qr(forged) is None
+    assert scan(gate, forged).status_code == 400
+
+
+@pytest.mark.django_db
+def test_genuine_payload_for_a_deleted_holder_is_not_found(gate, registrant):
+    code = badge_qr_data(registrant)
+    registrant.delete()
+
+    assert scan(gate, code).status_code == 404
@@ -0,0 +1,42 @@
+# summitPage/tests/test_badge_sheets.py
+import pytest
+
+from summitPage.badges import BADGE_SIZES, SHEET_SIZES, SheetLayout
+
+
+def physical_front(sheet, index, mirrored):
+    """Where cell `index` sits on the front face of the paper, as (x, y) of its bottom-left corner."""
+    x, y = sheet.cell(index, mirrored=mirrored)
+    if not mirrored:
+        return x, y
+    width, height = sheet.page_size
+    # Long-edge duplex: the back of a portrait sheet is flipped left to right,
+    # the back of a landscape sheet top to bottom
+    if sheet.landscape:
+        return x, height - y - sheet.badge_h
+    return width - x - sheet.badge_w, y
+
+
+@pytest.mark.parametrize("sheet_size, badge_size, landscape", [
+    ("A4", "A8", True),
+    ("A3", "A7", True),
+    ("A4", "A7", False),
+    ("A3", "A8", False),
+])
+def test_back_cell_sits_behind_its_front_cell(sheet_size, badge_size, landscape):
+    sheet = SheetLayout(SHEET_SIZES[sheet_size], BADGE_SIZES[badge_size])
+    assert sheet.landscape is landscape
+    assert sheet.rows > 1 and sheet.cols > 1
+
+    for index in range(sheet.per_sheet):
+        front = physical_front(sheet, index, mirrored=False)
+        back = physical_front(sheet, index, mirrored=True)
+        assert back == pytest.approx(front)
+
+
+def test_landscape_backs_mirror_rows_not_columns():
+    sheet = SheetLayout(SHEET_SIZES["A4"], BADGE_SIZES["A8"])
+    last_row = (sheet.rows - 1) * sheet.cols
+
+    assert sheet.cell(0, mirrored=True) == sheet.cell(last_row)
+    assert sheet.cell(sheet.cols - 1, mirrored=True) == sheet.cell(last_row + sheet.cols - 1)
@@ -0,0 +1,91 @@
+# summitPage/tests/test_export_jobs.py
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from summitPage.models import Category, ExportJob, Registrant
+
+
+@pytest.fixture
+def admin(client):
+    client.force_login(baker.make(User, is_superuser=True))
+    return client
+
+
+@pytest.fixture
+def registrants():
+    category = baker.make(Category, name="Delegate")
+    return baker.make(Registrant, organization_type="Private Company", category=str(category.pk), _quantity=2)
+
+
+@pytest.mark.django_db
+def test_all_badges_are_queued_not_rendered(admin, registrants):
+    response = admin.get(reverse("generate_all_reg_badges"))
+
+    assert response.status_code == 202
+    job = ExportJob.objects.get()
+    assert (job.kind, job.status) == ("registrant_badges", "pending")
+    assert response.json()["page_url"] == reverse("export_job_page", args=[job.pk])
+
+    # Asking again returns the same job
+    assert admin.get(reverse("generate_all_reg_badges")).json()["id"] == job.pk
+    assert ExportJob.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_badge_batch_is_queued_with_its_filters(admin, registrants):
+    today = timezone.localdate().isoformat()
+    response = admin.get(
+        reverse("generate_all_exhibitor_badges"),
+        {"start_date": today, "end_date": today, "category": "all", "batch_size": "50"},
+    )
+
+    assert response.status_code == 202
+    job = ExportJob.objects.get()
+    assert job.kind == "badge_batch"
+    assert job.params == {"start_date": today, "end_date": today, "category": "all"}
+
+
+@pytest.mark.django_db
+def test_badge_batch_with_a_bad_date_is_rejected(admin, registrants):
+    response = admin.get(
+        reverse("generate_all_exhibitor_badges"), {"start_date": "2025-13-01", "end_date": "2025-12-31"}
+    )
+
+    assert response.status_code == 400
+    assert not ExportJob.objects.exists()
+
+
+@pytest.mark.django_db
+def test_finished_badge_zip_redirects_to_the_download(admin, registrants):
+    job = baker.make(
+        ExportJob, kind="registrant_badges", params={}, status="done",
+        expires_at=timezone.now() + timedelta(hours=1),
+    )
+
+    response = admin.get(reverse("generate_all_reg_badges"))
+
+    assert response.status_code == 302
+    assert response["Location"] == reverse("export_job_download", args=[job.pk])
+
+
+@pytest.mark.django_db
+def test_progress_page_shows_the_job(admin):
+    job = baker.make(ExportJob, kind="registrant_badges", status="running", done=3, total=10)
+
+    response = admin.get(reverse("export_job_page", args=[job.pk]))
+
+    assert response.status_code == 200
+    assert reverse("export_job_status", args=[job.pk]) in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_progress_page_of_a_superuser_only_job_is_hidden(client):
+    client.force_login(baker.make(User))
+    job = baker.make(ExportJob, kind="registrant_badges")
+
+    assert client.get(reverse("export_job_page", args=[job.pk])).status_code == 404
@@ -0,0 +1,135 @@
+# summitPage/tests/test_exports.py
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+from model_bakery import baker
+
+from summitPage.category_cache import invalidate_categories
+from summitPage.exports import EXPORTS, STREAM_BLOCK_SIZE, encode_stream
+from summitPage.models import Category, PrintLog, Registrant
+
+
+@pytest.fixture
+def category():
+    category = baker.make(Category, name="Delegate")
+    # The test transaction never commits, so the save does not invalidate the map
+    invalidate_categories()
+    return category
+
+
+@pytest.fixture
+def registrants(category):
+    return baker.make(
+        Registrant,
+        organization_type="Private Company",
+        category=str(category.pk),
+        interests=["AI", "Cloud"],
+        _quantity=3,
+    )
+
+
+@pytest.fixture
+def staff(client):
+    client.force_login(baker.make(User))
+    return client
+
+
+def export(client, dataset, fmt, **params):
+    return client.get(reverse("export_data", args=[dataset, fmt]), params)
+
+
+def body(response):
+    return b"".join(response.streaming_content)
+
+
+@pytest.mark.django_db
+def test_csv_header_and_list_columns(staff, registrants):
+    response = export(staff, "registrants", "csv")
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "text/csv; charset=utf-8"
+    rows = list(csv.reader(io.StringIO(body(response).decode("utf-8"))))
+    assert rows[0] == list(EXPORTS["registrants"]["columns"])
+    assert len(rows) == 1 + len(registrants)
+
+    record = dict(zip(rows[0], rows[1]))
+    assert record["interests"] == "AI; Cloud"
+    assert record["category"] == "Delegate"
+
+
+@pytest.mark.django_db
+def test_csv_header_uses_output_names_for_related_columns(staff, registrants):
+    baker.make(PrintLog, record_id=registrants[0], printed_by=baker.make(User, username="desk"))
+
+    rows = list(csv.reader(io.StringIO(body(export(staff, "printlogs", "csv")).decode("utf-8"))))
+
+    assert rows[0] == [
+        "id", "registrant_id", "first_name", "second_name", "category",
+        "printed_by", "reprint", "batch", "ip_address", "timestamp",
+    ]
+    record = dict(zip(rows[0], rows[1]))
+    assert record["registrant_id"] == str(registrants[0].pk)
+    assert record["printed_by"] == "desk"
+
+
+@pytest.mark.django_db
+def test_ndjson_is_one_object_per_line(staff, registrants):
+    response = export(staff, "registrants", "ndjson")
+
+    assert response["Content-Type"] == "application/x-ndjson"
+    lines = body(response).decode("utf-8").splitlines()
+    assert len(lines) == len(registrants)
+    objects = [json.loads(line) for line in lines]
+    assert [obj["id"] for obj in objects] == sorted(r.pk for r in registrants)
+    assert all(obj["interests"] == ["AI", "Cloud"] for obj in objects)
+    assert set(objects[0]) == set(EXPORTS["registrants"]["columns"])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("fmt", ["csv", "ndjson"])
+def test_gzip_decompresses_to_the_same_body(staff, registrants, fmt):
+    plain = body(export(staff, "registrants", fmt))
+    response = export(staff, "registrants", fmt, gzip="1")
+
+    assert response["Content-Type"] == "application/gzip"
+    assert response["Content-Disposition"].endswith(f'.{fmt}.gz"')
+    assert gzip.decompress(body(response)) == plain
+
+
+def test_gzip_spanning_several_blocks_round_trips():
+    lines = [f"{n},{'x' * 100}\n" for n in range(3 * STREAM_BLOCK_SIZE // 100)]
+
+    chunks = list(encode_stream(iter(lines), gzip=True))
+
+    assert len(chunks) > 1
+    assert gzip.decompress(b"".join(chunks)) == "".join(lines).encode("utf-8")
+
+
+@pytest.mark.django_db
+def test_date_range_filters_rows(staff, registrants):
+    lines = body(export(staff, "registrants", "ndjson", start_date="2000-01-01", end_date="2000-01-02"))
+    assert lines == b""
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("start_date, end_date", [
+    ("2025-13-01", "2025-12-31"),
+    ("01/11/2025", "2025-11-30"),
+    ("2025-11-01", "yesterday"),
+])
+def test_bad_date_is_rejected(staff, registrants, start_date, end_date):
+    response = export(staff, "registrants", "csv", start_date=start_date, end_date=end_date)
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Dates must be in YYYY-MM-DD format."}
+
+
+@pytest.mark.django_db
+def test_unknown_dataset_or_format_is_not_found(staff):
+    assert export(staff, "passwords", "csv").status_code == 404
+    assert export(staff, "registrants", "xml").status_code == 404
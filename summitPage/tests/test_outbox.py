@@ -0,0 +1,74 @@
+# summitPage/tests/test_outbox.py
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from model_bakery import baker
+
+from summitPage import utils
+from summitPage.models import Category, EmailLog, EmailOutbox, Registrant
+from summitPage.utils import claim_outbox_batch, deliver_outbox_email, queue_email
+
+
+class FailingEmail:
+    subject = "Registration Confirmation"
+
+    def send(self, fail_silently=False):
+        raise ConnectionError("SMTP unavailable")
+
+
+@pytest.fixture
+def failing_builder(monkeypatch):
+    monkeypatch.setitem(utils.EMAIL_BUILDERS, "confirmation", lambda owner: FailingEmail())
+
+
+@pytest.fixture
+def item():
+    category = baker.make(Category, name="Delegate")
+    registrant = baker.make(Registrant, organization_type="Private Company", category=str(category.pk))
+    return queue_email("confirmation", registrant=registrant)
+
+
+@pytest.mark.django_db
+def test_failed_send_is_rescheduled_with_backoff(item, failing_builder):
+    started = timezone.now()
+    assert deliver_outbox_email(item, max_attempts=6, backoff_seconds=30) == "pending"
+
+    item.refresh_from_db()
+    assert item.attempts == 1
+    assert item.last_error == "SMTP unavailable"
+    assert item.locked_until is None
+    assert started + timedelta(seconds=30) <= item.next_attempt_at <= timezone.now() + timedelta(seconds=30)
+
+    # The delay doubles with every further attempt
+    started = timezone.now()
+    assert deliver_outbox_email(item, max_attempts=6, backoff_seconds=30) == "pending"
+    item.refresh_from_db()
+    assert item.attempts == 2
+    assert started + timedelta(seconds=60) <= item.next_attempt_at <= timezone.now() + timedelta(seconds=60)
+
+    assert EmailLog.objects.filter(registrant=item.registrant, status="failed").count() == 2
+
+
+@pytest.mark.django_db
+def test_attempt_cap_dead_letters_the_row(item, failing_builder):
+    EmailOutbox.objects.filter(pk=item.pk).update(attempts=5)
+    item.refresh_from_db()
+
+    assert deliver_outbox_email(item, max_attempts=6) == "dead"
+
+    item.refresh_from_db()
+    assert item.status == "dead"
+    assert item.attempts == 6
+    assert claim_outbox_batch() == []
+
+
+@pytest.mark.django_db
+def test_claimed_row_is_not_claimed_twice(item):
+    assert [row.pk for row in claim_outbox_batch()] == [item.pk]
+    assert EmailOutbox.objects.get(pk=item.pk).status == "sending"
+    assert claim_outbox_batch() == []
+
+    # Until the worker holding it misses its lease
+    EmailOutbox.objects.filter(pk=item.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+    assert [row.pk for row in claim_outbox_batch()] == [item.pk]
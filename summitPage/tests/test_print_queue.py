@@ -0,0 +1,110 @@
+# summitPage/tests/test_print_queue.py
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.utils import timezone
+from model_bakery import baker
+
+from summitPage.models import Category, PrintLog, Registrant
+from summitPage.print_queue import claim_jobs, complete_jobs, release_jobs
+
+
+@pytest.fixture
+def registrants():
+    category = baker.make(Category, name="Delegate")
+    return baker.make(
+        Registrant,
+        organization_type="Private Company",
+        category=str(category.pk),
+        is_printed=None,
+        _quantity=6,
+    )
+
+
+@pytest.fixture
+def stations():
+    return baker.make(User, _quantity=2)
+
+
+@pytest.mark.django_db
+def test_claims_never_hand_out_the_same_registrant(registrants, stations):
+    first, _ = claim_jobs(stations[0], "desk-1", count=4)
+    second, _ = claim_jobs(stations[1], "desk-2", count=4)
+
+    first_ids = {r.pk for r in first}
+    second_ids = {r.pk for r in second}
+    assert len(first_ids) == 4
+    assert len(second_ids) == 2
+    assert not first_ids & second_ids
+
+    third, _ = claim_jobs(stations[1], "desk-3", count=4)
+    assert third == []
+
+
+@pytest.mark.django_db
+def test_expired_lease_can_be_claimed_again(registrants, stations):
+    claimed, _ = claim_jobs(stations[0], "desk-1", count=6)
+    Registrant.objects.filter(pk=claimed[0].pk).update(
+        print_claim_expires=timezone.now() - timedelta(seconds=1)
+    )
+
+    reclaimed, _ = claim_jobs(stations[1], "desk-2", count=6)
+
+    assert [r.pk for r in reclaimed] == [claimed[0].pk]
+    assert reclaimed[0].print_claimed_by == stations[1]
+    assert reclaimed[0].print_station == "desk-2"
+
+
+@pytest.mark.django_db
+def test_ack_marks_printed_and_logs(registrants, stations):
+    claimed, _ = claim_jobs(stations[0], "desk-1", count=2)
+    ids = [r.pk for r in claimed]
+
+    done = complete_jobs(stations[0], "desk-1", ids, ip_address="127.0.0.1")
+
+    assert sorted(done) == sorted(ids)
+    for registrant in Registrant.objects.filter(pk__in=ids):
+        assert registrant.is_printed == 1
+        assert registrant.print_claimed_by is None
+        assert registrant.print_claim_expires is None
+    logs = PrintLog.objects.filter(record_id__in=ids)
+    assert logs.count() == 2
+    assert all(log.printed_by == stations[0] and not log.reprint for log in logs)
+
+
+@pytest.mark.django_db
+def test_ack_by_another_station_is_ignored(registrants, stations):
+    claimed, _ = claim_jobs(stations[0], "desk-1", count=1)
+
+    assert complete_jobs(stations[1], "desk-2", [claimed[0].pk]) == []
+    assert Registrant.objects.get(pk=claimed[0].pk).is_printed is None
+    assert not PrintLog.objects.exists()
+
+
+@pytest.mark.django_db
+def test_release_by_non_holder_is_refused(registrants, stations):
+    claimed, expires = claim_jobs(stations[0], "desk-1", count=2)
+    ids = [r.pk for r in claimed]
+
+    assert release_jobs(stations[1], "desk-2", ids) == 0
+    assert release_jobs(stations[0], "desk-2", ids) == 0  # same user, other station
+    for registrant in Registrant.objects.filter(pk__in=ids):
+        assert registrant.print_claimed_by == stations[0]
+        assert registrant.print_claim_expires == expires
+
+    assert release_jobs(stations[0], "desk-1", ids) == 2
+    assert not Registrant.objects.filter(pk__in=ids, print_claimed_by__isnull=False).exists()
+
+
+@pytest.mark.django_db
+def test_unprinted_flag_of_zero_is_offered(registrants, stations):
+    Registrant.objects.filter(pk=registrants[0].pk).update(is_printed=0)
+    Registrant.objects.filter(pk=registrants[1].pk).update(is_printed=1)
+
+    claimed, _ = claim_jobs(stations[0], "desk-1", count=6)
+
+    ids = {r.pk for r in claimed}
+    assert registrants[0].pk in ids
+    assert registrants[1].pk not in ids
+    assert len(ids) == 5
@@ -57,6 +57,11 @@ urlpatterns = [
     path("unsubscribe/<uuid:token>/", views.unsubscribe_view, name="unsubscribe"),
     path("dashboard/stats/", views.dashboard_stats, name="dashboard_stats"),
     path("export/excel/", views.export_registrants_excel, name="export_excel"),
+    path("export/<str:dataset>.<str:fmt>", views.export_data, name="export_data"),
+    path("exports/jobs/", views.export_job_create, name="export_job_create"),
+    path("exports/jobs/<int:job_id>/", views.export_job_status, name="export_job_status"),
+    path("exports/jobs/<int:job_id>/progress/", views.export_job_page, name="export_job_page"),
+    path("exports/jobs/<int:job_id>/download/", views.export_job_download, name="export_job_download"),
     path("", views.home, name="home"),
     path("sendMail/", views.sendMail, name="sendMail"),
     path("badge/<int:registrant_id>/", views.generate_badge, name="generate_badge"),
@@ -72,6 +77,7 @@ urlpatterns = [
     ),
     # Registration API
     path("reg-service/registrations/", views.get_registrants, name="get_registrants"),
+    path("reg-service/registrations/export.<str:fmt>", views.export_registrations, name="export_registrations"),
     # path("api/", include(router.urls)),
     path("dashboard-main/", views.main_dashboard_view, name="main_dashboard_view"),
     path("register", views.reg, name="register"),
@@ -198,9 +204,14 @@ urlpatterns = [
     # badge generation
     path("create_badge/<int:reg_id>/", views.create_badge, name="create_badge"),
     path("mark_printed/<int:reg_id>/", views.mark_printed, name="mark_printed"),
+    path("badges/scan/", views.scan_badge, name="scan_badge"),
+    path("badges/queue/claim/", views.print_queue_claim, name="print_queue_claim"),
+    path("badges/queue/ack/", views.print_queue_ack, name="print_queue_ack"),
+    path("badges/queue/release/", views.print_queue_release, name="print_queue_release"),
     path("export-excel-exhibitors/", views.export_excel_exhibitors, name="export_excel_exhibitors"),
 
     path("badges/exhibitors/all/", generate_all_exhibitor_badges, name="generate_all_exhibitor_badges"),
     path("badges/registrants/all/", generate_all_reg_badges, name="generate_all_reg_badges"),
+    path("badges/sheets/", generate_badge_sheets, name="generate_badge_sheets"),
     path("count_registrations_in_range/", views.count_registrations_in_range, name="count_registrations_in_range"),
 ]
@@ -1,24 +1,34 @@
 # imports
 import math
 import json
+import tempfile
 from collections import Counter
 
 from django.contrib.auth import get_user_model, authenticate, login
 from django.contrib.auth.hashers import make_password
 from django.core.paginator import Paginator
 from django.forms import inlineformset_factory
-from reportlab.lib.pagesizes import A4, landscape, A8
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import (
-    SimpleDocTemplate, Table, TableStyle, Paragraph,
-    Image, Spacer
-)
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
 from .decorators import require_api_key
 from .forms import *
 from .models import *
+from .badges import (
+    BADGE_PDF_DIR, BADGE_SIZES, SHEET_SIZES, VARIANTS, artifact_name, badge_fingerprint, badge_pdf_artifact,
+    build_badge_pdf, build_badge_sheets, parse_badge_qr, print_order,
+)
+from .badge_raster import PREVIEW_DIR, badge_preview
+from .exports import EXPORTS, FORMATS as EXPORT_FORMATS, export_queryset, export_stream
+from .export_jobs import EXPORT_JOB_TYPES, request_export
+from .reports import (
+    XLSX_CONTENT_TYPE, badge_batch_registrants, write_exhibitors_xlsx, write_registrants_xlsx,
+)
+from .print_queue import (
+    NO_CLAIM, claim_jobs, complete_jobs, printable_registrants, release_jobs, unclaimed,
+)
+from .category_cache import category_ids_named, get_category_map
+from .fragment_cache import fragment_versions
 from .serializers_new import serialize_registrant
 from .utils import *
 
@@ -27,7 +37,7 @@ PanelistFormSet = inlineformset_factory(
 )
 from django.http import FileResponse, Http404
 from django.contrib.auth.views import LogoutView, LoginView
-from django.db.models import Case, When, Value, IntegerField, Max, OuterRef, Subquery, Count, Sum, Q
+from django.db.models import Max, OuterRef, Subquery, Count, Sum, Q
 from django.db import transaction
 from django.template.loader import render_to_string
 from summitPage.forms import DashboardSettingForm
@@ -36,32 +46,27 @@ from summitPage.models import (
     SummitGallery, SummitSpeaker, SummitSession,
     SummitScheduleDay, Booth, DashboardSetting, EmailLog
 )
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import condition, require_POST
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date
+from functools import wraps
 from django.views.decorators.csrf import csrf_exempt
 from django.shortcuts import get_object_or_404, render
+from django.urls import reverse
 from django.contrib import messages
 from django.db.models.functions import TruncDate, TruncMonth
 from django.utils.timezone import now
-from PIL import ImageDraw, Image
-import os
-import qrcode
 from django.conf import settings
 from django.core.files.storage import default_storage
-from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import portrait, A7
-from reportlab.lib.utils import ImageReader
-from reportlab.lib import colors
-from pdf2image import convert_from_bytes
 import logging
 
 logger = logging.getLogger(__name__)
 
-from openpyxl import Workbook
+from django_countries import countries
 from .models import Exhibitor
 from django.shortcuts import redirect
 from math import ceil
-from io import BytesIO
-import zipfile
 from django.http import HttpResponse
 from django.contrib.auth import logout
 from .models import Registrant, Category
@@ -84,9 +89,7 @@ def is_student_registrant(registrant: Registrant) -> bool:
             return True
 
         # 2️⃣ Check by category (compare to Category name "Student")
-        student_category_ids = [
-            str(cid) for cid in Category.objects.filter(name__iexact="Student").values_list("id", flat=True)
-        ]
+        student_category_ids = category_ids_named("Student")
         return str(registrant.category) in student_category_ids
 
     except Exception:
@@ -113,19 +116,10 @@ def home(request):
                 registrant.other_interest = other_interest
             registrant.interests = interests
 
-            registrant.save()
-
-            # Send confirmation email
-            try:
+            # Save + queue confirmation email in one transaction
+            with transaction.atomic():
+                registrant.save()
                 send_confirmation_email(registrant)
-            except Exception as e:
-                print("Email Send error:", e)
-                if request.headers.get("x-requested-with") == "XMLHttpRequest":
-                    return JsonResponse(
-                        {"success": True, "message": "Registration saved, but email failed."},
-                        status=200
-                    )
-                messages.warning(request, "Registered, but confirmation email failed.")
 
             if request.headers.get("x-requested-with") == "XMLHttpRequest":
                 return JsonResponse({"success": True, "message": "Registration successful!"})
@@ -142,23 +136,13 @@ def home(request):
     else:
         form = QuickRegistrationForm()
 
+    # Querysets stay lazy: they only hit the DB when a cached fragment is stale
     days = SummitScheduleDay.objects.prefetch_related(
         "timeslots__sessions__panelists"
     ).order_by("date")
 
-    gallery_items = SummitGallery.objects.filter(is_active=True).order_by('order')
     partners = SummitPartner.objects.filter(is_active=True).order_by("order")
 
-    summitspeakers = SummitSpeaker.objects.annotate(
-        custom_order=Case(
-            When(track__icontains='Keynote', then=Value(1)),
-            When(track__icontains='Host', then=Value(2)),
-            When(track__icontains='Speaker', then=Value(3)),
-            default=Value(4),
-            output_field=IntegerField(),
-        )
-    ).order_by('custom_order', 'full_name')
-
     sponsor_packages = {
         "Platinum Partners": partners.filter(order__lte=10),
         "Partners ": partners.filter(order__range=(11, 20)),
@@ -169,11 +153,9 @@ def home(request):
 
     return render(request, "summit/home.html", {
         'form': form,
-        'gallery_items': gallery_items,
-        'partners': partners,
         "sponsor_packages": sponsor_packages,
         'days': days,
-        'speakers': summitspeakers,
+        'fragment_versions': fragment_versions(),
         'interest_choices': Registrant.INTEREST_CHOICES,
     })
 
@@ -198,28 +180,16 @@ def reg(request):
                 registrant.other_interest = other_interest
             registrant.interests = interests
 
-            registrant.save()
-
             #  Use shared student logic
             is_student = is_student_registrant(registrant)
 
-            # --- Send appropriate email ---
-            try:
+            # --- Save + queue appropriate email ---
+            with transaction.atomic():
+                registrant.save()
                 if is_student:
                     send_student_email(registrant)
-                    print("Student")
                 else:
                     send_confirmation_email(registrant)
-                    print("Delegate")
-
-            except Exception as e:
-                print("Email Send error:", e)
-                if request.headers.get("x-requested-with") == "XMLHttpRequest":
-                    return JsonResponse(
-                        {"success": True, "message": "Registration saved, but email failed."},
-                        status=200
-                    )
-                messages.warning(request, "Registered, but confirmation email failed.")
 
             # --- Return success response ---
             if request.headers.get("x-requested-with") == "XMLHttpRequest":
@@ -236,16 +206,8 @@ def reg(request):
     else:
         form = QuickRegistrationForm()
 
-    # --- Extra context data ---
-    days = SummitScheduleDay.objects.prefetch_related("timeslots__sessions__panelists").order_by("date")
-    gallery_items = SummitGallery.objects.filter(is_active=True).order_by('order')
-    partners = SummitPartner.objects.filter(is_active=True).order_by("order")
-
     return render(request, "summit/reg.html", {
         'form': form,
-        'gallery_items': gallery_items,
-        'partners': partners,
-        'days': days,
         'interest_choices': Registrant.INTEREST_CHOICES,
     })
 
@@ -258,44 +220,72 @@ def _fit_text(c, text, max_width, start_font_size=9, font_name="Helvetica-Bold")
     return font_size
 
 
-@login_required
-def generate_badge(request, registrant_id, page_size=portrait(A7)):
-    """Generate a scalable summit badge PDF for a given registrant."""
+# --------------------------------------------
+# === Cached badge downloads (ETag / Last-Modified) ===
+# --------------------------------------------
+def _badge_for(request, pk):
+    """(registrant, fingerprint) for registrant `pk`, looked up once per request."""
+    cached = getattr(request, "_badge_fingerprint", None)
+    if cached is None or cached[0] != pk:
+        registrant = Registrant.objects.filter(pk=pk).first()
+        fingerprint = badge_fingerprint(registrant) if registrant else None
+        request._badge_fingerprint = (pk, registrant, fingerprint)
+    return request._badge_fingerprint[1:]
 
-    # --- Fetch registrant ---
-    try:
-        registrant = Registrant.objects.get(pk=registrant_id)
-    except Registrant.DoesNotExist:
-        raise Http404("Registrant not found")
 
-    category_obj = Category.objects.only("name", "color").get(id=registrant.category)
-    badge_color = category_obj.color or colors.black
+def badge_condition(directory, extension):
+    """
+    Conditional-GET decorator for a single-badge view: the ETag is the badge
+    fingerprint, so a browser holding the current badge gets a 304 and a
+    change to any field, the photo or the category colour yields a new one.
+    """
+    def pk_of(kwargs):
+        return next(iter(kwargs.values()))
 
-    # --- Core Data ---
-    full_name = registrant.get_full_name() or ""
-    national_id = registrant.national_id_number or ""
-    org_type = registrant.display_org_type() or ""
-    job_title = registrant.job_title or ""
-    category = registrant.get_category_display() or ""
-
-    # --- Generate QR Code ---
-    qr_data = (
-        f"Name: {full_name}\n"
-        f"National ID/ Passport NO: {national_id}\n"
-        f"Organization: {org_type}\n"
-        f"Job Title: {job_title}\n"
-        f"Category: {category}\n"
-    )
-    qr_img = qrcode.make(qr_data)
-    qr_buffer = BytesIO()
-    qr_img.save(qr_buffer, format="PNG")
-    qr_buffer.seek(0)
-    qr_reader = ImageReader(qr_buffer)
+    def etag(request, *args, **kwargs):
+        _, fingerprint = _badge_for(request, pk_of(kwargs))
+        return f'"{fingerprint[:32]}"' if fingerprint else None
 
-    pdf_buffer = build_exhibitor_badge_pdf(registrant)
+    def last_modified(request, *args, **kwargs):
+        _, fingerprint = _badge_for(request, pk_of(kwargs))
+        if not fingerprint:
+            return None
+        name = artifact_name(directory, pk_of(kwargs), fingerprint, extension)
+        return default_storage.get_modified_time(name) if default_storage.exists(name) else None
+
+    def decorator(view):
+        conditional_view = condition(etag_func=etag, last_modified_func=last_modified)(view)
+
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.has_header("Last-Modified"):
+                # First render of this version: the artifact exists only now
+                modified = last_modified(request, *args, **kwargs)
+                if modified:
+                    response["Last-Modified"] = http_date(modified.timestamp())
+            # Logged-in only: let the browser keep it, but always revalidate
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return wrapped
+    return decorator
+
+
+def cached_badge_pdf_response(request, pk):
+    registrant, fingerprint = _badge_for(request, pk)
+    if registrant is None:
+        raise Http404("Registrant not found")
 
+    name = badge_pdf_artifact(registrant, fingerprint=fingerprint)
     filename = f"{registrant.first_name}_{registrant.second_name}_Badge.pdf"
-    return FileResponse(pdf_buffer, as_attachment=True, filename=filename)
+    return FileResponse(default_storage.open(name, "rb"), as_attachment=True, filename=filename)
+
+
+@login_required
+@badge_condition(BADGE_PDF_DIR, "pdf")
+def generate_badge(request, registrant_id):
+    """Summit badge PDF for a given registrant, rendered once per badge version."""
+    return cached_badge_pdf_response(request, registrant_id)
 
 
 @login_required
@@ -350,73 +340,21 @@ def dashboard_stats(request):
 # --------------------------------------------
 # === Excel Export ===
 # --------------------------------------------
+def file_download(write, filename, content_type):
+    """Serve what `write(output)` renders, spooled to disk once it outgrows memory."""
+    output = tempfile.SpooledTemporaryFile(max_size=20 * 1024 * 1024)
+    write(output)
+    output.seek(0)
+    return FileResponse(output, as_attachment=True, filename=filename, content_type=content_type)
+
+
 @login_required
 def export_registrants_excel(request):
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Registrants"
-
-    # Header row
-    headers = [
-        "Full Name", "Email", "Phone", "Organization",
-        "Job Title", "Category", "Interests", "Subscribed", "Registered On"
-    ]
-    ws.append(headers)
-
-    for r in Registrant.objects.all():
-        ws.append([
-            r.full_name,
-            r.email,
-            r.phone,
-            r.organization or "—",
-            r.job_title or "—",
-            r.get_category_display(),
-            ", ".join(r.interests) if r.interests else "—",
-            "Yes" if r.updates_opt_in else "No",
-            r.created_at.strftime("%Y-%m-%d %H:%M"),
-        ])
-
-    response = HttpResponse(content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-    response["Content-Disposition"] = 'attachment; filename="registrants.xlsx"'
-    wb.save(response)
-    return response
+    return file_download(write_registrants_xlsx, "registrants.xlsx", XLSX_CONTENT_TYPE)
 
 
 def export_excel_exhibitors(request):
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Exhibitors"
-
-    # Header row
-    headers = [
-        "Name", "Email", "Phone", "Organization", "Country",
-        "Job Title", "Category", "Booked Booths",
-        "Approval Status", "Email Attempts", "Email Status",
-        "Last Email Sent", "Date Registered"
-    ]
-    ws.append(headers)
-
-    exhibitors = Exhibitor.objects.all().order_by("-created_at")
-
-    for e in exhibitors:
-        ws.append([
-            e.get_full_name(),
-            e.email,
-            e.phone,
-            e.organization_type,
-            e.get_country_of_registration_display() or "",
-            e.job_title or "",
-            e.get_category_display() or "",
-            e.total_count,
-        ])
-
-    response = HttpResponse(
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
-    response["Content-Disposition"] = 'attachment; filename="exhibitors.xlsx"'
-
-    wb.save(response)
-    return response
+    return file_download(write_exhibitors_xlsx, "exhibitors.xlsx", XLSX_CONTENT_TYPE)
 
 
 # --------------------------------------------
@@ -426,122 +364,123 @@ def export_excel_exhibitors(request):
 
 @login_required
 def export_registrants_pdf(request):
-    response = HttpResponse(content_type="application/pdf")
-    response["Content-Disposition"] = 'attachment; filename="registrants.pdf"'
-
-    # Landscape A4
-    doc = SimpleDocTemplate(
-        response,
-        pagesize=landscape(A4),
-        rightMargin=20,
-        leftMargin=20,
-        topMargin=20,
-        bottomMargin=40,  # leave room for footer
-    )
-    elements = []
-    styles = getSampleStyleSheet()
-    normal_style = styles["Normal"]
-
-    # === Logo ===
-    logo_path = os.path.join(settings.BASE_DIR, "static", "img", "logo.png")
-    if os.path.exists(logo_path):
-        logo = Image(logo_path, width=80, height=80)
-        elements.append(logo)
-
-    elements.append(Spacer(1, 10))
-
-    # === Header ===
-    elements.append(Paragraph("<b>Kenya Software Summit</b>", styles["Title"]))
-    elements.append(Paragraph("Summit Registrants Report", styles["Heading2"]))
-    elements.append(Spacer(1, 20))
-
-    # === Table headers ===
-    data = [[
-        "No.", "Full Name", "Email", "Phone", "Organization",
-        "Job Title", "Category", "Interests"
-    ]]
-
-    # === Table rows ===
-    for idx, r in enumerate(Registrant.objects.all(), start=1):
-        data.append([
-            idx,
-            Paragraph(r.full_name, normal_style),
-            Paragraph(r.email, normal_style),
-            Paragraph(r.phone, normal_style),
-            Paragraph(r.organization or "—", normal_style),
-            Paragraph(r.job_title or "—", normal_style),
-            Paragraph(r.get_category_display(), normal_style),
-            Paragraph(", ".join(r.interests) if r.interests else "—", normal_style),
-        ])
-
-    # === Column widths (landscape) ===
-    col_widths = [30, 120, 130, 80, 120, 100, 90, 160]
-
-    # === Table ===
-    table = Table(data, colWidths=col_widths, repeatRows=1)
-    table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#01873F")),
-        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-        ("FONTSIZE", (0, 0), (-1, -1), 8),
-        ("VALIGN", (0, 0), (-1, -1), "TOP"),
-        ("WORDWRAP", (0, 0), (-1, -1), "CJK"),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-        ("TOPPADDING", (0, 0), (-1, -1), 4),
-    ]))
-    elements.append(table)
-
-    # === Footer function ===
-    def add_footer(canvas, doc):
-        canvas.saveState()
-        footer_text = f"Generated on {now().strftime('%b %d, %Y %H:%M')} | Kenya Software Summit © 2025"
-        canvas.setFont("Helvetica", 8)
-        canvas.drawCentredString(landscape(A4)[0] / 2, 20, footer_text)
-        canvas.restoreState()
-
-    # === Build PDF with footer on every page ===
-    doc.build(elements, onFirstPage=add_footer, onLaterPages=add_footer)
+    """
+    The report is built by the export worker: redirect to the finished file,
+    or answer 202 with the job to poll while it is queued or running.
+    """
+    job, _ = request_export("registrants_pdf", user=request.user)
+    if job.status == "done":
+        return redirect("export_job_download", job_id=job.pk)
+    return JsonResponse(_export_job_json(job), status=202)
 
-    return response
+
+# Rows per print preview page; the counters carry on across pages
+PRINT_PAGE_SIZE = getattr(settings, "PRINT_PAGE_SIZE", 500)
+
+
+def print_page(request, rows):
+    """The requested page of `rows`, an ordered .values() queryset."""
+    return Paginator(rows, PRINT_PAGE_SIZE).get_page(request.GET.get("page"))
+
+
+def registrant_summary(registrants):
+    """
+    Registrants per organization type (merged with the free-text one, as
+    display_org_type() shows it) and per category, from grouped queries.
+    """
+    org_types = dict(Registrant.ORG_TYPE_CHOICES)
+    categories = get_category_map()
+
+    org_type_counts = Counter()
+    for org_type, other_org, count in (
+        registrants.order_by()
+        .values_list("organization_type", "other_organization_type")
+        .annotate(count=Count("id"))
+    ):
+        label = org_types.get(org_type, org_type)
+        if other_org:
+            label = f"{label} - {other_org}"
+        org_type_counts[label] += count
+
+    category_counts = Counter()
+    for category, count in registrants.order_by().values_list("category").annotate(count=Count("id")):
+        category_counts[categories.get(str(category), (category or "—",))[0]] += count
+
+    return org_type_counts.most_common(), category_counts.most_common()
 
 
 @login_required
 def print_registrants(request):
-    registrants = Registrant.objects.all().order_by("created_at")
-
-    # Build merged org_type counts manually (instead of raw DB field)
-    org_type_counts = {}
-    for reg in registrants:
-        label = reg.display_org_type()
-        org_type_counts[label] = org_type_counts.get(label, 0) + 1
+    registrants = Registrant.objects.all()
+    org_type_counts, category_counts = registrant_summary(registrants)
+
+    page = print_page(request, registrants.order_by("created_at", "id").values(
+        "title", "first_name", "second_name", "email", "phone",
+        "organization_type", "other_organization_type", "category", "job_title",
+    ))
+    org_types = dict(Registrant.ORG_TYPE_CHOICES)
+    categories = get_category_map()
+    rows = []
+    for row in page.object_list:
+        organization = org_types.get(row["organization_type"], row["organization_type"])
+        if row["other_organization_type"]:
+            organization = f"{organization} - {row['other_organization_type']}"
+        rows.append({
+            **row,
+            "organization": organization,
+            "category_name": categories.get(str(row["category"]), (row["category"] or "—",))[0],
+        })
 
     return render(request, "summit/print_registrants.html", {
-        "registrants": registrants,
-        "org_type_counts": org_type_counts.items(),
+        "page": page,
+        "rows": rows,
+        "org_type_counts": org_type_counts,
+        "category_counts": category_counts,
     })
 
 
+def exhibitor_print_rows(page):
+    """Display values for one page of exhibitor .values() rows."""
+    categories = dict(Exhibitor._meta.get_field("category").choices)
+    return [
+        {
+            **row,
+            "full_name": f"{row['title']} {row['first_name']} {row['second_name'] or ''}".strip(),
+            "country": countries.name(row["country_of_registration"]) if row["country_of_registration"] else "",
+            "category_name": categories.get(row["category"], row["category"]),
+        }
+        for row in page.object_list
+    ]
+
+
+EXHIBITOR_PRINT_FIELDS = (
+    "id", "title", "first_name", "second_name", "email", "phone", "organization_type",
+    "country_of_registration", "job_title", "category", "total_count", "approval_status",
+)
+
+
 @login_required
 def export_print_exhibitors(request):
-    exhibitors = Exhibitor.objects.all().order_by("created_at")
-
-    # Build merged org_type counts manually (instead of raw DB field)
-    org_type_counts = {}
+    page = print_page(request, Exhibitor.objects.order_by("created_at", "id").values(*EXHIBITOR_PRINT_FIELDS))
 
     return render(request, "exhibitor/print_exhibitors.html", {
-        "exhibitors": exhibitors,
+        "page": page,
+        "exhibitors": exhibitor_print_rows(page),
     })
 
 
 @login_required
 def export_print_approved(request):
-    exhibitors = Exhibitor.objects.filter(approval_status='approved').order_by('-approved_at')
+    page = print_page(
+        request,
+        Exhibitor.objects.filter(approval_status='approved')
+        .order_by('-approved_at', 'id')
+        .values(*EXHIBITOR_PRINT_FIELDS),
+    )
 
     # --- Stats for approved exhibitors view ---
     pending_approvals = Exhibitor.objects.filter(approval_status='pending').count()
-    total_approved_exhibitors = Exhibitor.objects.filter(approval_status='approved').count()
+    total_approved_exhibitors = page.paginator.count
     # --- Approved stats ---
 
     approved_booths_total = (
@@ -550,11 +489,9 @@ def export_print_approved(request):
             or 0
     )
 
-    # Counts booths linked to approved exhibitors
-    total_approved_booths = Booth.objects.filter(exhibitor__approval_status='approved').count()
-
     return render(request, "exhibitor/print_approved.html", {
-        "exhibitors": exhibitors,
+        "page": page,
+        "exhibitors": exhibitor_print_rows(page),
         "pending_approvals": pending_approvals,
         "total_approved_exhibitors": total_approved_exhibitors,
         "approved_booths_total": approved_booths_total,
@@ -563,10 +500,14 @@ def export_print_approved(request):
 
 @login_required
 def export_print_speakers(request):
-    speakers = SummitSpeaker.objects.all().order_by('full_name')
+    page = print_page(
+        request,
+        SummitSpeaker.objects.order_by('full_name', 'id').values("full_name", "position", "organization", "topic"),
+    )
 
     return render(request, "speaker/print_speakers.html", {
-        "speakers": speakers,
+        "page": page,
+        "speakers": page.object_list,
     })
 
 
@@ -584,8 +525,7 @@ def dashboard_view(request):
     updates_count = Registrant.objects.filter(updates_opt_in=True).count()
 
     # Convert category IDs to strings because Registrant.category is a CharField
-    student_category_ids = [str(cid) for cid in
-                            Category.objects.filter(name__iexact="Student").values_list("id", flat=True)]
+    student_category_ids = category_ids_named("Student")
 
     # Exclude students (either via org_type or category)
     registrants = (
@@ -718,16 +658,10 @@ def mailme_view(request):
 
 def speakers(request):
     speakers = SummitSpeaker.objects.all()
-    summitspeakers = SummitSpeaker.objects.annotate(
-        custom_order=Case(
-            When(track__icontains='Keynote', then=Value(1)),
-            When(track__icontains='Host', then=Value(2)),
-            When(track__icontains='Speaker', then=Value(3)),
-            default=Value(4),
-            output_field=IntegerField(),
-        )
-    ).order_by('custom_order', 'full_name')
-    return render(request, "summit/speakers.html", {"speakers": speakers})
+    return render(request, "summit/speakers.html", {
+        "speakers": speakers,
+        "fragment_versions": fragment_versions(),
+    })
 
 
 def media(request):
@@ -1228,52 +1162,17 @@ END:VCALENDAR
 def resend_confirmation_email(request, registrant_id):
     registrant = get_object_or_404(Registrant, id=registrant_id)
 
-    try:
-        # Attempt to send the email
-        send_confirmation_email(registrant)
-
-        # Update or create EmailLog
-        log, created = EmailLog.objects.get_or_create(
-            registrant=registrant,
-            recipient=registrant.email,
-            subject="Confirmation Email",
-            defaults={'status': 'success'}
-        )
-        log.attempts += 1
-        log.status = 'success'
-        log.sent_at = timezone.now()
-        log.error_message = ''
-        log.save()
-
-        return JsonResponse({
-            "success": True,
-            "message": f"Email resent to {registrant.email} successfully.",
-            "attempts": log.attempts,
-            "status": log.status,
-            "last_sent": log.sent_at.strftime("%b %d, %Y %H:%M")
-        })
-
-    except Exception as e:
-        # Log the failure in EmailLog
-        log, _ = EmailLog.objects.get_or_create(
-            registrant=registrant,
-            recipient=registrant.email,
-            subject="Confirmation Email",
-            defaults={'status': 'failed'}
-        )
-        log.attempts += 1
-        log.status = 'failed'
-        log.error_message = str(e)
-        log.sent_at = timezone.now()
-        log.save()
+    # Queue the email; the outbox worker sends it and writes the EmailLog
+    send_confirmation_email(registrant)
+    last_log = registrant.emaillog.order_by("-sent_at").first()
 
-        return JsonResponse({
-            "success": False,
-            "error": "here theres an error log it at this point",
-            "attempts": log.attempts,
-            "status": log.status,
-            "last_sent": log.sent_at.strftime("%b %d, %Y %H:%M")
-        }, status=500)
+    return JsonResponse({
+        "success": True,
+        "message": f"Email to {registrant.email} queued for delivery.",
+        "attempts": registrant.emaillog.count(),
+        "status": "pending",
+        "last_sent": last_log.sent_at.strftime("%b %d, %Y %H:%M") if last_log else None,
+    })
 
 
 @login_required
@@ -1397,6 +1296,7 @@ def gallery(request):
     gallery_items = SummitGallery.objects.filter(is_active=True).order_by('order')
     return render(request, "summit/gallery.html", {
         'gallery_items': gallery_items,
+        'fragment_versions': fragment_versions(),
     })
 
 
@@ -1468,6 +1368,9 @@ def exhibitor(request):
                     exhibitor.total_count = selected_count
                     exhibitor.save()
 
+                    # Queue confirmation email with the exhibitor row
+                    send_confirmation_mail(exhibitor)
+
             except Exception as e:
                 print("❌ Transaction error:", e)
                 msg = "An unexpected error occurred. Please try again."
@@ -1481,18 +1384,6 @@ def exhibitor(request):
                     "remaining": remaining,
                 })
 
-            # --- Try sending confirmation email ---
-            try:
-                send_confirmation_mail(exhibitor)
-            except Exception as e:
-                print("❌ Email send error:", e)
-                if request.headers.get("x-requested-with") == "XMLHttpRequest":
-                    return JsonResponse({
-                        "success": True,
-                        "message": "Registration successful, but confirmation email failed."
-                    })
-                messages.warning(request, "Registration saved, but email could not be sent.")
-
             # Success
             if request.headers.get("x-requested-with") == "XMLHttpRequest":
                 return JsonResponse({"success": True, "message": "Registration successful!"})
@@ -1873,11 +1764,8 @@ def main_dashboard_view(request):
 
     updates_count = Registrant.objects.filter(updates_opt_in=True).count()
 
-    category_lookup = {str(c.id): c.name for c in Category.objects.all()}
-    student_category_ids = [
-        str(cid)
-        for cid in Category.objects.filter(name__iexact="Student").values_list("id", flat=True)
-    ]
+    category_lookup = {cid: name for cid, (name, _) in get_category_map().items()}
+    student_category_ids = category_ids_named("Student")
 
     CATEGORY_MAP = {
         "1": "Delegate", "2": "Student", "3": "Secretariat", "4": "Security",
@@ -2107,8 +1995,7 @@ def dashboard_student_view(request):
     updates_count = Registrant.objects.filter(updates_opt_in=True).count()
 
     # Convert category IDs to strings because Registrant.category is a CharField
-    student_category_ids = [str(cid) for cid in
-                            Category.objects.filter(name__iexact="Student").values_list("id", flat=True)]
+    student_category_ids = category_ids_named("Student")
 
     # Include only students
     registrants = (
@@ -2148,8 +2035,7 @@ def student_approved(request):
     updates_count = Registrant.objects.filter(updates_opt_in=True).count()
 
     # Convert category IDs to strings because Registrant.category is a CharField
-    student_category_ids = [str(cid) for cid in
-                            Category.objects.filter(name__iexact="Student").values_list("id", flat=True)]
+    student_category_ids = category_ids_named("Student")
 
     # Include only students
     registrants = (
@@ -2190,12 +2076,7 @@ def approve_student(request, registrant_id):
         with transaction.atomic():
             registrant.approved = True
             registrant.save(update_fields=["approved"])
-
-        # Try sending verification email — if it fails, just log it
-        try:
             send_student_email_verify(registrant)
-        except Exception as e:
-            print(f"Email send error for {name}: {e}")
 
         # Always return success JSON to JS
         return JsonResponse({
@@ -2241,13 +2122,9 @@ def mass_approve_student(request, registrant_id=None):
                 try:
                     registrant.approved = True
                     registrant.save(update_fields=["approved"])
+                    send_student_email_verify(registrant)
                     approved_names.append(f"{registrant.first_name} {registrant.second_name}")
 
-                    try:
-                        send_student_email_verify(registrant)
-                    except Exception as e:
-                        print(f"Email send error for {registrant.id}: {e}")
-
                 except Exception as e:
                     failed_ids.append(registrant.id)
                     print(f"Approval error for {registrant.id}: {e}")
@@ -2295,393 +2172,234 @@ def api_trails(request):
 @require_POST
 def resend_exhibitor_confirmation_email(request, exhibitor_id):
     exhib = get_object_or_404(Exhibitor, id=exhibitor_id)
-    try:
-        send_confirmation_mail(exhib)
-        log, created = EmailLogs.objects.get_or_create(
-            exhibitor=exhib,
-            recipient=exhib.email,
-            subject="Confirmation Email",
-            defaults={'status': 'success'},
-        )
-        log.attempts += 1
-        log.status = 'success'
-        log.sent_at = timezone.now()
-        log.error_message = ''
-        log.save()
 
-        return JsonResponse({
-            "success": True,
-            "message": f"Email resent to {exhib.email} successfully.",
-            "attempts": log.attempts,
-            "status": log.status,
-            "last_sent": log.sent_at.strftime("%b %d, %Y %H:%M"),
-        })
-    except Exception as e:
-        log, _ = EmailLogs.objects.get_or_create(
-            exhibitor=exhib,
-            recipient=exhib.email,
-            subject="Confirmation Email",
-            defaults={'status': 'failed'},
-        )
-        log.attempts += 1
-        log.status = 'failed'
-        log.error_message = str(e)
-        log.sent_at = timezone.now()
-        log.save()
+    # Queue the email; the outbox worker sends it and writes the EmailLogs row
+    send_confirmation_mail(exhib)
+    last_log = exhib.emaillog.order_by("-sent_at").first()
 
-        return JsonResponse({
-            "success": False,
-            "error": "log here",
-            "attempts": log.attempts,
-            "status": log.status,
-            "last_sent": log.sent_at.strftime("%b %d, %Y %H:%M"),
-        }, status=500)
+    return JsonResponse({
+        "success": True,
+        "message": f"Email to {exhib.email} queued for delivery.",
+        "attempts": exhib.emaillog.count(),
+        "status": "pending",
+        "last_sent": last_log.sent_at.strftime("%b %d, %Y %H:%M") if last_log else None,
+    })
 
 
 @login_required
+@badge_condition(BADGE_PDF_DIR, "pdf")
 def generate_exhibitor_badge(request, exhibitor_id):
-    exhib = get_object_or_404(Registrant, pk=exhibitor_id)
+    return cached_badge_pdf_response(request, exhibitor_id)
 
-    pdf_buffer = build_exhibitor_badge_pdf(exhib)
 
-    filename = f"{exhib.first_name}_{exhib.second_name}_Badge.pdf"
-    return FileResponse(pdf_buffer, as_attachment=True, filename=filename)
 
+def build_exhibitor_badge_pdf(exhib, page_size=portrait(A7)):
+    """Single badge PDF; the static artwork comes from the cached layout in badges.py."""
+    return build_badge_pdf(exhib, page_size=page_size, variant="view")
 
 
-def build_exhibitor_badge_pdf(exhib, page_size=portrait(A7)):
-    category_obj = Category.objects.only("name", "color").get(id=exhib.category)
-    badge_color = category_obj.color or colors.black
+@login_required
+def generate_all_reg_badges(request):
+    """ZIP of every registrant's badge, built by the export worker; see export_registrants_pdf."""
+    if not request.user.is_superuser:
+        logout(request)
+        return redirect("custom_login")
 
-    # --- Core Data ---
-    full_name = exhib.get_full_name() or ""
-    national_id = exhib.national_id_number or ""
-    org_type = exhib.display_org_type() or ""
-    job_title = exhib.job_title or ""
-    category = exhib.get_category_display() or ""
+    job, _ = request_export("registrant_badges", user=request.user)
+    if job.status == "done":
+        return redirect("export_job_download", job_id=job.pk)
+    return JsonResponse(_export_job_json(job), status=202)
+import logging
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth import logout
+from django.shortcuts import redirect
 
-    # --- Generate QR Code ---
-    qr_data = (
-        f"Name: {full_name}\n"
-        f"National ID/ Passport NO: {national_id}\n"
-        f"Organization: {org_type}\n"
-        f"Job Title: {job_title}\n"
-        f"Category: {category}\n"
-    )
-    qr_img = qrcode.make(qr_data)
-    qr_buffer = BytesIO()
-    qr_img.save(qr_buffer, format="PNG")
-    qr_buffer.seek(0)
-    qr_reader = ImageReader(qr_buffer)
-
-    # --- PDF Setup (ONLY ONCE) ---
-    pdf_buffer = BytesIO()
-    c = canvas.Canvas(pdf_buffer, pagesize=page_size)
-    width, height = page_size
-
-    # --- Scale constants based on size ---
-    base_width, base_height = portrait(A7)
-    scale_w = width / base_width
-    scale_h = height / base_height
-    scale = (scale_w + scale_h) / 2
-
-    def s(val):
-        return val * scale
-
-    ###############################################################
-    # ======================== PAGE 1 =============================
-    ###############################################################
-
-    # --- Background ---
-    c.setFillColor(colors.white)
-    c.rect(0, 0, width, height, fill=1, stroke=0)
-
-    # --- Flag accents ---
-    def draw_accent_shapes():
-        c.setFillColor(colors.HexColor("#3aa655"))
-        path = c.beginPath()
-        path.moveTo(width * 0.68, height * 0.18)
-        path.lineTo(width * 0.83, height * 0.28)
-        path.lineTo(width * 0.68, height * 0.36)
-        path.close()
-        c.drawPath(path, fill=1, stroke=0)
-
-        offset = s(45)
-        c.setStrokeColor("#d62612")
-        c.setLineWidth(s(0.5))
-        c.line(width * 0.5 - offset, 0, width - offset, height * 0.35)
-
-        c.setFillColor(badge_color)
-        path = c.beginPath()
-        path.moveTo(0, 0);
-        path.lineTo(width * 0.8, 0);
-        path.lineTo(0, height * 0.4)
-        path.close()
-        c.drawPath(path, fill=1, stroke=0)
-
-        c.setFillColor(colors.HexColor("#d62612"))
-        path = c.beginPath()
-        path.moveTo(width, 0);
-        path.lineTo(width, height * 0.35);
-        path.lineTo(width * 0.5, 0)
-        path.close()
-        c.drawPath(path, fill=1, stroke=0)
-
-    draw_accent_shapes()
-
-    # --- Summit Logos ---
-    summit_logo_path = os.path.join(settings.BASE_DIR, "static", "images", "summit_logo.png")
-    partner_logo_path = os.path.join(settings.BASE_DIR, "static", "images", "badge_partner.png")
-
-    margin_x = width * 0.05
-    margin_top = height * 0.06
-
-    logo_h = height * 0.25
-    spacing = width * 0.01
-    total_width = 0
-    images = []
-
-    if os.path.exists(partner_logo_path):
-        img = ImageReader(partner_logo_path)
-        w = width * 0.48
-        images.append((img, w))
-        total_width += w
-
-    if os.path.exists(summit_logo_path):
-        if images: total_width += spacing
-        img = ImageReader(summit_logo_path)
-        w = width * 0.52
-        images.append((img, w))
-        total_width += w
-
-    if images:
-        start_x = (width - total_width) / 2
-        y_pos = height - margin_top - logo_h
-        for img, w in images:
-            c.drawImage(img, start_x, y_pos, width=w, height=logo_h,
-                        preserveAspectRatio=True, mask="auto")
-            start_x += w + spacing
-
-    # --- Passport Photo ---
-    photo_w, photo_h = 80, 80
-    photo_x, photo_y = (width - photo_w) / 2, height - 165
-
-    def draw_placeholder():
-        c.setFillColor(colors.lightgrey)
-        c.roundRect(photo_x, photo_y, photo_w, photo_h, 6, fill=1)
-        c.setFillColor(colors.darkgrey)
-        c.setFont("Helvetica", 6)
-        c.drawCentredString(width / 2, photo_y + photo_h / 2 - 2, "No Photo")
-
-    def draw_passport():
-        try:
-            if not (exhib.passport_photo and default_storage.exists(exhib.passport_photo.name)):
-                return draw_placeholder()
+logger = logging.getLogger(__name__)
 
-            photo_path = default_storage.path(exhib.passport_photo.name)
-            img = Image.open(photo_path).convert("RGBA")
-            img = img.point(lambda p: p * 1.03)
-            img = img.resize((img.width * 2, img.height * 2), Image.LANCZOS)
 
-            min_side = min(img.size)
-            offset = int(min_side * 0.10)
-            left = (img.width - min_side) / 2
-            top = max((img.height - min_side) / 2 - offset, 0)
-            img = img.crop((left, top, left + min_side, top + min_side))
-            img = img.resize((photo_w * 2, photo_h * 2), Image.LANCZOS)
+def badge_batch_queryset(request):
+    """Registrants selected by the batch modal's date range and category."""
+    return badge_batch_registrants(
+        request.GET.get("start_date"), request.GET.get("end_date"), request.GET.get("category"),
+    )
 
-            mask = Image.new("L", img.size, 0)
-            ImageDraw.Draw(mask).ellipse((0, 0, img.size[0], img.size[1]), fill=255)
 
-            circ = Image.new("RGBA", img.size)
-            circ.paste(img, (0, 0), mask=mask)
+@login_required
+def generate_all_exhibitor_badges(request):
+    if not request.user.is_superuser:
+        logout(request)
+        return redirect("custom_login")
 
-            buf = BytesIO()
-            circ.save(buf, format="PNG")
-            buf.seek(0)
+    try:
+        if not badge_batch_queryset(request).exists():
+            return HttpResponse("No exhibitors found", content_type="text/plain")
+    except ValueError:
+        return JsonResponse({"detail": "Dates must be in YYYY-MM-DD format."}, status=400)
 
-            c.drawImage(ImageReader(buf), photo_x, photo_y,
-                        width=photo_w, height=photo_h, mask="auto")
+    # Built by the export worker; see export_registrants_pdf
+    job, _ = request_export("badge_batch", params=request.GET.dict(), user=request.user)
+    if job.status == "done":
+        return redirect("export_job_download", job_id=job.pk)
+    return JsonResponse(_export_job_json(job), status=202)
 
-            center_x = width / 2
-            center_y = photo_y + photo_h / 2
 
-            c.setLineWidth(1.6)
-            c.setStrokeColor(colors.white)
-            c.circle(center_x, center_y, (photo_w / 2) + 1)
+@login_required
+def generate_badge_sheets(request):
+    """
+    One print-ready PDF with the selected badges imposed N-up on A4/A3 sheets,
+    sorted by category and surname, instead of a ZIP of single-badge files.
+    """
+    if not request.user.is_superuser:
+        logout(request)
+        return redirect("custom_login")
 
-            c.setLineWidth(0.8)
-            c.setStrokeColor(colors.HexColor("#3aa655"))
-            c.circle(center_x, center_y, (photo_w / 2) + 2)
+    sheet = request.GET.get("sheet", "A4").upper()
+    badge_size = request.GET.get("badge_size", "A7").upper()
+    variant = request.GET.get("variant", "view")
+    if sheet not in SHEET_SIZES or badge_size not in BADGE_SIZES or variant not in VARIANTS:
+        return HttpResponse("Invalid sheet, badge size or variant", status=400, content_type="text/plain")
+
+    registrants = badge_batch_queryset(request)
+    if not registrants.exists():
+        return HttpResponse("No registrants found", content_type="text/plain")
+
+    # Large runs spill to disk instead of holding the whole PDF in memory
+    output = tempfile.SpooledTemporaryFile(max_size=20 * 1024 * 1024)
+    build_badge_sheets(
+        print_order(registrants).iterator(chunk_size=500),
+        sheet_size=SHEET_SIZES[sheet],
+        badge_size=BADGE_SIZES[badge_size],
+        variant=variant,
+        output=output,
+    )
 
-        except Exception:
-            draw_placeholder()
-
-    draw_passport()
-
-    # --- Registrant Info ---
-    text_y = photo_y - s(12)
-    c.setFillColor(colors.black)
-    c.setFont("Helvetica-Bold", s(8.5))
-    c.drawCentredString(width / 2, text_y, full_name[:35])
-
-    c.setFont("Helvetica-Bold", s(13))
-    c.drawCentredString(width / 2, text_y - s(11), category[:35])
-
-    c.setFillColor(colors.white)
-    # Define fonts and sizes
-    base_font = "Helvetica-Bold"
-    base_size = s(20)  # Increased from 15.5
-    sup_size = s(12)  # Increased for better proportion
-    text_main1, text_sup1 = "10", "th"
-    text_main2, text_sup2 = "12", "th"
-    dash = "–"
-
-    # Measure total width for centering
-    w_main1 = c.stringWidth(text_main1, base_font, base_size)
-    w_sup1 = c.stringWidth(text_sup1, base_font, sup_size)
-    w_dash = c.stringWidth(dash, base_font, base_size)
-    w_main2 = c.stringWidth(text_main2, base_font, base_size)
-    w_sup2 = c.stringWidth(text_sup2, base_font, sup_size)
-    total_width = w_main1 + w_sup1 + w_dash + w_main2 + w_sup2
-
-    x_start = (width / 4.3) - (total_width / 2)
-    y_base = s(40)  # slightly higher to balance the new size
-
-    # Draw "10"
-    c.setFont(base_font, base_size)
-    c.drawString(x_start, y_base, text_main1)
-    x_start += w_main1
-
-    # Superscript "th"
-    c.setFont(base_font, sup_size)
-    c.drawString(x_start, y_base + s(7), text_sup1)  # slight vertical offset
-    x_start += w_sup1
-
-    # Dash
-    c.setFont(base_font, base_size)
-    c.drawString(x_start, y_base, dash)
-    x_start += w_dash
-
-    # "12"
-    c.drawString(x_start, y_base, text_main2)
-    x_start += w_main2
-
-    # Superscript "th"
-    c.setFont(base_font, sup_size)
-    c.drawString(x_start, y_base + s(7), text_sup2)
-
-    # --- Date text ("November 2025") ---
-    text = "November 2025"
-    text_x = width / 4.2
-    text_y = s(30)
-    c.setFont("Helvetica", s(11))  # slightly larger and cleaner
-    c.drawCentredString(text_x, text_y, text)
-
-    # Underline accent
-    text_width = c.stringWidth(text, "Helvetica", s(11))
-    c.setLineWidth(s(0.6))
-    c.setStrokeColor(colors.white)
-    c.line(text_x - text_width / 2, text_y - s(3), text_x + text_width / 2, text_y - s(3))
-
-    # --- Venue line ---
-    c.setFont("Helvetica", s(6))
-    c.drawCentredString(width / 4, s(20), "Moi University Annex Campus, ")
-    c.drawCentredString(width / 6.8, s(12), "Eldoret Kenya, ")
-
-    # --- QR Code ---
-    qr_size, qr_margin = s(40), s(7)  # was 45
-    c.drawImage(
-        qr_reader,
-        width - qr_size - qr_margin,
-        qr_margin,
-        width=qr_size,
-        height=qr_size,
-        mask="auto"
+    timestamp = timezone.now().strftime("%Y%m%d-%H%M%S")
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename=f"Badge_Sheets_{sheet}_{timestamp}.pdf",
+        content_type="application/pdf",
     )
 
-    c.showPage()
 
-    c.save()
-    pdf_buffer.seek(0)
-    return pdf_buffer
+def export_response(request, dataset, fmt):
+    """CSV / NDJSON export of `dataset`, streamed with the same date and category filters as below."""
+    if dataset not in EXPORTS or fmt not in EXPORT_FORMATS:
+        raise Http404("Unknown export")
+    try:
+        queryset = export_queryset(
+            dataset,
+            start_date=request.GET.get("start_date"),
+            end_date=request.GET.get("end_date"),
+            category=request.GET.get("category"),
+        )
+    except ValueError:
+        return JsonResponse({"detail": "Dates must be in YYYY-MM-DD format."}, status=400)
+
+    gzip = request.GET.get("gzip", "").lower() in ("1", "true", "yes")
+    response = StreamingHttpResponse(
+        export_stream(dataset, fmt, queryset, gzip=gzip),
+        content_type="application/gzip" if gzip else EXPORT_FORMATS[fmt],
+    )
+    filename = f"{dataset}_{timezone.now():%Y%m%d-%H%M%S}.{fmt}" + (".gz" if gzip else "")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
 
 
 @login_required
-def generate_all_reg_badges(request):
-    if not request.user.is_superuser:
-        logout(request)
-        return redirect("custom_login")
+def export_data(request, dataset, fmt):
+    return export_response(request, dataset, fmt)
 
-    exhibitors = Registrant.objects.all().order_by("created_at")
 
-    zip_buffer = BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-        for exhib in exhibitors:
-            pdf_buffer = build_exhibitor_badge_pdf(exhib)
-            filename = f"{exhib.first_name}_{exhib.second_name}_Badge.pdf"
-            zf.writestr(filename, pdf_buffer.getvalue())
+@require_api_key
+def export_registrations(request, fmt):
+    """
+    GET /reg-service/registrations/export.<csv|ndjson>
+    Full registrant dump for integration partners, see export_response.
+    """
+    if request.method != "GET":
+        return JsonResponse({"detail": "Method not allowed."}, status=405)
+    return export_response(request, "registrants", fmt)
+
+
+def _export_job_json(job):
+    payload = {
+        "id": job.pk,
+        "kind": job.kind,
+        "status": job.status,
+        "done": job.done,
+        "total": job.total,
+        "percent": job.percent,
+        "error": job.error,
+        "expires_at": job.expires_at.isoformat() if job.expires_at else None,
+        "status_url": reverse("export_job_status", args=[job.pk]),
+    }
+    if job.status == "done":
+        payload["download_url"] = reverse("export_job_download", args=[job.pk])
+    payload["page_url"] = reverse("export_job_page", args=[job.pk])
+    return payload
 
-    zip_buffer.seek(0)
 
-    return HttpResponse(
-        zip_buffer,
-        content_type="application/zip",
-        headers={
-            "Content-Disposition": "attachment; filename=All_Registration_Badges.zip"
-        }
-    )
-import zipstream
-import logging
-from django.http import StreamingHttpResponse
-from django.utils.text import slugify
-from django.utils import timezone
-from django.contrib.auth.decorators import login_required
-from django.contrib.auth import logout
-from django.shortcuts import redirect
+def _export_job_allowed(user, kind):
+    return user.is_superuser or not EXPORT_JOB_TYPES[kind]["superuser_only"]
 
-logger = logging.getLogger(__name__)
 
 @login_required
-def generate_all_exhibitor_badges(request):
-    if not request.user.is_superuser:
-        logout(request)
-        return redirect("custom_login")
+@require_POST
+def export_job_create(request):
+    """
+    POST kind=<ExportJob kind> plus the kind's filters (start_date, end_date,
+    category for a badge batch). Queues the export for the `run_export_jobs`
+    worker, or returns the job already building or holding it unless
+    refresh=1. Poll status_url until the job is done, then fetch download_url.
+    """
+    kind = request.POST.get("kind")
+    if kind not in EXPORT_JOB_TYPES:
+        return JsonResponse({"detail": "Unknown export."}, status=400)
+    if not _export_job_allowed(request.user, kind):
+        return JsonResponse({"detail": "Not allowed."}, status=403)
 
-    start_date = request.GET.get("start_date")
-    end_date = request.GET.get("end_date")
-    category = request.GET.get("category")
+    try:
+        job, created = request_export(
+            kind,
+            params=request.POST.dict(),
+            user=request.user,
+            refresh=request.POST.get("refresh") == "1",
+        )
+    except ValueError:
+        return JsonResponse({"detail": "Dates must be in YYYY-MM-DD format."}, status=400)
+    return JsonResponse(_export_job_json(job), status=202 if created else 200)
 
-    exhibitors = Registrant.objects.all().order_by("created_at")
-    if start_date and end_date:
-        start = timezone.make_aware(datetime.strptime(start_date, "%Y-%m-%d"))
-        end = timezone.make_aware(datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1))
-        exhibitors = exhibitors.filter(created_at__range=(start, end))
-    if category and category.lower() != "all":
-        exhibitors = exhibitors.filter(category=category)
 
-    if not exhibitors.exists():
-        return HttpResponse("No exhibitors found", content_type="text/plain")
+@login_required
+def export_job_status(request, job_id):
+    job = get_object_or_404(ExportJob, pk=job_id)
+    if not _export_job_allowed(request.user, job.kind):
+        return JsonResponse({"detail": "Not allowed."}, status=403)
+    return JsonResponse(_export_job_json(job))
 
-    z = zipstream.ZipFile(mode='w', compression=zipstream.ZIP_DEFLATED)
 
-    for exhib in exhibitors.iterator():
-        try:
-            pdf_buffer = build_exhibitor_badge_pdf(exhib)
-            safe_name = slugify(f"{exhib.first_name}_{exhib.second_name}")
-            pdf_filename = f"{safe_name}_Badge.pdf"
-            z.write_iter(pdf_filename, iter([pdf_buffer.getvalue()]))
-        except Exception as e:
-            logger.error(f"Failed to generate badge for {exhib.id}: {e}")
-            continue
+@login_required
+def export_job_page(request, job_id):
+    """Progress of an export job, polled from status_url until the file can be downloaded."""
+    job = get_object_or_404(ExportJob, pk=job_id)
+    if not _export_job_allowed(request.user, job.kind):
+        raise Http404("Export not available")
+    return render(request, "summit/export_job.html", {"job": job, "job_json": _export_job_json(job)})
 
-    timestamp = timezone.now().strftime("%Y%m%d-%H%M%S")
-    filename = f"All_Exhibitor_Badges_{timestamp}.zip"
 
-    response = StreamingHttpResponse(z, content_type='application/zip')
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-    response['X-Accel-Buffering'] = 'no'  # for Nginx streaming
-    return response
+@login_required
+def export_job_download(request, job_id):
+    job = get_object_or_404(ExportJob, pk=job_id, status="done")
+    if not _export_job_allowed(request.user, job.kind) or not job.artifact:
+        raise Http404("Export not available")
+    spec = EXPORT_JOB_TYPES[job.kind]
+    return FileResponse(
+        job.artifact.open("rb"), as_attachment=True,
+        filename=spec["filename"], content_type=spec["content_type"],
+    )
 
 
 @login_required
@@ -2734,28 +2452,16 @@ def protocol(request):
                 registrant.other_interest = other_interest
             registrant.interests = interests
 
-            registrant.save()
-
             # Use shared student logic
             is_student = is_student_registrant(registrant)
 
-            # --- Send appropriate email ---
-            try:
+            # --- Save + queue appropriate email ---
+            with transaction.atomic():
+                registrant.save()
                 if is_student:
                     send_student_email(registrant)
-                    print("Student")
                 else:
                     send_protocol_confirmation_email(registrant)
-                    print("Delegate")
-
-            except Exception as e:
-                print("Email Send error:", e)
-                if request.headers.get("x-requested-with") == "XMLHttpRequest":
-                    return JsonResponse(
-                        {"success": True, "message": "Registration saved, but email failed."},
-                        status=200
-                    )
-                messages.warning(request, "Registered, but confirmation email failed.")
 
             # --- Return success response ---
             if request.headers.get("x-requested-with") == "XMLHttpRequest":
@@ -2772,16 +2478,8 @@ def protocol(request):
     else:
         form = ProtocolRegistrationForm()
 
-    # --- Extra context data ---
-    days = SummitScheduleDay.objects.prefetch_related("timeslots__sessions__panelists").order_by("date")
-    gallery_items = SummitGallery.objects.filter(is_active=True).order_by('order')
-    partners = SummitPartner.objects.filter(is_active=True).order_by("order")
-
     return render(request, "summit/protocol.html", {
         'form': form,
-        'gallery_items': gallery_items,
-        'partners': partners,
-        'days': days,
         'interest_choices': Registrant.INTEREST_CHOICES,
     })
 
@@ -2895,28 +2593,16 @@ def special_registration(request):
                     registrant.other_interest = other_interest
                 registrant.interests = interests
 
-                registrant.save()
-
                 # Use shared student logic
                 is_student = is_student_registrant(registrant)
 
-                # --- Send appropriate email ---
-                try:
+                # --- Save + queue appropriate email ---
+                with transaction.atomic():
+                    registrant.save()
                     if is_student:
                         send_student_email(registrant)
-                        print("Student")
                     else:
                         send_protocol_confirmation_email(registrant)
-                        print("Delegate")
-
-                except Exception as e:
-                    print("Email Send error:", e)
-                    if request.headers.get("x-requested-with") == "XMLHttpRequest":
-                        return JsonResponse(
-                            {"success": True, "message": "Registration saved, but email failed."},
-                            status=200
-                        )
-                    messages.warning(request, "Registered, but confirmation email failed.")
 
                 # --- Return success response ---
                 if request.headers.get("x-requested-with") == "XMLHttpRequest":
@@ -2933,16 +2619,8 @@ def special_registration(request):
         else:
             form = ProtocolRegistrationForm()
 
-    # --- Extra context data ---
-    days = SummitScheduleDay.objects.prefetch_related("timeslots__sessions__panelists").order_by("date")
-    gallery_items = SummitGallery.objects.filter(is_active=True).order_by('order')
-    partners = SummitPartner.objects.filter(is_active=True).order_by("order")
-
     return render(request, "summit/protocol.html", {
         'form': form,
-        'gallery_items': gallery_items,
-        'partners': partners,
-        'days': days,
         'interest_choices': Registrant.INTEREST_CHOICES,
     })
 
@@ -2973,28 +2651,16 @@ def additional_registration(request):
                     registrant.other_interest = other_interest
                 registrant.interests = interests
 
-                registrant.save()
-
                 # Use shared student logic
                 is_student = is_student_registrant(registrant)
 
-                # --- Send appropriate email ---
-                try:
+                # --- Save + queue appropriate email ---
+                with transaction.atomic():
+                    registrant.save()
                     if is_student:
                         send_student_email(registrant)
-                        print("Student")
                     else:
                         send_protocol_confirmation_email(registrant)
-                        print("Delegate")
-
-                except Exception as e:
-                    print("Email Send error:", e)
-                    if request.headers.get("x-requested-with") == "XMLHttpRequest":
-                        return JsonResponse(
-                            {"success": True, "message": "Registration saved, but email failed."},
-                            status=200
-                        )
-                    messages.warning(request, "Registered, but confirmation email failed.")
 
                 # --- Return success response ---
                 if request.headers.get("x-requested-with") == "XMLHttpRequest":
@@ -3011,16 +2677,8 @@ def additional_registration(request):
         else:
             form = ProtocolRegistrationForm()
 
-    # --- Extra context data ---
-    days = SummitScheduleDay.objects.prefetch_related("timeslots__sessions__panelists").order_by("date")
-    gallery_items = SummitGallery.objects.filter(is_active=True).order_by('order')
-    partners = SummitPartner.objects.filter(is_active=True).order_by("order")
-
     return render(request, "summit/reg_add.html", {
         'form': form,
-        'gallery_items': gallery_items,
-        'partners': partners,
-        'days': days,
         'interest_choices': Registrant.INTEREST_CHOICES,
     })
 
@@ -3145,19 +2803,11 @@ def auth_badge(request):
 
 @login_required
 def badge_dashboard(request):
-    # Convert category IDs to strings because Registrant.category is a CharField
-    student_category_ids = [
-        str(cid)
-        for cid in Category.objects.filter(name__iexact="Student").values_list("id", flat=True)
-    ]
-
+    # Badges leased to another station are being printed there right now
     registrants = (
-        Registrant.objects.filter(
-            Q(is_printed__isnull=True) & (
-                    Q(approved=True) |
-                    ~Q(Q(organization_type__iexact="Student") | Q(category__in=student_category_ids))
-            )
-        ).order_by("-created_at")
+        printable_registrants()
+        .filter(unclaimed() | Q(print_claimed_by=request.user.pk))
+        .order_by("-created_at")
     )
     categories = Registrant._meta.get_field("category").choices
     context = {
@@ -3215,25 +2865,16 @@ def approve_exhibitor(request, exhibitor_id):
             messages.error(request, f"Only {remaining} booths remaining.")
             return redirect("admin_dashboard")
 
-        # --- Try sending confirmation email ---
-        try:
+        # Approve exhibitor and queue booth confirmation together
+        with transaction.atomic():
+            exhibitor.approve(count)
             send_confirmation_booth_confirmation_mail(exhibitor)
-        except Exception as e:
-            print("❌ Email send error:", e)
-            if request.headers.get("x-requested-with") == "XMLHttpRequest":
-                return JsonResponse({
-                    "success": True,
-                    "message": "Registration successful, but confirmation email failed."
-                })
-            messages.warning(request, "Registration saved, but email could not be sent.")
 
         # Success
         if request.headers.get("x-requested-with") == "XMLHttpRequest":
             return JsonResponse({"success": True, "message": "Registration successful!"})
         messages.success(request, "Registration successful!")
 
-        exhibitor.approve(count)
-
         # ✅ Recalculate after approval
         approved_booths_total = Exhibitor.objects.filter(
             approval_status='approved'
@@ -3306,19 +2947,10 @@ def ajax_approve_exhibitor(request, exhibitor_id):
     if count > remaining:
         return JsonResponse({"success": False, "message": f"Only {remaining} booths remaining."})
 
-    # Approve exhibitor and send mail
-    exhibitor.approve(count)
-
-    try:
+    # Approve exhibitor and queue mail
+    with transaction.atomic():
+        exhibitor.approve(count)
         send_confirmation_booth_confirmation_mail(exhibitor)
-    except Exception as e:
-        print("❌ Email send error:", e)
-        if request.headers.get("x-requested-with") == "XMLHttpRequest":
-            return JsonResponse({
-                "success": True,
-                "message": "Registration successful, but confirmation email failed."
-            })
-        messages.warning(request, "Registration saved, but email could not be sent.")
 
     # Success
     if request.headers.get("x-requested-with") == "XMLHttpRequest":
@@ -3348,34 +2980,21 @@ def ajax_approve_exhibitor(request, exhibitor_id):
 
 
 @login_required
-def create_badge(request, reg_id, page_size=portrait(A7)):
-    """Generate a scalable summit badge IMAGE (from PDF for perfect layout consistency)."""
+@badge_condition(PREVIEW_DIR, "png")
+def create_badge(request, reg_id):
+    """Summit badge preview IMAGE, drawn natively by the PDF layout code and cached."""
 
     # --- Fetch registrant ---
-    try:
-        exhib = get_object_or_404(Registrant, pk=reg_id)
-    except Registrant.DoesNotExist:
+    exhib, fingerprint = _badge_for(request, reg_id)
+    if exhib is None:
         raise Http404("Registrant not found")
 
-    category_obj = Category.objects.only("name", "color").get(id=exhib.category)
-    badge_color = category_obj.color or colors.black
-
     # --- Core Data ---
     full_name = exhib.get_full_name() or ""
     category = exhib.get_category_display() or ""
 
-    # --- Finalize PDF ---
-    pdf_buffer = build_exhibitor_badge_pdf(exhib)
-
-    # --- Convert PDF → PNG (identical look) ---
-    image_pages = convert_from_bytes(pdf_buffer.getvalue(), dpi=300, use_cropbox=True, )
-    image_buffer = BytesIO()
-    image_pages[0].save(image_buffer, format="PNG")
-    image_buffer.seek(0)
-
-    # --- Save to MEDIA directory ---
-    image_name = f"badges/{exhib.first_name}_{exhib.second_name}_badge.png"
-    image_path = default_storage.save(image_name, image_buffer)
+    # --- Render (or reuse) the PNG preview at printer DPI ---
+    image_path = badge_preview(exhib, fingerprint=fingerprint)
     image_url = default_storage.url(image_path)
 
     # --- Return JSON ---
@@ -3389,6 +3008,109 @@ def create_badge(request, reg_id, page_size=portrait(A7)):
 
 
 
+# ----------------------------------------------------------------------
+# Print queue: each badge station claims, prints and acknowledges a few badges at a time
+# ----------------------------------------------------------------------
+def _queue_request(request):
+    """(station name, JSON body) of a print queue call; the station defaults to the user."""
+    try:
+        body = json.loads(request.body.decode("utf-8") or "{}")
+    except json.JSONDecodeError:
+        body = {}
+    station = str(body.get("station") or request.user.get_username())[:64]
+    return station, body
+
+
+def _queue_ids(body):
+    try:
+        return [int(pk) for pk in body.get("ids", [])]
+    except (TypeError, ValueError):
+        return None
+
+
+@login_required
+@require_POST
+def print_queue_claim(request):
+    station, body = _queue_request(request)
+    try:
+        count = int(body.get("count", 10))
+    except (TypeError, ValueError):
+        return JsonResponse({"success": False, "error": "count must be a number"}, status=400)
+
+    jobs, expires = claim_jobs(
+        request.user, station, count=count,
+        category=body.get("category"),
+        name_from=body.get("name_from"),
+        name_to=body.get("name_to"),
+    )
+    return JsonResponse({
+        "success": True,
+        "station": station,
+        "lease_expires": expires.isoformat(),
+        "jobs": [{
+            "id": registrant.id,
+            "name": registrant.get_full_name(),
+            "category": registrant.get_category_display(),
+            "organization": registrant.display_org_type(),
+            "badge_url": reverse("generate_badge", args=[registrant.id]),
+        } for registrant in jobs],
+    })
+
+
+@login_required
+@require_POST
+def print_queue_ack(request):
+    station, body = _queue_request(request)
+    ids = _queue_ids(body)
+    if not ids:
+        return JsonResponse({"success": False, "error": "No registrant IDs provided."}, status=400)
+
+    done = complete_jobs(request.user, station, ids, ip_address=get_client_ip(request))
+    return JsonResponse({
+        "success": True,
+        "printed": done,
+        # Lease expired and went to another station, or already printed
+        "rejected": sorted(set(ids) - set(done)),
+    })
+
+
+@login_required
+@require_POST
+def print_queue_release(request):
+    station, body = _queue_request(request)
+    ids = _queue_ids(body) if "ids" in body else None
+    if ids is None and "ids" in body:
+        return JsonResponse({"success": False, "error": "ids must be registrant IDs"}, status=400)
+
+    released = release_jobs(request.user, station, ids)
+    return JsonResponse({"success": True, "released": released})
+
+
+@login_required
+def scan_badge(request):
+    """Gate check: look up the holder of a scanned badge QR (?code=KSS1:<id>:<signature>)."""
+    pk = parse_badge_qr(request.GET.get("code", ""))
+    if pk is None:
+        return JsonResponse({"success": False, "error": "Not a valid summit badge"}, status=400)
+
+    if pk.isdigit():
+        holder = Registrant.objects.filter(pk=pk).first()
+        organization = holder and holder.display_org_type()
+    else:
+        holder = Exhibitor.objects.filter(pk=pk).first()
+        organization = holder and holder.organization_type
+    if holder is None:
+        return JsonResponse({"success": False, "error": "Badge holder not found"}, status=404)
+
+    return JsonResponse({
+        "success": True,
+        "name": holder.get_full_name(),
+        "category": holder.get_category_display(),
+        "organization": organization,
+        "job_title": holder.job_title,
+    })
+
+
 @login_required
 @csrf_exempt  # optional: only if your AJAX doesn't send CSRF token
 def mark_printed(request, reg_id):
@@ -3396,37 +3118,23 @@ def mark_printed(request, reg_id):
         return JsonResponse({"error": "Invalid request method"}, status=405)
 
     try:
-        registrant = Registrant.objects.get(id=reg_id)
-        user = request.user
-        ip = get_client_ip(request)
-
-        # Check if already printed
-        if not registrant.is_printed:
-            # First-time print
-            registrant.is_printed = 1
-            registrant.save(update_fields=["is_printed"])
-
-            PrintLog.objects.create(
-                record_id=registrant,
-                printed_by=user,
-                ip_address=ip,
-                timestamp=timezone.now(),
-                reprint=False
-            )
+        # Flip the flag only if it is still unset; the row count tells a
+        # first-time print from a reprint without a separate read
+        first_print = Registrant.objects.filter(Registrant.UNPRINTED, id=reg_id).update(is_printed=1, **NO_CLAIM) == 1
+        if not first_print and not Registrant.objects.filter(id=reg_id).exists():
+            raise Registrant.DoesNotExist
+
+        PrintLog.objects.create(
+            record_id_id=reg_id,
+            printed_by=request.user,
+            ip_address=get_client_ip(request),
+            timestamp=timezone.now(),
+            reprint=not first_print
+        )
 
+        if first_print:
             return JsonResponse({"success": True, "message": "First-time print Success."})
-
-        else:
-            # Reprint
-            PrintLog.objects.create(
-                record_id=registrant,
-                printed_by=user,
-                ip_address=ip,
-                timestamp=timezone.now(),
-                reprint=True
-            )
-
-            return JsonResponse({"success": True, "message": "Reprint Success."})
+        return JsonResponse({"success": True, "message": "Reprint Success."})
 
     except Registrant.DoesNotExist:
         return JsonResponse({"error": "Registrant not found"}, status=404)